@@ -0,0 +1,342 @@
+"""
+JSON schema for Claude's analysis, the tool it is requested through, and a compiled validator.
+
+The full schema is what Claude is asked to follow. An analysis is only
+rejected for structural problems apply_analysis can't work with (a
+container of the wrong type, a missing top-level key); everything else
+is fitted to the schema's limits before it's applied (see fit_analysis).
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable
+
+ANALYSIS_TOOL_NAME = 'record_analysis'
+
+# Stop collecting validation errors after this many
+MAX_ERRORS = 20
+
+ISO_DATE = r'^\d{4}-\d{2}-\d{2}'
+
+STATUSES = ['thriving', 'balanced', 'needs_attention', 'dormant']
+SIGNIFICANCE = ['minor', 'notable', 'major']
+INSPIRATION_CATEGORIES = ['movement', 'innovation', 'travel', 'philosophy', 'people']
+INSPIRATION_TYPES = ['video', 'quote', 'profile', 'idea']
+
+# Keys an analysis is rejected without: at the top level, and in right_now
+REQUIRED_KEYS = ['timeline_entries', 'quadrant_updates', 'right_now']
+REQUIRED_RIGHT_NOW_KEYS = ['summary', 'valuesAlignment', 'actionables', 'celebration', 'friendlyNote']
+
+
+def _string(description: str | None = None, **extra) -> dict:
+    schema = {'type': 'string', **extra}
+    if description:
+        schema['description'] = description
+    return schema
+
+
+def _object(properties: dict, required: list[str] | None = None, **extra) -> dict:
+    return {'type': 'object', 'properties': properties, 'required': required or list(properties), **extra}
+
+
+def analysis_schema(quadrants: list[str]) -> dict:
+    """
+    Schema of the analysis response, mirroring the spec in the user prompt.
+
+    Args:
+        quadrants: Quadrant keys of the active profile (used as enums)
+
+    Returns:
+        dict: JSON schema (draft 2020-12 subset)
+    """
+    category = _string(enum=list(quadrants))
+
+    timeline_entry = _object({
+        'id': _string('Unique id, format "tl-{timestamp}-{index}"'),
+        'date': _string('ISO date', pattern=ISO_DATE),
+        'category': category,
+        'title': _string('Short descriptive title (max 50 chars)'),
+        'content': _string('1-2 sentence description'),
+        'significance': _string(enum=SIGNIFICANCE),
+    })
+
+    quadrant_update = _object(
+        {
+            'status': _string(enum=STATUSES),
+            'lastActivity': _string('ISO date of most recent activity', pattern=ISO_DATE),
+            'activityPulse': {'type': 'boolean', 'description': 'Active in the past week'},
+            'recentHighlight': _string('One-liner about what is happening'),
+            'metrics': {'type': 'object', 'description': '2-3 relevant metrics only'},
+        },
+        required=['status', 'lastActivity', 'activityPulse', 'recentHighlight'],
+    )
+
+    actionable = _object({
+        'id': _string(),
+        'text': _string(),
+        'priority': _string(),
+        'effort': _string(),
+        'impact': _string(),
+        'quadrant': category,
+    })
+
+    right_now = _object(
+        {
+            'summary': _string('2-3 sentence overview'),
+            'valuesAlignment': _object(
+                {
+                    'score': {'type': 'integer', 'minimum': 0, 'maximum': 100},
+                    'livingWell': {'type': 'array', 'items': _string(), 'maxItems': 3},
+                    'needsAttention': {'type': 'array', 'items': _string(), 'maxItems': 2},
+                    'note': _string(),
+                },
+                required=['score', 'livingWell', 'needsAttention'],
+            ),
+            'actionables': {'type': 'array', 'items': actionable, 'maxItems': 4},
+            'celebration': _string('One win, even a small one'),
+            'friendlyNote': _string('Warm, supportive message (max 2 sentences)'),
+            'balanceCheck': _object(
+                {'mood': _string(), 'recommendation': _string()},
+                required=['mood'],
+            ),
+        },
+        required=REQUIRED_RIGHT_NOW_KEYS,
+    )
+
+    goal = _object(
+        {
+            'id': _string(),
+            'text': _string(),
+            'category': category,
+            'timeframe': _string(enum=['near', 'far']),
+            'progress': {'type': 'integer', 'minimum': 0, 'maximum': 100},
+        },
+        required=['id', 'text', 'category', 'timeframe'],
+    )
+
+    inspiration = _object({
+        'id': _string(),
+        'category': _string(enum=INSPIRATION_CATEGORIES),
+        'type': _string(enum=INSPIRATION_TYPES),
+        'title': _string(),
+        'content': _string('The insight, quote or link'),
+        'source': _string('Note title it came from'),
+    })
+
+    return _object({
+        'timeline_entries': {'type': 'array', 'items': timeline_entry, 'maxItems': 7},
+        'quadrant_updates': _object(
+            {key: quadrant_update for key in quadrants},
+            additionalProperties=False,
+        ),
+        'right_now': right_now,
+        'extracted_goals': {'type': 'array', 'items': goal, 'maxItems': 10},
+        'extracted_inspiration': {'type': 'array', 'items': inspiration, 'maxItems': 5},
+    })
+
+
+def analysis_tool(quadrants: list[str]) -> dict:
+    """Tool definition Claude is asked to call with the analysis."""
+    return {
+        'name': ANALYSIS_TOOL_NAME,
+        'description': 'Record the structured life analysis for the dashboard.',
+        'input_schema': analysis_schema(quadrants),
+    }
+
+
+# Python types accepted for each JSON schema type (bool is rejected for numbers below)
+JSON_TYPES = {
+    'object': (dict,),
+    'array': (list,),
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'null': (type(None),),
+}
+
+Check = Callable[[Any, str, list], None]
+
+
+def compile_schema(schema: dict) -> Check:
+    """
+    Turn a schema into nested checking closures, so validation does no
+    schema interpretation at all.
+
+    Supports the subset used here: type, enum, pattern, minimum, maximum,
+    properties, required, additionalProperties, items, minItems, maxItems.
+
+    Returns:
+        check(value, path, errors): appends "path: problem" strings to errors
+    """
+    checks: list[Check] = []
+
+    if 'type' in schema:
+        names = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        types = tuple(t for name in names for t in JSON_TYPES[name])
+        allows_bool = 'boolean' in names
+        expected = ' or '.join(names)
+
+        def check_type(value, path, errors):
+            if not isinstance(value, types) or (isinstance(value, bool) and not allows_bool):
+                errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+                return False
+            return True
+    else:
+        check_type = None
+
+    if 'enum' in schema:
+        allowed = frozenset(schema['enum'])
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} is not one of {sorted(allowed)}")
+        checks.append(check_enum)
+
+    if 'pattern' in schema:
+        regex = re.compile(schema['pattern'])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not regex.search(value):
+                errors.append(f"{path}: {value!r} does not match {regex.pattern}")
+        checks.append(check_pattern)
+
+    if 'minimum' in schema or 'maximum' in schema:
+        low = schema.get('minimum', float('-inf'))
+        high = schema.get('maximum', float('inf'))
+
+        def check_range(value, path, errors):
+            if isinstance(value, (int, float)) and not low <= value <= high:
+                errors.append(f"{path}: {value} is outside {low}..{high}")
+        checks.append(check_range)
+
+    if 'properties' in schema or 'required' in schema or 'additionalProperties' in schema:
+        properties = {key: compile_schema(sub) for key, sub in schema.get('properties', {}).items()}
+        required = tuple(schema.get('required', ()))
+        extra = schema.get('additionalProperties', True)
+        check_extra = compile_schema(extra) if isinstance(extra, dict) else None
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}.{key}: required")
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, f"{path}.{key}", errors)
+                elif extra is False:
+                    errors.append(f"{path}.{key}: unexpected key")
+                elif check_extra is not None:
+                    check_extra(item, f"{path}.{key}", errors)
+        checks.append(check_object)
+
+    if 'items' in schema or 'minItems' in schema or 'maxItems' in schema:
+        check_item = compile_schema(schema['items']) if 'items' in schema else None
+        min_items = schema.get('minItems', 0)
+        max_items = schema.get('maxItems')
+
+        def check_array(value, path, errors):
+            if not isinstance(value, list):
+                return
+            if len(value) < min_items:
+                errors.append(f"{path}: fewer than {min_items} items")
+            if max_items is not None and len(value) > max_items:
+                errors.append(f"{path}: more than {max_items} items")
+            if check_item is not None:
+                for i, item in enumerate(value):
+                    if len(errors) >= MAX_ERRORS:
+                        return
+                    check_item(item, f"{path}[{i}]", errors)
+        checks.append(check_array)
+
+    checks = tuple(checks)
+
+    def check(value, path, errors):
+        if check_type is not None and not check_type(value, path, errors):
+            return
+        for c in checks:
+            c(value, path, errors)
+
+    return check
+
+
+def _containers(schema: dict) -> dict:
+    """Just the objects and arrays of a schema, nested as they are, without any constraints."""
+    if schema.get('type') not in ('object', 'array'):
+        return {}
+    result = {'type': schema['type']}
+    if 'properties' in schema:
+        result['properties'] = {key: _containers(sub) for key, sub in schema['properties'].items()}
+    if 'items' in schema:
+        result['items'] = _containers(schema['items'])
+    return result
+
+
+def structural_schema(quadrants: list[str]) -> dict:
+    """The part of the analysis schema an analysis is rejected for breaking."""
+    schema = _containers(analysis_schema(quadrants))
+    schema['required'] = list(REQUIRED_KEYS)
+    schema['properties']['right_now']['required'] = list(REQUIRED_RIGHT_NOW_KEYS)
+    return schema
+
+
+@lru_cache(maxsize=16)
+def _analysis_schema(quadrants: tuple[str, ...]) -> dict:
+    return analysis_schema(list(quadrants))
+
+
+@lru_cache(maxsize=16)
+def _analysis_validator(quadrants: tuple[str, ...]) -> Check:
+    return compile_schema(structural_schema(list(quadrants)))
+
+
+def analysis_errors(analysis: Any, quadrants: list[str]) -> list[str]:
+    """
+    Check an analysis for structural problems (see structural_schema).
+
+    Returns:
+        list: Problems found (empty if the analysis can be applied), at most MAX_ERRORS
+    """
+    errors: list[str] = []
+    _analysis_validator(tuple(quadrants))(analysis, '$', errors)
+    return errors[:MAX_ERRORS]
+
+
+def _fit(value: Any, schema: dict, path: str, changes: list) -> Any:
+    kind = schema.get('type')
+    if kind == 'array' and isinstance(value, list):
+        limit = schema.get('maxItems')
+        if limit is not None and len(value) > limit:
+            changes.append(f"{path}: kept the first {limit} of {len(value)} items")
+            del value[limit:]
+        if 'items' in schema:
+            for i, item in enumerate(value):
+                value[i] = _fit(item, schema['items'], f"{path}[{i}]", changes)
+    elif kind == 'object' and isinstance(value, dict):
+        for key, sub in schema.get('properties', {}).items():
+            if key in value:
+                value[key] = _fit(value[key], sub, f"{path}.{key}", changes)
+    elif kind in ('integer', 'number') and isinstance(value, (int, float)) and not isinstance(value, bool):
+        fitted = round(value) if kind == 'integer' else value
+        fitted = min(max(fitted, schema.get('minimum', fitted)), schema.get('maximum', fitted))
+        if fitted != value:
+            changes.append(f"{path}: {value} -> {fitted}")
+        return fitted
+    return value
+
+
+def fit_analysis(analysis: dict, quadrants: list[str]) -> list[str]:
+    """
+    Fit a structurally valid analysis to the schema's limits, in place:
+    over-long arrays are truncated, and integers rounded and clamped to
+    their range. Anything else the schema asks for (enums, date formats,
+    every quadrant being present) is left as it is, like before the schema.
+
+    Returns:
+        list: What was changed, as "path: change" strings
+    """
+    changes: list[str] = []
+    _fit(analysis, _analysis_schema(tuple(quadrants)), '$', changes)
+    return changes
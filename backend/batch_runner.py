@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Process several profiles in one process.
+
+    python batch_runner.py                      # every profile in profiles.json
+    python batch_runner.py --only sam alex      # just these profiles
+    python batch_runner.py --concurrency 2 --dry-run
+    python batch_runner.py --submit             # gather + submit one Message Batch
+    python batch_runner.py --collect            # apply results of finished batches
+
+Each profile runs in its own worker thread and context (active profile,
+run report), while the GitHub session and the Anthropic client are shared,
+so N profiles cost about N / concurrency sequential runs of wall time
+instead of N cold processes. Nearly all of a run is waiting on the vault
+and the network, which is why threads are enough here.
+
+With --submit, every profile's analysis goes into a single Message Batch
+instead of one request each; --collect (run later, e.g. by the scheduled
+runner) applies the results once the batch has ended.
+"""
+
+import argparse
+import contextvars
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from config import BATCH_CONCURRENCY, DAYS_TO_LOOK_BACK
+from profiles import Profile, load_profiles, use_profile
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one profile's run."""
+
+    profile: str
+    success: bool
+    duration_s: float
+    error: str | None = None
+
+
+def process_profile(profile: Profile, **options) -> BatchResult:
+    """
+    Run the full processing pipeline for one profile.
+
+    Args:
+        profile: Profile to process
+        **options: Passed through to main.process_life_data
+
+    Returns:
+        BatchResult: Never raises, failures are reported in the result
+    """
+    from main import process_life_data
+
+    start = time.perf_counter()
+    try:
+        with use_profile(profile):
+            success = process_life_data(**options)
+        return BatchResult(profile.name, success, time.perf_counter() - start)
+    except Exception as e:
+        print(f"[{profile.name}] Critical error: {e}")
+        return BatchResult(profile.name, False, time.perf_counter() - start, error=str(e))
+
+
+def run_batch(
+    profiles: list[Profile],
+    concurrency: int = BATCH_CONCURRENCY,
+    **options,
+) -> list[BatchResult]:
+    """
+    Process profiles concurrently, at most `concurrency` at a time.
+
+    Args:
+        profiles: Profiles to process
+        concurrency: Maximum number of profiles in flight
+        **options: Passed through to main.process_life_data
+
+    Returns:
+        list: One BatchResult per profile, in the order given
+    """
+    return map_profiles(lambda profile: process_profile(profile, **options), profiles, concurrency)
+
+
+def map_profiles(fn: Callable[[Profile], Any], profiles: list[Profile], concurrency: int = BATCH_CONCURRENCY) -> list:
+    """Call fn(profile) for each profile on a bounded thread pool, returning results in order."""
+    if not profiles:
+        return []
+
+    # Import (and warm up) shared modules once, before the workers race for the import lock
+    import main  # noqa: F401
+
+    workers = max(1, min(concurrency, len(profiles)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='profile') as pool:
+        # A fresh context per profile, so worker threads never leak one run's state into the next
+        futures = [pool.submit(contextvars.copy_context().run, fn, profile) for profile in profiles]
+        return [future.result() for future in futures]
+
+
+def batch_custom_id(profile: Profile, analysis_key: str) -> str:
+    """Message Batch custom_id for a profile's analysis (1-64 of [A-Za-z0-9_-])."""
+    return f"{re.sub(r'[^A-Za-z0-9_-]', '_', profile.name)[:40]}-{analysis_key}"
+
+
+def submit_profiles(
+    profiles: list[Profile],
+    concurrency: int = BATCH_CONCURRENCY,
+    days: int = DAYS_TO_LOOK_BACK,
+    fresh: bool = False,
+) -> str | None:
+    """
+    Gather data and build prompts for every profile, then submit all the
+    analyses as one Message Batch.
+
+    Returns:
+        str: The batch id, or None if nothing was submitted
+    """
+    from claude_analyzer import analysis_request_params, submit_analysis_batch
+    from pipeline import forced_stages
+
+    def prepare(profile: Profile) -> dict | None:
+        from main import prepare_analysis
+
+        try:
+            with use_profile(profile):
+                run = prepare_analysis(days, forced_stages(fresh, None))
+                if run is not None:
+                    run['params'] = analysis_request_params(run['prompts'])
+                return run
+        except Exception as e:
+            print(f"[{profile.name}] Critical error: {e}")
+            return None
+
+    jobs = {}
+    for profile, run in zip(profiles, map_profiles(prepare, profiles, concurrency)):
+        if run is None:
+            print(f"[{profile.name}] Nothing to submit")
+            continue
+        jobs[batch_custom_id(profile, run['analysis_key'])] = {
+            'profile': profile.name,
+            'days': days,
+            'enrich_key': run['enrich_key'],
+            'github_key': run['github_key'],
+            'analysis_key': run['analysis_key'],
+            'unprocessed': run['unprocessed'],
+            'params': run['params'],
+        }
+
+    if not jobs:
+        return None
+    batch_id = submit_analysis_batch(jobs)
+    if batch_id:
+        print(f"Submitted {len(jobs)} analyses as batch {batch_id}")
+    return batch_id
+
+
+def collect_batches(profiles: list[Profile] | None = None, dry_run: bool = False) -> list[BatchResult]:
+    """
+    Apply the results of every pending Message Batch that has ended.
+
+    Batches that are still processing are left for a later call. A batch
+    is forgotten once its results have been fetched, whether or not each
+    analysis could be applied.
+
+    Returns:
+        list: One BatchResult per job in the batches that ended
+    """
+    from claude_analyzer import (
+        analysis_from_batch_message,
+        fetch_batch_results,
+        forget_pending_batch,
+        get_batch_status,
+        load_pending_batches,
+    )
+    from main import apply_batch_result
+
+    by_name = {p.name: p for p in (profiles or load_profiles())}
+    results = []
+
+    for batch_id, pending in load_pending_batches().items():
+        status = get_batch_status(batch_id)
+        if status != 'ended':
+            print(f"Batch {batch_id} is {status or 'unknown'}, checking again next run")
+            continue
+
+        try:
+            messages = fetch_batch_results(batch_id)
+        except Exception as e:
+            print(f"Error fetching results for batch {batch_id}: {e}")
+            continue
+
+        for custom_id, job in pending['jobs'].items():
+            start = time.perf_counter()
+            profile = by_name.get(job['profile'])
+            if profile is None:
+                results.append(BatchResult(job['profile'], False, 0.0, error='profile no longer configured'))
+                continue
+            try:
+                with use_profile(profile):
+                    analysis = analysis_from_batch_message(messages.get(custom_id), pending['model'])
+                    success = apply_batch_result(job, analysis, dry_run=dry_run)
+                results.append(BatchResult(profile.name, success, time.perf_counter() - start))
+            except Exception as e:
+                print(f"[{profile.name}] Critical error: {e}")
+                results.append(BatchResult(profile.name, False, time.perf_counter() - start, error=str(e)))
+
+        if not dry_run:
+            forget_pending_batch(batch_id)
+
+    return results
+
+
+def print_results(results: list[BatchResult], wall_s: float) -> None:
+    print(f"\n{'='*50}")
+    print(f"Batch finished in {wall_s:.1f}s")
+    for result in results:
+        status = 'ok' if result.success else 'FAILED'
+        detail = f" ({result.error})" if result.error else ''
+        print(f"  {result.profile}: {status} in {result.duration_s:.1f}s{detail}")
+    print(f"{'='*50}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Process several Life Dashboard profiles')
+    parser.add_argument('--profiles', help='Profiles file (default: PROFILES_FILE from config)')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Only process these profiles')
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY, help='Profiles processed at once')
+    parser.add_argument('--days', type=int, default=DAYS_TO_LOOK_BACK, help='Number of days to look back')
+    parser.add_argument('--dry-run', action='store_true', help="Run analysis but don't update files")
+    parser.add_argument('--fresh', action='store_true', help='Ignore saved stage results from previous runs')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--submit', action='store_true', help='Submit all analyses as one Message Batch')
+    mode.add_argument('--collect', action='store_true', help='Apply the results of finished Message Batches')
+    args = parser.parse_args(argv)
+
+    all_profiles = load_profiles(args.profiles)
+    profiles = all_profiles
+    if args.only:
+        unknown = set(args.only) - {p.name for p in profiles}
+        if unknown:
+            print(f"Unknown profiles: {', '.join(sorted(unknown))}")
+            return 1
+        profiles = [p for p in profiles if p.name in args.only]
+
+    start = time.perf_counter()
+    if args.submit:
+        batch_id = submit_profiles(profiles, concurrency=args.concurrency, days=args.days, fresh=args.fresh)
+        return 0 if batch_id else 1
+    if args.collect:
+        # A batch covers whichever profiles were submitted, so --only doesn't apply here
+        results = collect_batches(all_profiles, dry_run=args.dry_run)
+        print_results(results, time.perf_counter() - start)
+        return 0 if all(r.success for r in results) else 1
+
+    results = run_batch(
+        profiles,
+        concurrency=args.concurrency,
+        days=args.days,
+        dry_run=args.dry_run,
+        fresh=args.fresh,
+    )
+    print_results(results, time.perf_counter() - start)
+    return 0 if all(r.success for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
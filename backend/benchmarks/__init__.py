@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Life Dashboard backend.
+
+Run from the backend directory:
+    python -m benchmarks.run --help
+"""
@@ -0,0 +1,249 @@
+"""
+Record GitHub and Anthropic traffic into cassettes and replay it offline.
+
+    python -m benchmarks.cassette record cassette.json          # real APIs, default profile
+    python -m benchmarks.cassette record cassette.json --profile sam
+    python -m benchmarks.cassette record cassette.json --stub   # try it out against the stub server
+    python -m benchmarks.cassette show cassette.json
+
+Recording runs one full pipeline through a local proxy that forwards
+every call to the real APIs and writes down each response and how long
+it took. The run uses a scratch copy of the profile's data directory, so
+the profile's own data and caches are left alone.
+
+A ReplayServer then answers the same calls from the cassette, as many
+times as asked, with the recorded latency (scaled) or a fixed one; see
+benchmarks/loadtest.py. Cassettes never contain request headers (API keys,
+tokens) or request bodies, but responses hold analyses of real notes, so
+keep them out of the repo (benchmarks/cassettes/ is ignored).
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import serialization
+from benchmarks.stub_server import StubServer
+
+CASSETTE_VERSION = 1
+
+# Written in place of the upstream's base URL in recorded bodies (e.g. a
+# batch's results_url), and replaced by the replay server's own
+BASE_URL_PLACEHOLDER = '{{base_url}}'
+
+# Not forwarded by the proxy: hop-by-hop, or set again by requests
+SKIPPED_HEADERS = {'host', 'content-length', 'connection', 'accept-encoding', 'keep-alive', 'transfer-encoding'}
+
+CATCH_ALL = r'/.*'
+
+
+def load_cassette(path: Path) -> dict:
+    """A cassette file: {'version', 'recorded_at', 'interactions': [...]}."""
+    cassette = serialization.loads(Path(path).read_bytes())
+    if cassette.get('version') != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+    return cassette
+
+
+def save_cassette(path: Path, interactions: list[dict]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(serialization.dumps({
+        'version': CASSETTE_VERSION,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'interactions': interactions,
+    }))
+
+
+def _payload(content_type: str, body: str):
+    """Body in the form StubHandler sends: JSON as parsed data, anything else as bytes."""
+    if content_type.startswith('application/json'):
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body.encode('utf-8')
+
+
+class RecordingProxy(StubServer):
+    """
+    Forwards every request to the real API and records the exchange.
+
+    Paths under /v1/ go to the Anthropic API, everything else to GitHub.
+    Each interaction is {'method', 'path', 'query', 'status',
+    'content_type', 'body', 'elapsed_ms'}.
+    """
+
+    def __init__(self, github_url: str, anthropic_url: str):
+        super().__init__()
+        self.upstreams = {'github': github_url.rstrip('/'), 'anthropic': anthropic_url.rstrip('/')}
+        self.interactions: list[dict] = []
+        self.routes = [(method, CATCH_ALL, self._forward) for method in ('GET', 'POST')]
+
+    def _forward(self, match, body):
+        import requests
+
+        from config import ANTHROPIC_TIMEOUT, HTTP_CONNECT_TIMEOUT
+
+        method = self.current.method
+        path, _, query = self.current.path.partition('?')
+        upstream = self.upstreams['anthropic' if path.startswith('/v1/') else 'github']
+        headers = {k: v for k, v in self.current.headers.items() if k.lower() not in SKIPPED_HEADERS}
+
+        start = time.perf_counter()
+        response = requests.request(
+            method,
+            upstream + self.current.path,
+            headers=headers,
+            data=self.current.raw_body or None,
+            timeout=(HTTP_CONNECT_TIMEOUT, ANTHROPIC_TIMEOUT),
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        content_type = response.headers.get('Content-Type', '')
+        text = response.text.replace(upstream, BASE_URL_PLACEHOLDER)
+        with self.lock:
+            self.interactions.append({
+                'method': method,
+                'path': path,
+                'query': query,
+                'status': response.status_code,
+                'content_type': content_type,
+                'body': text,
+                'elapsed_ms': round(elapsed_ms, 1),
+            })
+        return response.status_code, _payload(content_type, text.replace(BASE_URL_PLACEHOLDER, self.url))
+
+
+class ReplayServer(StubServer):
+    """
+    Answers requests from a cassette.
+
+    Requests are matched by method and path (not query or body); the
+    recordings for a path are replayed in order, round-robin, so a
+    cassette of one run serves any number of runs. Each response waits
+    for its recorded latency times `latency_scale`, or for `latency`
+    seconds if that is given.
+    """
+
+    def __init__(self, cassette: dict, latency: float | None = None, latency_scale: float = 1.0):
+        super().__init__()
+        self.fixed_latency = latency
+        self.latency_scale = latency_scale
+        self.recorded: dict[tuple[str, str], list[dict]] = {}
+        for interaction in cassette['interactions']:
+            self.recorded.setdefault((interaction['method'], interaction['path']), []).append(interaction)
+        self._cursors = {key: itertools.cycle(items) for key, items in self.recorded.items()}
+        self.misses: list[tuple[str, str]] = []
+        self.routes = [(method, CATCH_ALL, self._replay) for method in ('GET', 'POST')]
+
+    def _replay(self, match, body):
+        method = self.current.method
+        key = (method, match.group(0))
+        with self.lock:
+            cursor = self._cursors.get(key)
+            interaction = next(cursor) if cursor is not None else None
+            if interaction is None:
+                self.misses.append(key)
+        if interaction is None:
+            return 404, {'message': f'Not in cassette: {method} {key[1]}'}
+
+        delay = self.fixed_latency if self.fixed_latency is not None else interaction['elapsed_ms'] / 1000 * self.latency_scale
+        if delay:
+            time.sleep(delay)
+        text = interaction['body'].replace(BASE_URL_PLACEHOLDER, self.url)
+        return interaction['status'], _payload(interaction['content_type'], text)
+
+
+def record(path: Path, profile=None, days: int | None = None, stub: bool = False) -> list[dict]:
+    """
+    Run the pipeline once through a RecordingProxy and save the cassette.
+
+    Args:
+        path: Cassette file to write
+        profile: Profile to record (default: the active one)
+        days: Days to look back (default: DAYS_TO_LOOK_BACK)
+        stub: Record the stub server instead of the real APIs
+
+    Returns:
+        list: The recorded interactions
+    """
+    from benchmarks.run import use_stub
+    from config import DAYS_TO_LOOK_BACK, GITHUB_API_URL
+    from profiles import current_profile, use_profile
+    import main
+
+    profile = profile or current_profile()
+    scratch = Path(tempfile.mkdtemp(prefix='life-dashboard-record-'))
+    try:
+        # Cold caches, so every call the pipeline can make is made (and recorded)
+        data_dir = scratch / 'data'
+        shutil.copytree(profile.data_dir, data_dir, ignore=shutil.ignore_patterns('logs', 'cache'))
+        anthropic_url = os.environ.get('ANTHROPIC_BASE_URL') or 'https://api.anthropic.com'
+
+        with StubServer() if stub else contextlib.nullcontext() as upstream:
+            if upstream is not None:
+                anthropic_url = github_url = upstream.url
+            else:
+                github_url = GITHUB_API_URL
+            with RecordingProxy(github_url, anthropic_url) as proxy, use_profile(replace(profile, data_dir=data_dir)):
+                use_stub(proxy, api_key='stub-key' if stub else None)
+                main.process_life_data(days or DAYS_TO_LOOK_BACK, fresh=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    save_cassette(path, proxy.interactions)
+    return proxy.interactions
+
+
+def print_cassette(cassette: dict) -> None:
+    print(f"Recorded {cassette['recorded_at']}, {len(cassette['interactions'])} interactions")
+    for interaction in cassette['interactions']:
+        print(f"  {interaction['method']:<4} {interaction['path']:<48} {interaction['status']} "
+              f"{len(interaction['body']):>8} chars {interaction['elapsed_ms']:>9.1f} ms")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Record or inspect API cassettes')
+    commands = parser.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help='Record one pipeline run')
+    rec.add_argument('path', type=Path, help='Cassette file to write')
+    rec.add_argument('--profile', help='Profile from the profiles file (default: the built-in one)')
+    rec.add_argument('--days', type=int, help='Number of days to look back')
+    rec.add_argument('--stub', action='store_true', help='Record the local stub server instead of the real APIs')
+    show = commands.add_parser('show', help='List the interactions in a cassette')
+    show.add_argument('path', type=Path, help='Cassette file')
+    args = parser.parse_args(argv)
+
+    if args.command == 'show':
+        print_cassette(load_cassette(args.path))
+        return 0
+
+    profile = None
+    if args.profile:
+        from profiles import load_profiles
+
+        profile = next((p for p in load_profiles() if p.name == args.profile), None)
+        if profile is None:
+            print(f"Unknown profile: {args.profile}")
+            return 1
+
+    interactions = record(args.path, profile, args.days, args.stub)
+    print(f"\nRecorded {len(interactions)} interactions to {args.path}")
+    failed = [i for i in interactions if i['status'] >= 400]
+    for interaction in failed:
+        print(f"  {interaction['method']} {interaction['path']} returned {interaction['status']}")
+    return 1 if not interactions or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
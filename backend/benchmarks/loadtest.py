@@ -0,0 +1,238 @@
+"""
+Load-test the full pipeline against replayed GitHub and Anthropic calls.
+
+    python -m benchmarks.loadtest --cassette cassette.json            # 4 profiles x 5 runs
+    python -m benchmarks.loadtest --cassette cassette.json --runs 20 --profiles 8 --concurrency 8
+    python -m benchmarks.loadtest --cassette cassette.json --latency 0 --cprofile load.prof
+    python -m benchmarks.loadtest --stub                               # no cassette: record the stub server first
+
+Every profile reads the same synthetic vault and writes to its own scratch
+data directory, and runs the pipeline `--runs` times in a row (ignoring
+saved stage results unless --reuse is given); profiles run concurrently,
+like batch_runner. Responses come from a cassette (see
+benchmarks/cassette.py) with the recorded latency, scaled, or a fixed one,
+so the numbers are repeatable and no API is called.
+
+The summary splits each run into time spent waiting on the replayed
+network and everything else, and lists the stages that cost the most;
+--cprofile adds the hottest functions across every worker thread.
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import serialization
+from benchmarks.run import SEED_DATA_DIR, bench_profile_for, fresh_data_dir, use_stub
+
+# Spans that are (almost) all waiting on GitHub or Anthropic
+NETWORK_SPANS = {'github_events', 'github_graphql', 'claude_call', 'claude_batch_submit', 'claude_batch_results'}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def network_ms(spans: list) -> float:
+    """Time spent in network spans (outermost ones only)."""
+    total = 0.0
+    for node in spans:
+        if node['name'] in NETWORK_SPANS:
+            total += node['duration_ms'] or 0.0
+        else:
+            total += network_ms(node['children'])
+    return total
+
+
+def summarize_reports(reports: list, wall_s: float, top: int = 15) -> dict:
+    """
+    Throughput, run latency and the costliest stages of a load test.
+
+    Args:
+        reports: Finished RunReports of every run
+        wall_s: Wall time of the whole load test
+        top: Stages to list
+
+    Returns:
+        dict: {'runs', 'failed', 'wall_s', 'runs_per_s', 'run_ms', 'network_share', 'stages', 'counters'}
+    """
+    from instrumentation import _flatten_spans
+
+    if not reports:
+        return {'runs': 0, 'failed': 0, 'wall_s': round(wall_s, 3), 'runs_per_s': 0.0,
+                'run_ms': {}, 'network_share': 0.0, 'stages': [], 'counters': {}}
+
+    durations = [report.root['duration_ms'] or 0.0 for report in reports]
+    network = [network_ms(report.root['children']) for report in reports]
+
+    stage_totals: dict[str, float] = {}
+    counters: dict[str, int] = {}
+    for report in reports:
+        for path, duration_ms in _flatten_spans(report.root['children']):
+            stage_totals[path] = stage_totals.get(path, 0.0) + duration_ms
+        for name, value in report.counters.items():
+            counters[name] = counters.get(name, 0) + value
+
+    total_ms = sum(durations) or 1.0
+    stages = [
+        {
+            'stage': path,
+            'mean_ms': round(ms / len(reports), 3),
+            'share': round(ms / total_ms, 4),
+            'network': path.rsplit('/', 1)[-1] in NETWORK_SPANS,
+        }
+        for path, ms in sorted(stage_totals.items(), key=lambda item: -item[1])[:top]
+    ]
+
+    return {
+        'runs': len(reports),
+        'failed': sum(1 for report in reports if report.status != 'ok'),
+        'wall_s': round(wall_s, 3),
+        'runs_per_s': round(len(reports) / wall_s, 3) if wall_s else 0.0,
+        'run_ms': {
+            'p50': round(percentile(durations, 50), 1),
+            'p95': round(percentile(durations, 95), 1),
+            'max': round(max(durations), 1),
+            'mean_non_network': round((sum(durations) - sum(network)) / len(reports), 1),
+        },
+        'network_share': round(sum(network) / total_ms, 4),
+        'stages': stages,
+        'counters': {name: round(value / len(reports), 1) for name, value in sorted(counters.items())},
+    }
+
+
+def load_test(
+    server,
+    vault: Path,
+    root: Path,
+    runs: int = 5,
+    profiles: int = 4,
+    concurrency: int = 4,
+    reuse: bool = False,
+    profiler: bool = False,
+) -> tuple[dict, object | None]:
+    """
+    Run the pipeline runs x profiles times against a replay (or stub) server.
+
+    Returns:
+        tuple: (summary, see summarize_reports; pstats.Stats of every worker, if profiler)
+    """
+    from batch_runner import map_profiles, process_profile
+    from instrumentation import collect_reports
+
+    batch = [
+        bench_profile_for(f'load-{i}', vault, fresh_data_dir(root, f'data-load-{i}'))
+        for i in range(profiles)
+    ]
+    profiles_run = []
+
+    def worker(profile):
+        if profiler:
+            import cProfile
+
+            # cProfile only sees the thread it is enabled in, so each worker has its own
+            prof = cProfile.Profile()
+            profiles_run.append(prof)
+            prof.enable()
+        try:
+            return [process_profile(profile, fresh=not reuse) for _ in range(runs)]
+        finally:
+            if profiler:
+                prof.disable()
+
+    use_stub(server)
+    with collect_reports() as reports, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        map_profiles(worker, batch, concurrency)
+        wall_s = time.perf_counter() - start
+
+    stats = None
+    if profiles_run:
+        import pstats
+
+        stats = pstats.Stats(*profiles_run, stream=sys.stdout)
+    return summarize_reports(reports, wall_s), stats
+
+
+def print_summary(summary: dict, misses: list | None = None) -> None:
+    run_ms = summary['run_ms']
+    print(f"\n{summary['runs']} runs ({summary['failed']} failed) in {summary['wall_s']:.2f}s: "
+          f"{summary['runs_per_s']:.2f} runs/s")
+    if run_ms:
+        print(f"Run time: p50 {run_ms['p50']:.0f} ms, p95 {run_ms['p95']:.0f} ms, max {run_ms['max']:.0f} ms; "
+              f"{run_ms['mean_non_network']:.0f} ms per run not waiting on the network "
+              f"({1 - summary['network_share']:.0%} of run time)")
+    print(f"\n{'stage':<52} {'mean ms':>10} {'share':>7}")
+    for stage in summary['stages']:
+        flag = '  (network)' if stage['network'] else ''
+        print(f"{stage['stage']:<52} {stage['mean_ms']:>10.1f} {stage['share']:>7.1%}{flag}")
+    if summary['counters']:
+        print("\nCounters per run: " + ', '.join(f"{k}={v:g}" for k, v in summary['counters'].items()))
+    if misses:
+        print(f"\n{len(misses)} requests were not in the cassette, e.g. {misses[0][0]} {misses[0][1]}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the pipeline against replayed API calls')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--cassette', type=Path, help='Cassette to replay (see benchmarks.cassette)')
+    source.add_argument('--stub', action='store_true', help='Record the stub server and replay that')
+    parser.add_argument('--notes', type=int, default=1000, help='Notes in the synthetic vault')
+    parser.add_argument('--runs', type=int, default=5, help='Pipeline runs per profile')
+    parser.add_argument('--profiles', type=int, default=4, help='Profiles run concurrently')
+    parser.add_argument('--concurrency', type=int, default=4, help='Profiles in flight at once')
+    parser.add_argument('--latency', type=float, help='Fixed seconds per replayed call (default: as recorded)')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiply recorded latencies by this')
+    parser.add_argument('--reuse', action='store_true', help='Let runs reuse saved stage results')
+    parser.add_argument('--cprofile', type=Path, metavar='FILE', help='Profile every worker and save pstats here')
+    parser.add_argument('--json', type=Path, metavar='FILE', help='Also save the summary as JSON')
+    parser.add_argument('--workdir', type=Path, help='Keep the generated vault here between runs')
+    args = parser.parse_args(argv)
+
+    from benchmarks.cassette import ReplayServer, load_cassette, record
+    from benchmarks.synthetic import generate_vault
+
+    root = args.workdir or Path(tempfile.mkdtemp(prefix='life-dashboard-load-'))
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        vault = root / f'vault-{args.notes}'
+        if not vault.exists():
+            print(f"Generating {args.notes}-note vault...")
+            generate_vault(vault, notes=args.notes)
+
+        if args.stub:
+            print("Recording the stub server...")
+            with contextlib.redirect_stdout(io.StringIO()):
+                record(root / 'stub-cassette.json', bench_profile_for('record', vault, SEED_DATA_DIR), stub=True)
+            cassette = load_cassette(root / 'stub-cassette.json')
+        else:
+            cassette = load_cassette(args.cassette)
+
+        print(f"Running {args.profiles} profiles x {args.runs} runs, {args.concurrency} at a time...")
+        with ReplayServer(cassette, args.latency, args.latency_scale) as server:
+            summary, stats = load_test(
+                server, vault, root, args.runs, args.profiles, args.concurrency, args.reuse, bool(args.cprofile))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print_summary(summary, server.misses)
+    if stats is not None:
+        stats.dump_stats(args.cprofile)
+        print(f"\nHottest functions (own time, all workers), saved to {args.cprofile}:")
+        stats.sort_stats('tottime').print_stats(20)
+    if args.json:
+        args.json.write_bytes(serialization.dumps(summary))
+    return 0 if summary['runs'] and not summary['failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Run the backend benchmarks and compare against a stored baseline.
+
+    python -m benchmarks.run                                 # 1k-note vault, 1k/10k timelines
+    python -m benchmarks.run --notes 1000,10000,100000 --timeline 1000,100000
+    python -m benchmarks.run --save-baseline                 # store results as the new baseline
+
+Everything runs against a synthetic vault, a temporary data directory and
+a local stub of the GitHub and Anthropic APIs, so no network or real data
+is touched.
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import serialization
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+SEED_DATA_DIR = BENCH_DIR.parent.parent / 'data'
+
+
+def bench_profile_for(name: str, vault: Path, data_dir: Path):
+    """Profile reading a synthetic vault and writing everything to a scratch directory."""
+    from profiles import Profile
+
+    return Profile(name=name, vault_path=str(vault), data_dir=data_dir, github_username='bench-user')
+
+
+def bench_profile(name: str, vault: Path, data_dir: Path):
+    """Make a scratch profile active for the duration of a `with` block."""
+    from profiles import use_profile
+
+    return use_profile(bench_profile_for(name, vault, data_dir))
+
+
+def use_stub(stub, api_key: str | None = 'stub-key') -> None:
+    """
+    Send GitHub and Anthropic calls to the stub server.
+
+    With api_key=None the configured keys are kept (e.g. when the server
+    is a recording proxy forwarding to the real APIs).
+    """
+    import os
+    import claude_analyzer
+    import github_fetcher
+    import http_client
+
+    github_fetcher.GITHUB_API_URL = stub.url
+    if api_key is not None:
+        claude_analyzer.ANTHROPIC_API_KEY = api_key
+        http_client.ANTHROPIC_API_KEY = api_key
+    os.environ['ANTHROPIC_BASE_URL'] = stub.url
+    http_client.reset_clients()  # shared clients pick up the base URL when created
+
+
+def fresh_data_dir(root: Path, name: str) -> Path:
+    """Copy the repo's seed data files into a scratch data directory."""
+    path = root / name
+    if path.exists():
+        shutil.rmtree(path)
+    shutil.copytree(SEED_DATA_DIR, path, ignore=shutil.ignore_patterns('logs', 'cache'))
+    return path
+
+
+def measure(fn, repeat: int, items: int = 1) -> dict:
+    """
+    Time `fn` `repeat` times (output suppressed), then once more under
+    tracemalloc for peak Python memory.
+    """
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'seconds': round(best, 6),
+        'mean_seconds': round(sum(times) / len(times), 6),
+        'items': items,
+        'throughput': round(items / best, 1) if best else None,
+        'peak_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+# Modules whose cold import time is tracked, plus the quick CLI path
+IMPORT_TARGETS = ['config', 'data_manager', 'obsidian_reader', 'claude_analyzer', 'github_fetcher', 'main', 'cli']
+
+
+def bench_imports(repeat: int) -> dict:
+    """Cold import time of the entry-point modules, each in a fresh interpreter."""
+    backend_dir = BENCH_DIR.parent
+    results = {}
+
+    def run(code: str) -> float:
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=backend_dir, capture_output=True, text=True, check=True
+        ).stdout
+        return float(output.strip().splitlines()[-1])
+
+    targets = {f'import[{m}]': f"import {m}" for m in IMPORT_TARGETS}
+    targets['cli status'] = "import cli; cli.main(['status'])"
+
+    for name, statement in targets.items():
+        code = (
+            "import time, io, contextlib; s = time.perf_counter()\n"
+            f"with contextlib.redirect_stdout(io.StringIO()): {statement}\n"
+            "print(time.perf_counter() - s)"
+        )
+        times = [run(code) for _ in range(repeat)]
+        results[name] = {
+            'seconds': round(min(times), 6),
+            'mean_seconds': round(sum(times) / len(times), 6),
+            'items': 1,
+            'throughput': None,
+            'peak_mb': 0.0,
+        }
+    return results
+
+
+def bench_vault(root: Path, notes: int, repeat: int) -> dict:
+    """Vault scanning, prompt building and full-vault scan for one vault size."""
+    from benchmarks.synthetic import generate_vault
+    import obsidian_reader
+    from prompts import get_user_prompt
+
+    vault = root / f'vault-{notes}'
+    if not vault.exists():
+        print(f"  generating {notes}-note vault...")
+        generate_vault(vault, notes=notes)
+    results = {}
+    with bench_profile('bench', vault, fresh_data_dir(root, f'data-vault-{notes}')):
+        summary = obsidian_reader.get_notes_summary()
+        results[f'get_notes_summary[{notes}]'] = measure(
+            obsidian_reader.get_notes_summary, repeat, summary['total_notes'])
+        results[f'get_user_prompt[{notes}]'] = measure(
+            lambda: get_user_prompt(summary, {}, [], {}, 14), repeat)
+        results[f'get_all_notes_for_initial_scan[{notes}]'] = measure(
+            obsidian_reader.get_all_notes_for_initial_scan, max(1, repeat // 2), notes)
+    return results
+
+
+def bench_timeline(root: Path, length: int, repeat: int) -> dict:
+    """Adding a handful of entries to a timeline of the given length."""
+    from benchmarks.synthetic import generate_timeline
+    import data_manager
+
+    batch = [0]
+
+    def add_unique():
+        batch[0] += 1
+        entries = generate_timeline(5, seed=batch[0])
+        for i, entry in enumerate(entries):
+            entry['id'] = f"tl-new-{batch[0]}-{i}"
+        data_manager.add_timeline_entries(entries)
+
+    with bench_profile('bench', root / 'no-vault', fresh_data_dir(root, f'data-timeline-{length}')):
+        data_manager.write_timeline(generate_timeline(length))
+        return {f'add_timeline_entries[{length}]': measure(add_unique, repeat, 5)}
+
+
+def bench_pipeline(root: Path, notes: int, repeat: int) -> dict:
+    """The full process_life_data run against the stub server."""
+    from benchmarks.stub_server import StubServer
+    import main
+
+    with StubServer() as stub, bench_profile('bench', root / f'vault-{notes}', fresh_data_dir(root, f'data-pipeline-{notes}')):
+        use_stub(stub)
+        return {
+            f'process_life_data[{notes}]': measure(lambda: main.process_life_data(fresh=True), repeat),
+            f'process_life_data_resumed[{notes}]': measure(lambda: main.process_life_data(from_stage='apply'), repeat),
+        }
+
+
+def bench_github(root: Path, repeat: int) -> dict:
+    """Both GitHub collectors against the stub server, without the local cache."""
+    from dataclasses import replace
+    from benchmarks.stub_server import StubServer, stub_events
+    from profiles import use_profile
+    import github_fetcher
+
+    # The GraphQL collector needs a token
+    profile = replace(bench_profile_for('bench', root, root / 'data-github'), github_token='stub-token')
+    with StubServer(latency=0.05, events=stub_events(100)) as stub, use_profile(profile):
+        use_stub(stub)
+        return {
+            'github_summary[events]': measure(
+                lambda: github_fetcher.summarize_github_events(github_fetcher.get_github_events()), repeat),
+            'github_summary[graphql]': measure(
+                lambda: github_fetcher.summarize_contributions(github_fetcher.fetch_contributions()), repeat),
+        }
+
+
+def bench_batch(root: Path, notes: int, profiles: int, repeat: int) -> dict:
+    """
+    Several profiles through batch_runner, one at a time and all at once,
+    against a stub with realistic API latency.
+    """
+    from benchmarks.stub_server import StubServer
+    from batch_runner import run_batch
+
+    vault = root / f'vault-{notes}'
+    batch = [
+        bench_profile_for(f'bench-{i}', vault, fresh_data_dir(root, f'data-batch-{notes}-{i}'))
+        for i in range(profiles)
+    ]
+
+    with StubServer(latency=0.2) as stub:
+        use_stub(stub)
+        return {
+            f'run_batch[{profiles}x{notes},sequential]': measure(
+                lambda: run_batch(batch, concurrency=1, fresh=True), repeat, profiles),
+            f'run_batch[{profiles}x{notes},concurrent]': measure(
+                lambda: run_batch(batch, concurrency=profiles, fresh=True), repeat, profiles),
+        }
+
+
+def bench_read_api(root: Path, entries: int, repeat: int, requests_per_round: int = 200) -> dict:
+    """
+    Request throughput of the local read API over a timeline of `entries`,
+    for queries it hasn't seen, repeated queries and 304 revalidations.
+    """
+    import threading
+    import requests
+    from benchmarks.synthetic import generate_timeline
+    from profiles import use_profile
+    import data_manager
+    from read_api import make_server
+
+    profile = bench_profile_for('bench', root, fresh_data_dir(root, f'data-api-{entries}'))
+    with use_profile(profile):
+        data_manager.write_timeline(generate_timeline(entries))
+
+    server = make_server('127.0.0.1', 0, profile)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/timeline?category=work&from=2025-01-01&to=2025-12-31"
+    session = requests.Session()
+    etag = session.get(url).headers['ETag']
+    offsets = iter(range(10**9))
+
+    def distinct():
+        for _ in range(requests_per_round):
+            session.get(f"{url}&limit=20&offset={next(offsets) % 1000}&nonce={next(offsets)}").raise_for_status()
+
+    def repeated():
+        for _ in range(requests_per_round):
+            session.get(url).raise_for_status()
+
+    def revalidated():
+        for _ in range(requests_per_round):
+            assert session.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    try:
+        return {
+            f'read_api[{entries},distinct]': measure(distinct, repeat, requests_per_round),
+            f'read_api[{entries},repeated]': measure(repeated, repeat, requests_per_round),
+            f'read_api[{entries},304]': measure(revalidated, repeat, requests_per_round),
+        }
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names of benchmarks slower than baseline by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        result['vs_baseline'] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: dict, regressions: list[str]) -> None:
+    print(f"\n{'benchmark':<48} {'best s':>10} {'items/s':>12} {'peak MB':>9} {'vs base':>8}")
+    for name, r in results.items():
+        ratio = f"{r['vs_baseline']:.2f}x" if 'vs_baseline' in r else '-'
+        flag = '  REGRESSION' if name in regressions else ''
+        throughput = f"{r['throughput']:.0f}" if r['throughput'] else '-'
+        print(f"{name:<48} {r['seconds']:>10.4f} {throughput:>12} {r['peak_mb']:>9.2f} {ratio:>8}{flag}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run Life Dashboard backend benchmarks')
+    parser.add_argument('--notes', default='1000', help='Comma-separated vault sizes (default: 1000)')
+    parser.add_argument('--timeline', default='1000,10000', help='Comma-separated timeline lengths')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions per benchmark')
+    parser.add_argument('--no-pipeline', action='store_true', help='Skip the full pipeline benchmark')
+    parser.add_argument('--no-imports', action='store_true', help='Skip the import-time benchmarks')
+    parser.add_argument('--profiles', type=int, default=4, help='Profiles in the batch benchmark (0 to skip)')
+    parser.add_argument('--workdir', type=Path, help='Keep generated vaults here between runs')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline results file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before flagging (default: 0.25)')
+    args = parser.parse_args()
+
+    note_sizes = [int(n) for n in args.notes.split(',') if n]
+    timeline_sizes = [int(n) for n in args.timeline.split(',') if n]
+
+    root = args.workdir or Path(tempfile.mkdtemp(prefix='life-dashboard-bench-'))
+    root.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    try:
+        if not args.no_imports:
+            print("Import-time benchmarks...")
+            results.update(bench_imports(args.repeat))
+        for notes in note_sizes:
+            print(f"Vault benchmarks ({notes} notes)...")
+            results.update(bench_vault(root, notes, args.repeat))
+        for length in timeline_sizes:
+            print(f"Timeline benchmarks ({length} entries)...")
+            results.update(bench_timeline(root, length, args.repeat))
+        if timeline_sizes:
+            print(f"Read API benchmark ({timeline_sizes[-1]} entries)...")
+            results.update(bench_read_api(root, timeline_sizes[-1], args.repeat))
+        if not args.no_pipeline and note_sizes:
+            print(f"Pipeline benchmark ({note_sizes[0]} notes)...")
+            results.update(bench_pipeline(root, note_sizes[0], args.repeat))
+            print("GitHub collector benchmarks...")
+            results.update(bench_github(root, args.repeat))
+            if args.profiles:
+                print(f"Batch benchmark ({args.profiles} profiles)...")
+                results.update(bench_batch(root, note_sizes[0], args.profiles, args.repeat))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    baseline = serialization.loads(args.baseline.read_bytes()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+    print_results(results, regressions)
+
+    if args.save_baseline:
+        args.baseline.write_bytes(serialization.dumps({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'json_backend': serialization.BACKEND,
+            'results': results,
+        }))
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
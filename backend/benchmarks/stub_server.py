@@ -0,0 +1,291 @@
+"""Local stand-in for the GitHub and Anthropic APIs."""
+
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_ANALYSIS = {
+    'timeline_entries': [
+        {
+            'id': 'tl-stub-0',
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'category': 'work',
+            'title': 'Benchmark entry',
+            'content': 'Synthetic entry returned by the stub server.',
+            'significance': 'minor',
+        },
+    ],
+    'quadrant_updates': {
+        key: {
+            'status': 'balanced',
+            'lastActivity': datetime.now().strftime('%Y-%m-%d'),
+            'activityPulse': True,
+            'recentHighlight': 'Stub highlight',
+            'metrics': {'sessions': 1},
+        }
+        for key in ('relationships', 'parkour', 'work', 'travel')
+    },
+    'right_now': {
+        'summary': 'Stub summary.',
+        'valuesAlignment': {'score': 70, 'livingWell': [], 'needsAttention': [], 'note': ''},
+        'actionables': [],
+        'celebration': 'Stub celebration',
+        'friendlyNote': 'Stub note.',
+        'balanceCheck': {'mood': 'balanced', 'recommendation': ''},
+    },
+    'extracted_goals': [],
+    'extracted_inspiration': [],
+}
+
+
+def stub_events(count: int = 30) -> list[dict]:
+    """GitHub push events spread over the last two weeks."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            'type': 'PushEvent',
+            'created_at': (now - timedelta(hours=11 * i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'repo': {'name': f"stub/repo-{i % 3}"},
+            'payload': {'commits': [{'message': f"Commit {i}"}]},
+        }
+        for i in range(count)
+    ]
+
+
+def stub_contributions(events: list[dict], since: str) -> dict:
+    """
+    GraphQL contributions for the stub events: a year-long calendar (the
+    events' commits per day, and a fixed pattern before them) plus the
+    per-repo commits of events after `since`.
+    """
+    per_day: dict[str, int] = {}
+    per_repo: dict[str, dict[str, int]] = {}
+    for event in events:
+        commits = len(event.get('payload', {}).get('commits', []))
+        day = event['created_at'][:10]
+        per_day[day] = per_day.get(day, 0) + commits
+        if event['created_at'] >= since:
+            repo = per_repo.setdefault(event['repo']['name'].split('/')[-1], {})
+            repo[day] = repo.get(day, 0) + commits
+
+    today = datetime.now(timezone.utc).date()
+    earliest = min(per_day, default=today.isoformat())
+    days = []
+    for i in range(364, -1, -1):
+        day = (today - timedelta(days=i)).isoformat()
+        days.append({'date': day, 'contributionCount': per_day.get(day, 0) if day >= earliest else (i * 7) % 5})
+    weeks = [{'contributionDays': days[i:i + 7]} for i in range(0, len(days), 7)]
+
+    return {'data': {'user': {
+        'year': {'contributionCalendar': {
+            'totalContributions': sum(d['contributionCount'] for d in days),
+            'weeks': weeks,
+        }},
+        'recent': {
+            'totalCommitContributions': sum(sum(r.values()) for r in per_repo.values()),
+            'restrictedContributionsCount': 0,
+            'commitContributionsByRepository': [
+                {
+                    'repository': {'name': name, 'isPrivate': False},
+                    'contributions': {
+                        'totalCount': len(repo_days),
+                        'nodes': [{'commitCount': n} for n in repo_days.values()],
+                    },
+                }
+                for name, repo_days in per_repo.items()
+            ],
+        },
+    }}}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes requests to `route_<method>` handlers on the server."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't wait for delayed ACKs
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stub.lock:
+            self.server.stub.connections += 1
+
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        self.server.stub.current.raw_body = raw
+        return json.loads(raw) if raw else {}
+
+    def _send(self, status: int, payload) -> None:
+        # bytes payloads are sent as-is (e.g. JSONL batch results)
+        raw = isinstance(payload, bytes)
+        body = payload if raw else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/binary' if raw else 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        server: StubServer = self.server.stub
+        server.calls.append((method, self.path))
+        # The request as received, for handlers that need more than (match, body)
+        server.current.method = method
+        server.current.headers = self.headers
+        server.current.path = self.path
+        server.current.raw_body = b''
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = self.path.split('?', 1)[0]
+        body = self._body() if method == 'POST' else None
+        for route_method, pattern, handler in server.routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                status, payload = handler(match, body)
+                self._send(status, payload)
+                return
+        self._send(404, {'message': f'No stub for {method} {path}'})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+class StubServer:
+    """
+    Threaded local server with routes for the endpoints the backend uses.
+
+    Use as a context manager; `url` is the base URL to point
+    GITHUB_API_URL / ANTHROPIC_BASE_URL at. Message Batches end
+    `batch_seconds` after they are created.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        analysis: dict | None = None,
+        events: list | None = None,
+        batch_seconds: float = 0.0,
+    ):
+        self.latency = latency
+        self.analysis = analysis or STUB_ANALYSIS
+        self.events = events if events is not None else stub_events()
+        self.batch_seconds = batch_seconds
+        self.batches: dict[str, dict] = {}
+        self._batch_ids = itertools.count(1)
+        self.calls: list[tuple[str, str]] = []
+        self.connections = 0  # TCP connections accepted, to check keep-alive reuse
+        self.lock = threading.Lock()
+        self.current = threading.local()
+        self.routes = [
+            ('GET', r'/users/[^/]+/events/public', self._github_events),
+            ('POST', r'/graphql', self._github_graphql),
+            ('POST', r'/v1/messages', self._messages),
+            ('POST', r'/v1/messages/batches', self._create_batch),
+            ('GET', r'/v1/messages/batches/(?P<batch_id>[^/]+)', self._get_batch),
+            ('GET', r'/v1/messages/batches/(?P<batch_id>[^/]+)/results', self._batch_results),
+        ]
+        self._server = None
+        self._thread = None
+
+    def add_route(self, method: str, pattern: str, handler) -> None:
+        """Register `handler(match, body) -> (status, payload)` for a path regex."""
+        self.routes.append((method, pattern, handler))
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _github_events(self, match, body):
+        return 200, self.events
+
+    def _github_graphql(self, match, body):
+        since = body.get('variables', {}).get('from', '')[:19] + 'Z'
+        return 200, stub_contributions(self.events, since)
+
+    def _messages(self, match, body):
+        prompt_chars = sum(len(m.get('content', '')) for m in body.get('messages', []) if isinstance(m.get('content'), str))
+        text = json.dumps(self.analysis)
+        tools = body.get('tools') or []
+        if tools:
+            # Answer through the first tool, like a forced tool_choice
+            content = [{'type': 'tool_use', 'id': 'toolu_stub', 'name': tools[0]['name'], 'input': self.analysis}]
+        else:
+            content = [{'type': 'text', 'text': text}]
+        return 200, {
+            'id': 'msg_stub',
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model', 'stub'),
+            'content': content,
+            'stop_reason': 'tool_use' if tools else 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': prompt_chars // 4, 'output_tokens': len(text) // 4},
+        }
+
+    def _batch_object(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        ended = time.time() - batch['created'] >= self.batch_seconds
+        created = datetime.fromtimestamp(batch['created'], timezone.utc)
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {
+                'processing': 0 if ended else len(batch['requests']),
+                'succeeded': len(batch['requests']) if ended else 0,
+                'errored': 0,
+                'canceled': 0,
+                'expired': 0,
+            },
+            'created_at': created.isoformat(),
+            'expires_at': (created + timedelta(days=1)).isoformat(),
+            'ended_at': datetime.now(timezone.utc).isoformat() if ended else None,
+            'archived_at': None,
+            'cancel_initiated_at': None,
+            'results_url': f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _create_batch(self, match, body):
+        batch_id = f"msgbatch_stub{next(self._batch_ids)}"
+        self.batches[batch_id] = {'created': time.time(), 'requests': body.get('requests', [])}
+        return 200, self._batch_object(batch_id)
+
+    def _get_batch(self, match, body):
+        if match['batch_id'] not in self.batches:
+            return 404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': 'No such batch'}}
+        return 200, self._batch_object(match['batch_id'])
+
+    def _batch_results(self, match, body):
+        batch = self.batches.get(match['batch_id'])
+        if batch is None:
+            return 404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': 'No such batch'}}
+        lines = [
+            json.dumps({
+                'custom_id': request['custom_id'],
+                'result': {'type': 'succeeded', 'message': self._messages(None, request['params'])[1]},
+            })
+            for request in batch['requests']
+        ]
+        return 200, ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def __enter__(self) -> 'StubServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
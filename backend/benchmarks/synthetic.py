@@ -0,0 +1,111 @@
+"""Synthetic Obsidian vaults and timelines for benchmarking."""
+
+import os
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = (
+    "today felt good worked on maupka pilot customers investor funding coding product "
+    "parkour training kong vaults handspring dive roll workout planche movement "
+    "lunch with friends family ula talked to social relationship "
+    "japan japanese anki n3 tokyo travel trip language learning "
+    "tired stressed progress happy great stuck rest chill balance break fun "
+    "the a and of to in it is was for on with that this at by from"
+).split()
+
+PEOPLE = ['Ula', 'Marco', 'Damien', 'Eamon', 'Tom', 'Kay', 'Ruth', 'Killian', 'Jayden']
+TAGS = ['work', 'parkour', 'japan', 'idea', 'people', 'reading', 'startup', 'training']
+FOLDERS = ['Notes', 'Projects', 'Projects/Maupka', 'Areas', '_Areas/Health', 'Reading', 'Ideas']
+CATEGORIES = ['relationships', 'parkour', 'work', 'travel']
+SIGNIFICANCE = ['minor', 'notable', 'major']
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _note_body(rng: random.Random, titles: list[str], words: int) -> str:
+    lines = []
+    for _ in range(max(1, words // 60)):
+        lines.append(_paragraph(rng, 60))
+        if titles and rng.random() < 0.5:
+            lines.append(f"See [[{rng.choice(titles)}]] and [[{rng.choice(PEOPLE)}]]")
+        if rng.random() < 0.3:
+            lines.append(f"#{rng.choice(TAGS)}")
+    return '\n\n'.join(lines)
+
+
+def generate_vault(
+    path: Path,
+    notes: int = 1000,
+    journal_days: int = 365,
+    recent_fraction: float = 0.1,
+    words_per_note: int = 200,
+    seed: int = 0,
+) -> dict:
+    """
+    Write a synthetic vault with notes, `_Journal/YYYY-MM-DD.md` entries,
+    frontmatter, wikilinks and tags.
+
+    A `recent_fraction` of the notes get an mtime inside the default
+    look-back window; the rest are spread over the previous two years.
+
+    Returns:
+        dict: Counts of what was generated
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    now = time.time()
+    titles = [f"Note {i}" for i in range(notes)]
+
+    for folder in FOLDERS:
+        (path / folder).mkdir(parents=True, exist_ok=True)
+    (path / '.obsidian').mkdir(exist_ok=True)
+    (path / '_Journal').mkdir(exist_ok=True)
+
+    for i, title in enumerate(titles):
+        file = path / rng.choice(FOLDERS) / f"{title}.md"
+        tags = rng.sample(TAGS, 2)
+        file.write_text(
+            f"---\ntags: [{', '.join(tags)}]\ncreated: 2025-01-01\n---\n"
+            f"# {title}\n\n{_note_body(rng, titles, words_per_note)}\n",
+            encoding='utf-8',
+        )
+        age_days = rng.uniform(0, 10) if rng.random() < recent_fraction else rng.uniform(15, 730)
+        mtime = now - age_days * 86400
+        os.utime(file, (mtime, mtime))
+
+    today = date.today()
+    for d in range(journal_days):
+        day = today - timedelta(days=d)
+        file = path / '_Journal' / f"{day.isoformat()}.md"
+        file.write_text(
+            f"---\nmood: {rng.choice(['good', 'ok', 'tired'])}\n---\n"
+            f"{_note_body(rng, titles, words_per_note // 2)}\n",
+            encoding='utf-8',
+        )
+        mtime = now - d * 86400
+        os.utime(file, (mtime, mtime))
+
+    return {'notes': notes, 'journals': journal_days}
+
+
+def generate_timeline(entries: int, seed: int = 0) -> list[dict]:
+    """Synthetic timeline entries, most recent first."""
+    rng = random.Random(seed)
+    today = date.today()
+    timeline = [
+        {
+            'id': f"tl-bench-{i}",
+            'date': (today - timedelta(days=rng.randint(0, 3 * 365))).isoformat(),
+            'category': rng.choice(CATEGORIES),
+            'title': _paragraph(rng, 5)[:50],
+            'content': _paragraph(rng, 25),
+            'significance': rng.choice(SIGNIFICANCE),
+        }
+        for i in range(entries)
+    ]
+    timeline.sort(key=lambda e: e['date'], reverse=True)
+    return timeline
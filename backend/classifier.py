@@ -0,0 +1,274 @@
+"""Batch TF-IDF classifier that assigns notes to life quadrants."""
+
+import re
+from collections import Counter
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # scipy is optional, dense numpy works for vault-sized batches
+    sparse = None
+
+from config import (
+    CLASSIFIER_MIN_CONFIDENCE,
+    CLASSIFIER_MIN_LIFT,
+    CLASSIFIER_MIN_SUPPORT,
+    CLASSIFIER_SELF_TRAIN,
+    QUADRANT_KEYWORDS,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Score of the "uncategorized" option. Every distinct seed keyword in a note
+# scores exactly 1, so without self-training this is the old "2 keyword hits"
+# rule (a tie goes to the quadrant)
+UNCATEGORIZED_LOGIT = 2.0
+
+# How much self-trained weights count relative to the seed keywords
+TRAINED_WEIGHT = 0.5
+
+# Words too common to say anything about a quadrant; never learned by fit()
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each even few for from further
+get got had has have having he her here hers herself him himself his how i if in into is it its
+itself just let like made make me more most much my myself no nor not now of off on once only or
+other our ours ourselves out over own really same she should so some still such than that the
+their theirs them themselves then there these they this those through to too under until up us
+very was we well went were what when where which while who whom why will with would you your
+yours yourself yourselves today yesterday tomorrow week day time new one two first last next
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase unigrams and bigrams."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def learnable(term: str) -> bool:
+    """Whether fit() may learn a term: no stopwords, numbers or one- and two-letter words in it."""
+    return all(len(word) > 2 and not word.isdigit() and word not in STOPWORDS for word in term.split(' '))
+
+
+def note_text(note) -> str:
+    """Text used to classify a note (an obsidian_reader.Note): filename stem plus content as far as it was read."""
+    filename = note.filename
+    if filename.endswith('.md'):
+        filename = filename[:-3]
+    return f"{filename}\n{note.head}"
+
+
+class QuadrantClassifier:
+    """
+    Scores a batch of documents against per-quadrant weight vectors.
+
+    Documents are vectorized into a sparse term-presence matrix,
+    multiplied by a term x quadrant weight matrix, and the resulting scores
+    are turned into probabilities with a softmax that includes an
+    "uncategorized" option. Seed keywords weigh 1 each, so a note's score
+    doesn't depend on what else is in the batch; fit() adds learned weights
+    (TF-IDF over the training entries) on top.
+    """
+
+    def __init__(
+        self,
+        keywords: dict[str, list[str]] = QUADRANT_KEYWORDS,
+        min_confidence: float = CLASSIFIER_MIN_CONFIDENCE,
+        temperature: float = 1.0,
+        min_support: int = CLASSIFIER_MIN_SUPPORT,
+        min_lift: float = CLASSIFIER_MIN_LIFT,
+    ):
+        self.quadrants = list(keywords)
+        self.min_confidence = min_confidence
+        self.temperature = temperature
+        self.min_support = min_support
+        self.min_lift = min_lift
+
+        self.vocabulary: dict[str, int] = {}
+        self.seeds: dict[str, set[int]] = {}  # seed keyword -> quadrants it belongs to
+        for q, terms in enumerate(keywords.values()):
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+                self.seeds.setdefault(term, set()).add(q)
+
+        self.weights = np.zeros((len(self.vocabulary), len(self.quadrants)))
+        for q, terms in enumerate(keywords.values()):
+            for term in terms:
+                self.weights[self.vocabulary[term], q] = 1.0
+
+    def _term_matrix(self, texts: list[str], vocabulary: dict[str, int] | None = None):
+        """Build a (docs x vocabulary) matrix of term presence (default: the classifier's vocabulary)."""
+        vocabulary = self.vocabulary if vocabulary is None else vocabulary
+        rows, cols = [], []
+        for i, text in enumerate(texts):
+            for term in {t for t in tokenize(text) if t in vocabulary}:
+                rows.append(i)
+                cols.append(vocabulary[term])
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.ones(len(cols))
+
+        shape = (len(texts), len(vocabulary))
+        if sparse is not None:
+            return sparse.csr_matrix((values, (rows, cols)), shape=shape)
+        matrix = np.zeros(shape)
+        np.add.at(matrix, (rows, cols), values)
+        return matrix
+
+    def fit(self, entries: list[dict]) -> 'QuadrantClassifier':
+        """
+        Self-train from already-categorized entries (e.g. timeline entries).
+
+        A term (not a stopword, and not another quadrant's seed keyword)
+        is learned for a quadrant if at least CLASSIFIER_MIN_SUPPORT of its
+        entries contain it and it is CLASSIFIER_MIN_LIFT times more common
+        in them than in any other quadrant's. Its weight is that margin
+        times its IDF over these entries, scaled so the strongest learned
+        term adds TRAINED_WEIGHT on top of the seed keywords' 1.
+
+        Args:
+            entries: Dicts with 'category' plus 'title' and/or 'content'
+
+        Returns:
+            self, for chaining
+        """
+        labelled = [e for e in entries if e.get('category') in self.quadrants]
+        if not labelled:
+            return self
+
+        texts = [f"{e.get('title', '')}\n{e.get('content', '')}" for e in labelled]
+        df = Counter(term for text in texts for term in set(tokenize(text)) if learnable(term))
+        candidates = {}
+        for term, count in df.items():
+            if count >= self.min_support:
+                candidates.setdefault(term, len(candidates))
+        if not candidates:
+            return self
+
+        n_quadrants = len(self.quadrants)
+        labels = np.array([self.quadrants.index(e['category']) for e in labelled])
+        members = np.zeros((n_quadrants, len(texts)))
+        members[labels, np.arange(len(texts))] = 1.0
+        matrix = self._term_matrix(texts, vocabulary=candidates)
+
+        # Entries of each quadrant containing each term, and the share of them
+        support = np.asarray(matrix.T @ members.T).T
+        sizes = np.bincount(labels, minlength=n_quadrants)[:, None]
+        rate = support / np.maximum(sizes, 1)
+        others = np.array([np.delete(rate, q, axis=0).max(axis=0) for q in range(n_quadrants)])
+
+        doc_count = np.array([df[term] for term in candidates], dtype=np.float64)
+        idf = np.log((1.0 + len(texts)) / (1.0 + doc_count)) + 1.0
+        learned = np.where(
+            (support >= self.min_support) & (rate >= self.min_lift * others) & (rate > others),
+            (rate - others) * idf,
+            0.0,
+        )
+        for term, i in candidates.items():
+            for q in self.seeds.get(term, ()):
+                learned[np.arange(n_quadrants) != q, i] = 0.0
+
+        peak = learned.max()
+        if peak <= 0:
+            return self
+        kept = [(term, i) for term, i in candidates.items() if learned[:, i].any()]
+        for term, _ in kept:
+            self.vocabulary.setdefault(term, len(self.vocabulary))
+        extra = len(self.vocabulary) - self.weights.shape[0]
+        self.weights = np.vstack([self.weights, np.zeros((extra, n_quadrants))])
+        for term, i in kept:
+            self.weights[self.vocabulary[term]] += TRAINED_WEIGHT * learned[:, i] / peak
+
+        return self
+
+    def score(self, texts: list[str]) -> np.ndarray:
+        """
+        Score a batch of texts.
+
+        Returns:
+            array of shape (len(texts), len(quadrants) + 1) with probabilities;
+            the last column is the probability of being uncategorized
+        """
+        if not texts:
+            return np.zeros((0, len(self.quadrants) + 1))
+
+        raw = self._term_matrix(texts) @ self.weights
+        logits = np.column_stack([np.asarray(raw), np.full(len(texts), UNCATEGORIZED_LOGIT)])
+        logits = logits / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def classify(self, notes: list) -> list[tuple[str | None, dict[str, float]]]:
+        """
+        Classify a batch of notes in one pass.
+
+        Returns:
+            list of (quadrant key or None, {quadrant: probability}) per note
+        """
+        probs = self.score([note_text(n) for n in notes])
+        best = probs.argmax(axis=1)
+
+        results = []
+        for row, idx in zip(probs, best):
+            scores = {q: round(float(p), 3) for q, p in zip(self.quadrants, row)}
+            category = None
+            if idx < len(self.quadrants) and row[idx] >= self.min_confidence:
+                category = self.quadrants[idx]
+            results.append((category, scores))
+        return results
+
+
+# Built classifiers by (data directory, keywords, self_train): (timeline stamp, classifier)
+_classifiers: dict[tuple, tuple[tuple | None, QuadrantClassifier]] = {}
+
+
+def build_classifier(self_train: bool = CLASSIFIER_SELF_TRAIN) -> QuadrantClassifier:
+    """
+    The active profile's classifier, optionally self-trained from its timeline.
+
+    Built once and reused (so don't fit() it again) until the profile's
+    keywords or its timeline change.
+    """
+    from data_manager import get_timeline, timeline_stamp
+    from profiles import current_profile
+
+    profile = current_profile()
+    keywords = profile.quadrant_keywords
+    key = (profile.data_dir, tuple((q, tuple(terms)) for q, terms in keywords.items()), self_train)
+    stamp = timeline_stamp() if self_train else None
+    cached = _classifiers.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    classifier = QuadrantClassifier(keywords)
+    if self_train:
+        classifier.fit(get_timeline())
+    _classifiers[key] = (stamp, classifier)
+    return classifier
+
+
+if __name__ == '__main__':
+    from obsidian_reader import Note
+
+    # Quick check against a few sample notes
+    samples = [
+        Note('', 'Training log.md', 'notes', 0, content='Parkour session: kong vaults and a dive roll.'),
+        Note('', 'Maupka.md', 'notes', 0, content='Pilot with customers, talked to an investor about funding.'),
+        Note('', 'Shopping.md', 'notes', 0, content='Milk, eggs, bread.'),
+    ]
+    classifier = build_classifier()
+    for note, (category, scores) in zip(samples, classifier.classify(samples)):
+        print(f"{note.filename}: {category} {scores}")
+
+    # Generic prose has to stay uncategorized, however the classifier was trained
+    prose = [
+        Note('', 'Groceries.md', 'notes', 0, content='Milk, eggs, bread and some of the things for this week.'),
+        Note('', 'Thoughts.md', 'notes', 0, content='It is what it is. This is the start of something, and I will get to it in the morning.'),
+    ]
+    for note, (category, scores) in zip(prose, classifier.classify(prose)):
+        assert category is None, f"{note.filename} classified as {category}: {scores}"
+    print("Generic prose stays uncategorized")
@@ -1,10 +1,22 @@
 """Claude API integration for life analysis."""
 
+import asyncio
 import json
-from anthropic import Anthropic
+import time
+from datetime import datetime
 
-from config import ANTHROPIC_API_KEY
+import serialization
+from config import ANTHROPIC_API_KEY, CLAUDE_MODEL, ANALYSIS_MAX_TOKENS, TOKEN_COUNT_MODE, PENDING_BATCHES_FILE
+from analysis_schema import ANALYSIS_TOOL_NAME, analysis_errors, analysis_tool, fit_analysis
+from data_lock import data_lock
+from http_client import anthropic_client, async_anthropic_client
+from instrumentation import count, span
+from profiles import current_profile
 from prompts import get_system_prompt, get_user_prompt
+from token_budget import TokenBudget, count_input_tokens, record_usage
+
+# Progressively smaller prompt sizes (max_notes, preview_chars) tried to fit the budget
+PROMPT_SIZES = [(25, 800), (15, 500), (10, 300), (5, 200)]
 
 
 def analyze_life_data(
@@ -12,7 +24,8 @@ def analyze_life_data(
     github_summary: dict,
     manual_entries: list,
     current_quadrants: dict,
-    days: int = 14
+    days: int = 14,
+    budget: TokenBudget | None = None,
 ) -> dict | None:
     """
     Send data to Claude for analysis and get structured insights.
@@ -23,6 +36,8 @@ def analyze_life_data(
         manual_entries: List of manual entries
         current_quadrants: Current quadrant data
         days: Number of days being analyzed
+        budget: Token budget for this run; the prompt is shrunk to fit it,
+            and the call is refused if even the smallest prompt doesn't
 
     Returns:
         dict: Parsed analysis results, or None on error
@@ -31,70 +46,341 @@ def analyze_life_data(
         print("Error: ANTHROPIC_API_KEY not set")
         return None
 
-    client = Anthropic(api_key=ANTHROPIC_API_KEY)
+    budget = budget or TokenBudget()
+    prompts = build_prompts(notes_summary, github_summary, manual_entries, current_quadrants, days, budget)
+    if prompts is None:
+        return None
+    return request_analysis(prompts, budget)
+
+
+async def analyze_life_data_async(
+    notes_summary: dict,
+    github_summary: dict,
+    manual_entries: list,
+    current_quadrants: dict,
+    days: int = 14,
+    budget: TokenBudget | None = None,
+) -> dict | None:
+    """Async variant of analyze_life_data, using the shared AsyncAnthropic client."""
+    if not ANTHROPIC_API_KEY:
+        print("Error: ANTHROPIC_API_KEY not set")
+        return None
 
-    system_prompt = get_system_prompt()
-    user_prompt = get_user_prompt(
-        notes_summary,
-        github_summary,
-        manual_entries,
-        current_quadrants,
-        days
+    budget = budget or TokenBudget()
+    # Prompt building may call the token-counting endpoint, so keep it off the loop
+    prompts = await asyncio.to_thread(
+        build_prompts, notes_summary, github_summary, manual_entries, current_quadrants, days, budget
     )
+    if prompts is None:
+        return None
+    return await request_analysis_async(prompts, budget)
+
+
+def get_client():
+    """The shared Anthropic client (see http_client)."""
+    return anthropic_client()
+
+
+def analysis_tools() -> list[dict]:
+    """The analysis tool for the active profile's quadrants."""
+    return [analysis_tool(list(current_profile().quadrants))]
+
+
+def build_prompts(
+    notes_summary: dict,
+    github_summary: dict,
+    manual_entries: list,
+    current_quadrants: dict,
+    days: int,
+    budget: TokenBudget,
+) -> dict | None:
+    """
+    Build the system and user prompts, shrinking the user prompt until the
+    request fits the token budget.
+
+    Returns:
+        dict: {'system', 'user', 'estimated_input_tokens', 'trimmed'}, or
+        None if even the smallest prompt is over budget
+    """
+    client = get_client() if TOKEN_COUNT_MODE == 'api' else None
+    tools = analysis_tools()
+
+    with span('build_prompt'):
+        system_prompt = get_system_prompt()
+        for max_notes, preview_chars in PROMPT_SIZES:
+            user_prompt = get_user_prompt(
+                notes_summary,
+                github_summary,
+                manual_entries,
+                current_quadrants,
+                days,
+                max_notes=max_notes,
+                preview_chars=preview_chars,
+            )
+            estimated_input = count_input_tokens(client, CLAUDE_MODEL, system_prompt, user_prompt, tools)
+            if budget.allows(estimated_input, ANALYSIS_MAX_TOKENS):
+                break
+            print(f"  Prompt (~{estimated_input} tokens) over budget, shrinking context...")
+        else:
+            print(f"Error: token budget exhausted ({budget.remaining():.0f} tokens left), not calling Claude")
+            return None
+
+    return {
+        'system': system_prompt,
+        'user': user_prompt,
+        'estimated_input_tokens': estimated_input,
+        'trimmed': (max_notes, preview_chars) != PROMPT_SIZES[0],
+    }
+
+
+def _can_request(prompts: dict, budget: TokenBudget) -> bool:
+    """Whether the API key is set and the request fits the budget."""
+    if not ANTHROPIC_API_KEY:
+        print("Error: ANTHROPIC_API_KEY not set")
+        return False
+    if not budget.allows(prompts['estimated_input_tokens'], ANALYSIS_MAX_TOKENS):
+        print(f"Error: token budget exhausted ({budget.remaining():.0f} tokens left), not calling Claude")
+        return False
+    return True
+
+
+def analysis_request_params(prompts: dict) -> dict:
+    """messages.create arguments for prebuilt prompts, requesting output through the analysis tool."""
+    return {
+        'model': CLAUDE_MODEL,
+        'max_tokens': ANALYSIS_MAX_TOKENS,
+        'system': prompts['system'],
+        'messages': [{"role": "user", "content": prompts['user']}],
+        'tools': analysis_tools(),
+        'tool_choice': {"type": "tool", "name": ANALYSIS_TOOL_NAME},
+    }
+
+
+def _handle_response(message, latency_ms: float, prompts: dict, budget: TokenBudget) -> dict | None:
+    """Account for a response's tokens and extract its analysis."""
+    count('http_calls')
+    count('tokens_in', message.usage.input_tokens)
+    count('tokens_out', message.usage.output_tokens)
+    budget.charge(record_usage(
+        CLAUDE_MODEL, message.usage, latency_ms, estimated_input=prompts['estimated_input_tokens']))
+    return analysis_from_message(message)
+
+
+def request_analysis(prompts: dict, budget: TokenBudget) -> dict | None:
+    """
+    Send prebuilt prompts to Claude and parse the JSON analysis.
+
+    Returns:
+        dict: Parsed analysis results, or None on error
+    """
+    if not _can_request(prompts, budget):
+        return None
 
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-
-        # Extract the response text
-        response_text = message.content[0].text
-
-        # Parse JSON (Claude should return valid JSON)
-        # Sometimes Claude adds markdown code blocks, so strip those
-        if response_text.startswith('```'):
-            response_text = response_text.split('\n', 1)[1]
-            if response_text.endswith('```'):
-                response_text = response_text.rsplit('\n', 1)[0]
-
-        analysis = json.loads(response_text)
-        return analysis
+        start = time.perf_counter()
+        with span('claude_call'):
+            message = get_client().messages.create(**analysis_request_params(prompts))
+        return _handle_response(message, (time.perf_counter() - start) * 1000, prompts, budget)
+    except Exception as e:
+        print(f"Error calling Claude API: {e}")
+        return None
+
+
+async def request_analysis_async(prompts: dict, budget: TokenBudget) -> dict | None:
+    """Async variant of request_analysis, using the event loop's shared AsyncAnthropic client."""
+    if not _can_request(prompts, budget):
+        return None
+
+    try:
+        start = time.perf_counter()
+        with span('claude_call'):
+            message = await async_anthropic_client().messages.create(**analysis_request_params(prompts))
+        return _handle_response(message, (time.perf_counter() - start) * 1000, prompts, budget)
+    except Exception as e:
+        print(f"Error calling Claude API: {e}")
+        return None
+
 
+def analysis_from_message(message) -> dict | None:
+    """
+    The analysis in a response: the input of the analysis tool call, which
+    the API has already parsed, or the text parsed as JSON if there is no
+    tool call.
+    """
+    if message.stop_reason == 'max_tokens':
+        print("Warning: response hit max_tokens, the analysis is probably incomplete")
+
+    for block in message.content:
+        if block.type == 'tool_use' and block.name == ANALYSIS_TOOL_NAME:
+            return block.input
+
+    text = ''.join(block.text for block in message.content if block.type == 'text')
+    return parse_analysis(text)
+
+
+def parse_analysis(response_text: str) -> dict | None:
+    """
+    Parse a JSON analysis from response text (fallback when Claude answers
+    without calling the tool).
+
+    Returns:
+        dict: The analysis, or None if the response isn't valid JSON
+    """
+    # Sometimes Claude adds markdown code blocks, so strip those
+    if response_text.startswith('```'):
+        response_text = response_text.split('\n', 1)[1]
+        if response_text.endswith('```'):
+            response_text = response_text.rsplit('\n', 1)[0]
+
+    try:
+        return json.loads(response_text)
     except json.JSONDecodeError as e:
         print(f"Error parsing Claude response as JSON: {e}")
         print(f"Response was: {response_text[:500]}...")
         return None
+
+
+def pending_batches_lock():
+    """
+    Lock for a read-modify-write of the pending batches file, which every
+    profile shares, so two processes submitting or collecting at once
+    don't drop each other's batches.
+    """
+    return data_lock(data_dir=PENDING_BATCHES_FILE.parent)
+
+
+def load_pending_batches() -> dict:
+    """Submitted Message Batches that haven't been collected yet, by batch id."""
+    if not PENDING_BATCHES_FILE.exists():
+        return {}
+    return serialization.loads(PENDING_BATCHES_FILE.read_bytes())
+
+
+def save_pending_batches(pending: dict) -> None:
+    """Persist the pending batches (written atomically)."""
+    PENDING_BATCHES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = PENDING_BATCHES_FILE.with_suffix('.tmp')
+    tmp_path.write_bytes(serialization.dumps(pending))
+    tmp_path.replace(PENDING_BATCHES_FILE)
+
+
+def forget_pending_batch(batch_id: str) -> None:
+    """Drop a batch once its results have been applied."""
+    with pending_batches_lock():
+        pending = load_pending_batches()
+        if pending.pop(batch_id, None) is not None:
+            save_pending_batches(pending)
+
+
+def submit_analysis_batch(jobs: dict[str, dict]) -> str | None:
+    """
+    Submit several analyses as one Message Batch and remember it.
+
+    Batches are processed asynchronously (usually within an hour, at most
+    24h) at half the price of individual requests, so they suit scheduled
+    and bulk runs that don't need the answer straight away.
+
+    Args:
+        jobs: {custom_id: job}. Each job has 'params' (from
+            analysis_request_params, built under the job's profile);
+            everything else in it is stored with the batch id so the
+            results can be applied by a later process
+
+    Returns:
+        str: The batch id, or None if the submission failed
+    """
+    if not ANTHROPIC_API_KEY:
+        print("Error: ANTHROPIC_API_KEY not set")
+        return None
+
+    requests = [{'custom_id': custom_id, 'params': job['params']} for custom_id, job in jobs.items()]
+
+    try:
+        with span('claude_batch_submit', requests=len(requests)):
+            batch = get_client().messages.batches.create(requests=requests)
+        count('http_calls')
     except Exception as e:
-        print(f"Error calling Claude API: {e}")
+        print(f"Error submitting analysis batch: {e}")
+        return None
+
+    with pending_batches_lock():
+        pending = load_pending_batches()
+        pending[batch.id] = {
+            'submittedAt': datetime.now().isoformat(),
+            'model': CLAUDE_MODEL,
+            'jobs': {
+                custom_id: {k: v for k, v in job.items() if k != 'params'}
+                for custom_id, job in jobs.items()
+            },
+        }
+        save_pending_batches(pending)
+    return batch.id
+
+
+def get_batch_status(batch_id: str) -> str | None:
+    """
+    Processing status of a batch: 'in_progress', 'canceling' or 'ended'.
+
+    Returns None if the status couldn't be fetched.
+    """
+    try:
+        batch = get_client().messages.batches.retrieve(batch_id)
+        count('http_calls')
+        return batch.processing_status
+    except Exception as e:
+        print(f"Error checking batch {batch_id}: {e}")
         return None
 
 
+def fetch_batch_results(batch_id: str) -> dict:
+    """
+    Results of an ended batch.
+
+    Returns:
+        dict: {custom_id: message} for requests that succeeded and
+        {custom_id: None} for ones that errored, expired or were canceled
+    """
+    results = {}
+    with span('claude_batch_results'):
+        for item in get_client().messages.batches.results(batch_id):
+            if item.result.type == 'succeeded':
+                results[item.custom_id] = item.result.message
+            else:
+                print(f"Batch request {item.custom_id} {item.result.type}")
+                results[item.custom_id] = None
+    count('http_calls')
+    return results
+
+
+def analysis_from_batch_message(message, model: str = CLAUDE_MODEL) -> dict | None:
+    """
+    Record a batch result's token usage in the active profile's ledger and
+    parse its analysis.
+    """
+    if message is None:
+        return None
+    count('tokens_in', message.usage.input_tokens)
+    count('tokens_out', message.usage.output_tokens)
+    record_usage(model, message.usage, 0.0, purpose='batch')
+    return analysis_from_message(message)
+
+
 def validate_analysis(analysis: dict) -> bool:
-    """Validate that the analysis has the expected structure."""
-    required_keys = [
-        'timeline_entries',
-        'quadrant_updates',
-        'right_now',
-    ]
-
-    for key in required_keys:
-        if key not in analysis:
-            print(f"Missing required key in analysis: {key}")
-            return False
-
-    # Validate right_now structure
-    right_now = analysis.get('right_now', {})
-    right_now_keys = ['summary', 'valuesAlignment', 'actionables', 'celebration', 'friendlyNote']
-    for key in right_now_keys:
-        if key not in right_now:
-            print(f"Missing key in right_now: {key}")
-            return False
+    """
+    Validate the analysis's structure for the active profile's quadrants,
+    and fit it to the schema's limits (in place) if it can be applied.
+    """
+    quadrants = list(current_profile().quadrants)
+    errors = analysis_errors(analysis, quadrants)
+    for error in errors[:5]:
+        print(f"Invalid analysis: {error}")
+    if len(errors) > 5:
+        print(f"  ...and {len(errors) - 5} more problems")
+    if errors:
+        return False
 
+    for change in fit_analysis(analysis, quadrants):
+        print(f"  Adjusted analysis: {change}")
     return True
 
 
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Life Dashboard command line.
+
+    python cli.py status                 # what's in the data directory (fast)
+    python cli.py scan [--all] [--fresh] # scan the Obsidian vault
+    python cli.py graph [--note NAME]    # wikilinks, backlinks, most linked notes
+    python cli.py people [--name NAME]   # who your notes mention lately (see people_index.py)
+    python cli.py fetch                  # fetch GitHub activity
+    python cli.py analyze [--days N]     # gather + Claude analysis, no files written
+    python cli.py write [--days N]       # full run: gather, analyze, update data files
+    python cli.py batch [--concurrency N] # full run for every profile in profiles.json
+    python cli.py batch --submit|--collect # same, through the Message Batches API
+    python cli.py snapshots list|diff|restore # data directory history (see snapshots.py)
+    python cli.py serve [--port N]       # local read-only HTTP API over the data directory
+
+Add --profile NAME before the subcommand to work on one profile from
+profiles.json instead of the default one.
+
+Heavy dependencies (anthropic, requests, yaml, numpy) are only
+imported by the subcommands that need them, so quick commands start fast.
+"""
+
+import argparse
+import sys
+
+
+def cmd_status(args) -> int:
+    """Summarize the data directory without touching the vault or network."""
+    from profiles import current_profile
+    from data_manager import get_metadata, get_quadrants, get_manual_entries, get_timeline_index, read_json
+    from token_budget import month_usage, TOKEN_BUDGET_PER_MONTH
+
+    profile = current_profile()
+    metadata = get_metadata()
+    print(f"Profile: {profile.name}")
+    print(f"Data directory: {profile.data_dir}")
+    print(f"Last processed: {metadata.get('lastProcessed') or 'never'}")
+    print(f"Entries processed: {metadata.get('totalEntriesProcessed', 0)}")
+
+    index = get_timeline_index()
+    rollups = read_json('rollups.json')
+    if index:
+        print(f"Timeline: {index['totalEntries']} entries in {len(index['shards'])} shards")
+    elif rollups:
+        print(f"Timeline: {rollups['entryCount']} entries")
+
+    for key, quadrant in get_quadrants().items():
+        print(f"  {quadrant.get('name', key)}: {quadrant.get('status', 'unknown')}")
+
+    pending = [e for e in get_manual_entries() if not e.get('processed', False)]
+    print(f"Pending manual entries: {len(pending)}")
+
+    from config import PENDING_BATCHES_FILE
+    if PENDING_BATCHES_FILE.exists():
+        import serialization
+        batches = serialization.loads(PENDING_BATCHES_FILE.read_bytes())
+        print(f"Analysis batches awaiting results: {len(batches)}")
+
+    budget = TOKEN_BUDGET_PER_MONTH or 'unlimited'
+    print(f"Tokens this month: {month_usage()} of {budget}")
+
+    log_dir = profile.log_dir
+    reports = sorted(log_dir.glob('run_*.json')) if log_dir.exists() else []
+    if reports:
+        print(f"Last run report: {reports[-1]}")
+    return 0
+
+
+def cmd_scan(args) -> int:
+    """Scan the vault and print what was found."""
+    import obsidian_reader
+
+    if args.all:
+        notes = obsidian_reader.get_all_notes_for_initial_scan()
+        print(f"Found {len(notes)} notes in the vault")
+        return 0
+
+    summary = obsidian_reader.get_notes_summary(restat=args.fresh)
+    print(f"Found {summary['total_notes']} recent notes")
+    print(f"  - Journal entries: {summary['journal_entries']}")
+    print(f"  - Other notes: {summary['other_notes']}")
+    for category, notes in summary['by_category'].items():
+        print(f"  {category}: {len(notes)} notes")
+    if summary['mood_analysis']:
+        print(f"Mood analysis: {summary['mood_analysis']}")
+    return 0
+
+
+def cmd_graph(args) -> int:
+    """Update the wikilink graph and query it."""
+    from note_graph import load_graph
+
+    graph = load_graph()
+    print(f"{graph.note_count} notes, {graph.size - graph.note_count} unresolved link targets, "
+          f"{graph.edge_count()} links")
+
+    if args.note:
+        if graph.node(args.note) is None:
+            print(f"No note or link target named {args.note!r}")
+            return 1
+        print(f"Links: {', '.join(graph.links(args.note)) or 'none'}")
+        print(f"Backlinks: {', '.join(graph.backlinks(args.note)) or 'none'}")
+        if args.hops > 1:
+            for name, hops in graph.k_hop(args.note, args.hops).items():
+                print(f"  {hops} {name}")
+        return 0
+
+    print("Most linked:")
+    for name, links in graph.most_linked(args.top):
+        print(f"  {links:4d}  {name}")
+    unresolved = graph.unresolved()[:args.top]
+    if unresolved:
+        print("Most linked without a note:")
+        for name, links in unresolved:
+            print(f"  {links:4d}  {name}")
+    if args.people:
+        centrality = graph.people_centrality(args.top)
+        print(f"People links per month ({', '.join(centrality['months'])}):")
+        for name, series in centrality['people'].items():
+            print(f"  {name}: {' '.join(str(c) for c in series)}")
+    return 0
+
+
+def cmd_people(args) -> int:
+    """Update the people index and show who's been mentioned lately."""
+    from people_index import load_people_index
+    from profiles import current_profile
+
+    index = load_people_index()
+    print(f"{len(index.names)} people, {len(index.person)} mentions")
+
+    if args.name:
+        daily = index.daily(args.name)
+        if not daily:
+            print(f"Nobody named {args.name!r} (aliases resolve to the name in PEOPLE)")
+            return 1
+        print(f"Mentioned in {sum(daily.values())} notes, last {max(daily)}")
+        print(f"Seen with: {', '.join(index.seen_with(args.name, args.top)) or 'nobody'}")
+        for day, mentions in list(daily.items())[-args.top:]:
+            print(f"  {day}  {mentions}")
+        return 0
+
+    summary = index.summary(known=set(current_profile().people), recent_days=args.days, size=args.top)
+    print(f"Seen in the last {summary['windowDays']} days:")
+    for person in summary['recent']:
+        with_ = f" (with {', '.join(person['seenWith'])})" if person['seenWith'] else ''
+        print(f"  {person['mentions']:4d}  {person['name']}, last {person['lastSeen']}{with_}")
+    if summary['drifting']:
+        print("Not mentioned for a while:")
+        for person in summary['drifting']:
+            print(f"  {person['total']:4d}  {person['name']}, last {person['lastSeen']}")
+    return 0
+
+
+def cmd_fetch(args) -> int:
+    """Fetch and print the GitHub summary."""
+    from github_fetcher import get_github_summary
+
+    summary = get_github_summary()
+    print(f"Activity found: {summary['has_activity']}")
+    print(f"Commits: {summary['commits']}")
+    print(f"Active repos: {summary['repos']}")
+    print(f"Current streak: {summary['streak']} days")
+    if 'longest_streak' in summary:
+        print(f"Longest streak: {summary['longest_streak']} days")
+        print(f"Weekly totals: {[w['contributions'] for w in summary['weekly_totals']]}")
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    """Gather data and run the analysis without writing anything."""
+    from main import process_life_data
+
+    success = process_life_data(days=args.days, dry_run=True, fresh=args.fresh, from_stage=args.from_stage)
+    return 0 if success else 1
+
+
+def cmd_write(args) -> int:
+    """Full processing run."""
+    from main import process_life_data, git_commit_and_push
+
+    success = process_life_data(
+        days=args.days,
+        openmetrics=args.openmetrics,
+        fresh=args.fresh,
+        from_stage=args.from_stage,
+    )
+    if success and args.commit:
+        git_commit_and_push()
+    return 0 if success else 1
+
+
+def cmd_batch(args) -> int:
+    """Full processing run for several profiles at once."""
+    import batch_runner
+
+    argv = ['--concurrency', str(args.concurrency), '--days', str(args.days)]
+    if args.only:
+        argv += ['--only', *args.only]
+    if args.dry_run:
+        argv.append('--dry-run')
+    if args.fresh:
+        argv.append('--fresh')
+    if args.submit:
+        argv.append('--submit')
+    if args.collect:
+        argv.append('--collect')
+    return batch_runner.main(argv)
+
+
+def cmd_snapshots(args) -> int:
+    """List, take, diff, restore and prune data directory snapshots."""
+    import snapshots
+
+    try:
+        if args.action == 'take':
+            snapshot_id = snapshots.take_snapshot(args.label)
+            print(f"Snapshot: {snapshot_id or 'no changes since the last one'}")
+        elif args.action == 'list':
+            for snapshot_id in snapshots.list_snapshots()[-args.last:]:
+                snapshot = snapshots.load_snapshot(snapshot_id)
+                print(f"{snapshot_id}  {snapshot['label'] or '-':<14} {len(snapshot['files'])} files")
+        elif args.action == 'diff':
+            old, new = (args.refs + ['latest~1', 'latest'][len(args.refs):])[:2]
+            if args.patch:
+                print(snapshots.file_patch(old, new, args.patch) or '(no changes)')
+            else:
+                print(f"{snapshots.resolve(old)} -> {snapshots.resolve(new)}")
+                print(snapshots.format_diff(snapshots.diff_snapshots(old, new)))
+        elif args.action == 'restore':
+            if not args.refs:
+                print("Which snapshot? e.g. cli.py snapshots restore latest~1")
+                return 1
+            touched = snapshots.restore_snapshot(args.refs[0], args.path)
+            print(f"Restored {snapshots.resolve(args.refs[0])}: {len(touched)} files written or removed")
+            for path in touched:
+                print(f"  {path}")
+        elif args.action == 'prune':
+            print(f"Deleted {snapshots.prune(args.keep)} unused objects")
+    except KeyError as e:
+        print(e.args[0])
+        return 1
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Serve the data directory over the local read API."""
+    from read_api import serve
+
+    serve(args.host, args.port, verbose=not args.quiet)
+    return 0
+
+
+def add_stage_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options controlling reuse of saved stage results."""
+    parser.add_argument('--fresh', action='store_true', help='Ignore saved stage results from previous runs')
+    parser.add_argument(
+        '--from-stage',
+        choices=['gather', 'enrich', 'prompt', 'analyze', 'apply'],
+        help='Re-run this stage and all later ones',
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Subcommand parser; each handler imports only what it needs."""
+    from config import DAYS_TO_LOOK_BACK as default_days, BATCH_CONCURRENCY, API_HOST, API_PORT, SNAPSHOT_KEEP, PEOPLE_RECENT_DAYS
+
+    parser = argparse.ArgumentParser(description='Life Dashboard backend')
+    parser.add_argument('--profile', help='Profile from the profiles file to use (default: the built-in one)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status = commands.add_parser('status', help='Summarize the data directory')
+    status.set_defaults(func=cmd_status)
+
+    scan = commands.add_parser('scan', help='Scan the Obsidian vault')
+    scan.add_argument('--all', action='store_true', help='Scan every note, not just recent ones')
+    scan.add_argument('--fresh', action='store_true', help='Re-check every journal for edits to old entries')
+    scan.set_defaults(func=cmd_scan)
+
+    graph = commands.add_parser('graph', help='Update and query the wikilink graph')
+    graph.add_argument('--note', help='Show links and backlinks of this note')
+    graph.add_argument('--hops', type=int, default=1, help='With --note, also list everything this many links away')
+    graph.add_argument('--top', type=int, default=10, help='How many of the most linked notes to list')
+    graph.add_argument('--people', action='store_true', help='Show monthly links to the most linked people')
+    graph.set_defaults(func=cmd_graph)
+
+    people = commands.add_parser('people', help='Update the people index and show who was mentioned lately')
+    people.add_argument('--name', help='Show mentions per day and co-mentions of this person')
+    people.add_argument('--days', type=int, default=PEOPLE_RECENT_DAYS, help='Days that count as lately')
+    people.add_argument('--top', type=int, default=10, help='How many people (or days, with --name) to list')
+    people.set_defaults(func=cmd_people)
+
+    fetch = commands.add_parser('fetch', help='Fetch GitHub activity')
+    fetch.set_defaults(func=cmd_fetch)
+
+    analyze = commands.add_parser('analyze', help='Gather and analyze without writing files')
+    analyze.add_argument('--days', type=int, default=default_days, help='Number of days to look back')
+    add_stage_arguments(analyze)
+    analyze.set_defaults(func=cmd_analyze)
+
+    write = commands.add_parser('write', help='Full run: gather, analyze and update data files')
+    write.add_argument('--days', type=int, default=default_days, help='Number of days to look back')
+    write.add_argument('--commit', action='store_true', help='Commit changes to git after processing')
+    write.add_argument('--openmetrics', action='store_true', help='Also write an OpenMetrics run report')
+    add_stage_arguments(write)
+    write.set_defaults(func=cmd_write)
+
+    batch = commands.add_parser('batch', help='Full run for every configured profile')
+    batch.add_argument('--only', nargs='+', metavar='NAME', help='Only process these profiles')
+    batch.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY, help='Profiles processed at once')
+    batch.add_argument('--days', type=int, default=default_days, help='Number of days to look back')
+    batch.add_argument('--dry-run', action='store_true', help="Run analysis but don't update files")
+    batch.add_argument('--fresh', action='store_true', help='Ignore saved stage results from previous runs')
+    mode = batch.add_mutually_exclusive_group()
+    mode.add_argument('--submit', action='store_true', help='Submit all analyses as one Message Batch')
+    mode.add_argument('--collect', action='store_true', help='Apply the results of finished Message Batches')
+    batch.set_defaults(func=cmd_batch)
+
+    snap = commands.add_parser('snapshots', help='Snapshots of the data directory')
+    snap.add_argument('action', choices=['list', 'take', 'diff', 'restore', 'prune'])
+    snap.add_argument('refs', nargs='*', help="Snapshot ids, unique prefixes, 'latest' or 'latest~N'")
+    snap.add_argument('--patch', metavar='FILE', help='With diff, show the line changes of one data file')
+    snap.add_argument('--path', nargs='+', metavar='FILE', help='With restore, only restore these data files')
+    snap.add_argument('--label', default='manual', help='With take, a label for the snapshot')
+    snap.add_argument('--last', type=int, default=20, help='With list, how many to show')
+    snap.add_argument('--keep', type=int, default=SNAPSHOT_KEEP, help='With prune, snapshots to keep')
+    snap.set_defaults(func=cmd_snapshots)
+
+    serve = commands.add_parser('serve', help='Serve the dashboard data over a local read-only HTTP API')
+    serve.add_argument('--host', default=API_HOST, help='Address to listen on')
+    serve.add_argument('--port', type=int, default=API_PORT, help='Port to listen on')
+    serve.add_argument('--quiet', action='store_true', help="Don't log requests")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return args.func(args)
+
+    from profiles import load_profiles, use_profile
+
+    profile = next((p for p in load_profiles() if p.name == args.profile), None)
+    if profile is None:
+        print(f"Unknown profile: {args.profile}")
+        return 1
+    with use_profile(profile):
+        return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
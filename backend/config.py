@@ -11,14 +11,71 @@ load_dotenv(project_root / '.env.local')
 # Paths
 OBSIDIAN_VAULT_PATH = os.getenv('OBSIDIAN_VAULT_PATH', '')
 DATA_DIR = project_root / 'data'
+CACHE_DIR = DATA_DIR / 'cache'  # Derived state (not needed by the site)
+LOG_DIR = DATA_DIR / 'logs'
+PROFILES_FILE = Path(os.getenv('LIFE_DASHBOARD_PROFILES', project_root / 'profiles.json'))
+PENDING_BATCHES_FILE = CACHE_DIR / 'pending_batches.json'  # Message Batches awaiting collection
 
 # API Keys
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
 GITHUB_USERNAME = 'SamPlayz6'
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_COLLECTOR = os.getenv('GITHUB_COLLECTOR', 'events')  # 'events' (public events feed) or 'graphql' (contributions calendar, needs a token)
+GITHUB_CACHE_MINUTES = int(os.getenv('GITHUB_CACHE_MINUTES', '60'))  # Reuse a fetched contributions calendar this long
+
+# Network settings
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))  # Seconds to wait for GitHub responses
+ANTHROPIC_TIMEOUT = float(os.getenv('ANTHROPIC_TIMEOUT', '300'))  # Analyses can take minutes to generate
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))  # Keep-alive connections kept per host
+HTTP2 = os.getenv('HTTP2', '1') == '1'  # Use HTTP/2 for the Anthropic API when the h2 package is installed
+
+# Output settings
+PRODUCTION = os.getenv('LIFE_DASHBOARD_ENV', '').lower() == 'production'
+COMPACT_JSON = os.getenv('LIFE_DASHBOARD_COMPACT', '1' if PRODUCTION else '0') == '1'  # Non-indented JSON
+JSON_BACKEND = os.getenv('LIFE_DASHBOARD_JSON', 'auto').lower()  # 'auto', 'orjson' or 'json'
+WRITE_LEGACY_TIMELINE = os.getenv('WRITE_LEGACY_TIMELINE', '0') == '1'  # Also write the single timeline.json, for readers that don't know timeline/index.json
+SNAPSHOTS = os.getenv('LIFE_DASHBOARD_SNAPSHOTS', '1') == '1'  # Snapshot the data directory after each run (see snapshots.py)
+SNAPSHOT_COMPRESSION = os.getenv('SNAPSHOT_COMPRESSION', 'auto')  # 'auto' (zstd if zstandard is installed), 'zstd' or 'none'
+SNAPSHOT_KEEP = 200  # Snapshots kept; older ones and objects only they used are pruned (0 = keep all)
+HISTORY_EXPORT_RUNS = 104  # Runs of quadrant history exported for the site (about 4 years of bi-weekly runs)
+DATA_LOCK_TIMEOUT = float(os.getenv('DATA_LOCK_TIMEOUT', '120'))  # Seconds a writer waits for another process's writes (see data_lock.py)
+DATA_READ_ATTEMPTS = 5  # Times an isolated read is retried when a write overlaps it
 
 # Processing settings
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))  # Profiles processed at once in batch mode
+ANALYSIS_MODE = os.getenv('ANALYSIS_MODE', 'sync')  # 'sync' (one request per run) or 'batch' (Message Batches API)
 DAYS_TO_LOOK_BACK = 14  # How many days of notes to process
+NOTE_READ_BYTES = 64 * 1024  # Read up front per note; longer notes load the rest when their content is used
+NOTE_HEADER_BYTES = 4096  # Read per note when only frontmatter is needed (full-vault scan)
+JOURNAL_RESTAT_DAYS = 7  # Without a vault fingerprint in the run, re-check every journal's mtime this often
+PROMPT_RELATED_NOTES = int(os.getenv('PROMPT_RELATED_NOTES', '0'))  # Add this many notes most linked with the recent ones to the prompt
+PEOPLE_RECENT_DAYS = 14  # "Seen lately" window of the people summary (see people_index.py)
+PEOPLE_DRIFTING_DAYS = 45  # People mentioned often but not for this long are listed as drifting
+PEOPLE_MIN_MENTIONS = 3  # Notes that must mention someone outside PEOPLE before they're summarized
+PEOPLE_SUMMARY_SIZE = 8  # People per list in the summary
+
+# Read API settings (cli.py serve)
+API_HOST = os.getenv('LIFE_DASHBOARD_API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('LIFE_DASHBOARD_API_PORT', '8765'))
+API_RELOAD_SECONDS = 1.0  # Check the data files for changes at most this often
+API_PAGE_SIZE = 50  # Default page size for list queries
+API_MAX_PAGE_SIZE = 500
+API_RESPONSE_CACHE = 256  # Encoded responses kept per data version
+
+# Claude settings
+CLAUDE_MODEL = os.getenv('CLAUDE_MODEL', 'claude-sonnet-4-20250514')
+ANALYSIS_MAX_TOKENS = 4096  # Output tokens reserved for the analysis
+TOKEN_COUNT_MODE = os.getenv('TOKEN_COUNT_MODE', 'local')  # 'local' estimate or 'api' (count_tokens endpoint)
+TOKEN_BUDGET_PER_RUN = int(os.getenv('TOKEN_BUDGET_PER_RUN', '60000'))  # 0 = unlimited
+TOKEN_BUDGET_PER_MONTH = int(os.getenv('TOKEN_BUDGET_PER_MONTH', '1000000'))  # 0 = unlimited
+
+# Quadrant classifier settings
+CLASSIFIER_SELF_TRAIN = True  # Learn extra keywords from categorized timeline entries
+CLASSIFIER_MIN_SUPPORT = 3  # Entries of a quadrant that must contain a term before it is learned
+CLASSIFIER_MIN_LIFT = 2.0  # How many times more common in its quadrant's entries than any other's a learned term must be
+CLASSIFIER_MIN_CONFIDENCE = 0.0  # Minimum probability to assign a quadrant (0 = most likely wins)
 
 # Your values (used in Claude analysis)
 YOUR_VALUES = [
@@ -53,3 +110,46 @@ QUADRANTS = {
         'tags': ['travel', 'trip', 'adventure', 'japan', 'japanese', 'language'],
     },
 }
+
+# Seed keywords per quadrant (each hit is worth roughly one point of evidence)
+QUADRANT_KEYWORDS = {
+    'work': [
+        'startup', 'maupka', 'ignite', 'company', 'business', 'pilot',
+        'customers', 'product', 'building', 'coding', 'enterprise',
+        'funding', 'grant', 'revenue', 'marketing', 'sales', 'investor',
+        'tyndall', 'research', 'argyou', 'edtech', 'teacher', 'student'
+    ],
+    'parkour': [
+        'parkour', 'training', 'vaults', 'kong', 'handspring', 'movement',
+        'exercise', 'workout', 'calisthenics', 'fitness', 'dive roll',
+        'turn vault', 'helicoptero', 'planche', 'pullup', 'pistol squat'
+    ],
+    'relationships': [
+        'ula', 'ulka', 'friends', 'family', 'social', 'lunch with',
+        'meeting with', 'talked to', 'couple', 'relationship'
+    ],
+    'travel': [
+        'japan', 'japanese', 'tokyo', 'mext', 'travel', 'trip',
+        'abroad', 'language learning', 'n2', 'n3', 'anki', 'japanese language'
+    ],
+}
+
+# People in your notes: canonical name -> other names used for them. Mentions
+# of any of these (and @mentions / [[links]] matching them) count as that person
+PEOPLE = {
+    'Ula': ['Ulka'],
+    'Damien': [],
+    'Eamon': [],
+    'Marco': [],
+    'James': [],
+    'Micheal': [],
+    'Tom': [],
+    'Kay': [],
+    'Ruth': [],
+    'Killian': [],
+    'Jayden': [],
+    "Sam O'Neill": [],
+}
+
+# @mentions and name-like [[links]] that aren't people
+PEOPLE_IGNORE = []
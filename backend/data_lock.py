@@ -0,0 +1,239 @@
+"""
+Safe concurrent access to a data directory from several processes.
+
+Writers (a run's apply stage, the data_manager helpers that read, modify
+and write a file, snapshot restores) hold an exclusive advisory lock on
+data_dir/.lock, so a scheduled run and a manual one can't interleave
+their read-modify-write cycles and silently drop each other's updates.
+The lock is flock() where fcntl exists and msvcrt.locking() on Windows,
+re-entrant within a process (nested writers just go deeper), and waited
+for at most DATA_LOCK_TIMEOUT seconds.
+
+Readers never take the lock and never wait for it. Every data file is
+replaced atomically (see data_manager.write_json), and a writer bumps
+data_dir/.generation before it lets go of the lock, so read_isolated()
+can load several files and then check that no writer was active or
+finished in the meantime; if one was, the read is retried, and a caller
+with a previous copy (the read API) can just keep serving that.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from config import DATA_LOCK_TIMEOUT, DATA_READ_ATTEMPTS
+from instrumentation import count
+from profiles import current_profile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = '.lock'
+GENERATION_FILE = '.generation'
+
+T = TypeVar('T')
+
+
+class DataLockTimeout(TimeoutError):
+    """Another process held the data directory's lock for longer than the timeout."""
+
+
+class _Holder:
+    """This process's hold on one data directory's lock."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.owner: int | None = None  # thread holding it
+        self.depth = 0
+        self.fd: int | None = None
+
+
+_holders: dict[Path, _Holder] = {}
+_holders_lock = threading.Lock()
+
+
+def _holder(data_dir: Path) -> _Holder:
+    path = data_dir / LOCK_FILE
+    with _holders_lock:
+        holder = _holders.get(path)
+        if holder is None:
+            holder = _holders[path] = _Holder(path)
+        return holder
+
+
+def _try_lock(fd: int, exclusive: bool = True) -> bool:
+    """Lock without waiting. Returns False if another process has it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        else:
+            # msvcrt only has exclusive locks, on a byte range
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _lock_owner(path: Path) -> str:
+    """Pid written into the lock file by its holder ('' if unreadable)."""
+    try:
+        return path.read_text(encoding='ascii').strip()
+    except (OSError, UnicodeDecodeError):
+        return ''
+
+
+def generation(data_dir: Path | None = None) -> int:
+    """How many times a writer has released the data directory's lock."""
+    path = Path(data_dir or current_profile().data_dir) / GENERATION_FILE
+    try:
+        return int(path.read_text(encoding='ascii') or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _bump_generation(data_dir: Path) -> None:
+    path = data_dir / GENERATION_FILE
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(str(generation(data_dir) + 1), encoding='ascii')
+    tmp_path.replace(path)
+
+
+def _acquire(holder: _Holder, timeout: float, deadline: float) -> None:
+    holder.path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(holder.path, os.O_RDWR | os.O_CREAT, 0o644)
+    started = time.monotonic()
+    delay = 0.01
+    announced = False
+    while not _try_lock(fd):
+        now = time.monotonic()
+        if now >= deadline:
+            os.close(fd)
+            owner = _lock_owner(holder.path)
+            raise DataLockTimeout(
+                f"{holder.path.parent} is being written by {'pid ' + owner if owner else 'another process'}; "
+                f"gave up waiting after {timeout:g}s")
+        if not announced and now - started >= 1:
+            print(f"  Waiting for another process writing to {holder.path.parent}...")
+            announced = True
+        count('data_lock_waits')
+        time.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, 0.5)
+
+    # For the timeout message of whoever waits next
+    os.ftruncate(fd, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.write(fd, str(os.getpid()).encode('ascii'))
+    holder.fd = fd
+
+
+def _release(holder: _Holder) -> None:
+    try:
+        _bump_generation(holder.path.parent)
+    finally:
+        fd, holder.fd = holder.fd, None
+        _unlock(fd)
+        os.close(fd)
+
+
+@contextmanager
+def data_lock(timeout: float = DATA_LOCK_TIMEOUT, data_dir: Path | None = None):
+    """
+    Hold the data directory's write lock (default: the active profile's) for a block.
+
+    Re-entrant: a thread already holding it just goes one level deeper,
+    and other threads of this process wait their turn like other
+    processes do.
+
+    Raises:
+        DataLockTimeout: If the lock wasn't free within `timeout` seconds
+    """
+    holder = _holder(Path(data_dir or current_profile().data_dir))
+    deadline = time.monotonic() + timeout
+    if not holder.thread_lock.acquire(timeout=max(timeout, 0)):
+        raise DataLockTimeout(f"{holder.path.parent} is being written by another thread of this process")
+    try:
+        if holder.depth == 0:
+            _acquire(holder, timeout, deadline)
+            holder.owner = threading.get_ident()
+        holder.depth += 1
+        try:
+            yield
+        finally:
+            holder.depth -= 1
+            if holder.depth == 0:
+                holder.owner = None
+                _release(holder)
+    finally:
+        holder.thread_lock.release()
+
+
+def writer_active(data_dir: Path | None = None) -> bool:
+    """Whether some process (this one included) holds the data directory's write lock."""
+    path = Path(data_dir or current_profile().data_dir) / LOCK_FILE
+    try:
+        fd = os.open(path, os.O_RDONLY if fcntl is not None else os.O_RDWR)
+    except FileNotFoundError:
+        return False
+    try:
+        if not _try_lock(fd, exclusive=False):
+            return True
+        _unlock(fd)
+        return False
+    finally:
+        os.close(fd)
+
+
+def read_isolated(
+    load: Callable[[], T],
+    attempts: int = DATA_READ_ATTEMPTS,
+    data_dir: Path | None = None,
+) -> tuple[T, int] | None:
+    """
+    Run `load` (which reads data files) without waiting for writers, and
+    keep its result only if no write overlapped it.
+
+    A thread that holds the write lock itself just runs `load`.
+
+    Returns:
+        tuple: (load()'s result, the generation it read), or None if a
+        writer was busy during every attempt
+    """
+    data_dir = Path(data_dir or current_profile().data_dir)
+    holder = _holders.get(data_dir / LOCK_FILE)
+    if holder is not None and holder.owner == threading.get_ident():
+        return load(), generation(data_dir)
+
+    for attempt in range(attempts):
+        before = generation(data_dir)
+        if not writer_active(data_dir):
+            result = load()
+            if not writer_active(data_dir) and generation(data_dir) == before:
+                return result, before
+        count('isolated_read_retries')
+        if attempt + 1 < attempts:
+            time.sleep(0.05 * (attempt + 1))
+    return None
+
+
+if __name__ == '__main__':
+    data_dir = current_profile().data_dir
+    print(f"Data directory: {data_dir}")
+    print(f"Generation: {generation(data_dir)}, writer active: {writer_active(data_dir)}")
+    if writer_active(data_dir):
+        print(f"Held by pid {_lock_owner(data_dir / LOCK_FILE) or 'unknown'}")
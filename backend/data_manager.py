@@ -1,27 +1,104 @@
-"""Manage reading and writing JSON data files."""
+"""
+Manage reading and writing JSON data files.
 
-import json
+Files are replaced atomically, and everything that writes (or reads,
+modifies and writes) data files holds the data directory's write lock,
+so several processes can share one data directory (see data_lock.py).
+"""
+
+import hashlib
+import os
 from pathlib import Path
 from datetime import datetime
 from typing import Any
 
-from config import DATA_DIR
+import serialization
+from instrumentation import count
+from config import COMPACT_JSON, WRITE_LEGACY_TIMELINE
+from data_lock import data_lock
+from profiles import current_profile
+from rollups import ROLLUPS_VERSION, apply_github_summary, apply_timeline_entries, build_rollups
+
+
+# Parsed files keyed by absolute path: (st_mtime_ns, st_size, data)
+_read_cache: dict[Path, tuple[int, int, Any]] = {}
+
+
+def _copy_json(data: Any) -> Any:
+    """Copy JSON-shaped data so callers can't mutate the cached value."""
+    if isinstance(data, dict):
+        return {k: _copy_json(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_copy_json(v) for v in data]
+    return data
+
+
+def clear_read_cache() -> None:
+    """Forget all cached file contents."""
+    _read_cache.clear()
+
+
+def data_path(filename: str) -> Path:
+    """Path of a file in the active profile's data directory."""
+    return current_profile().data_dir / filename
 
 
 def read_json(filename: str) -> Any:
-    """Read a JSON file from the data directory."""
-    file_path = DATA_DIR / filename
-    if not file_path.exists():
+    """
+    Read a JSON file from the data directory.
+
+    Parsed contents are cached in-process and reused until the file's
+    mtime or size changes, so each file is parsed at most once per run.
+    """
+    file_path = data_path(filename)
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        _read_cache.pop(file_path, None)
         return None
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
 
-def write_json(filename: str, data: Any) -> None:
-    """Write data to a JSON file in the data directory."""
-    file_path = DATA_DIR / filename
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    cached = _read_cache.get(file_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        count('cache_hits')
+        return _copy_json(cached[2])
+
+    raw = file_path.read_bytes()
+    count('cache_misses')
+    count('bytes_read', len(raw))
+    data = serialization.loads(raw)
+    _read_cache[file_path] = (stat.st_mtime_ns, stat.st_size, data)
+    return _copy_json(data)
+
+
+def dumps_json(data: Any, compact: bool | None = None) -> bytes:
+    """Serialize data the way it is written to the data directory."""
+    return serialization.dumps(data, COMPACT_JSON if compact is None else compact)
+
+
+def write_json(filename: str, data: Any, compact: bool | None = None) -> None:
+    """
+    Write data to a JSON file in the data directory.
+
+    The file is replaced in one step (readers see the old or the new
+    contents, never half of it), under the data directory's write lock.
+
+    Args:
+        filename: Path relative to the data directory
+        data: JSON-serializable data
+        compact: Override the COMPACT_JSON setting for this file
+    """
+    file_path = data_path(filename)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = dumps_json(data, compact)
+    tmp_path = file_path.with_name(f'{file_path.name}.{os.getpid()}.tmp')
+    with data_lock():
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(file_path)
+        # Still ours: nobody else can have replaced the file yet
+        stat = file_path.stat()
+        _read_cache[file_path] = (stat.st_mtime_ns, stat.st_size, _copy_json(data))
+    count('files_written')
+    count('bytes_written', len(payload))
 
 
 def get_quadrants() -> dict:
@@ -44,25 +121,180 @@ def update_right_now(data: dict) -> None:
     write_json('right_now.json', data)
 
 
+TIMELINE_DIR = 'timeline'
+TIMELINE_INDEX = f'{TIMELINE_DIR}/index.json'
+
+
+def timeline_shard_key(entry: dict) -> str:
+    """Month shard ('YYYY-MM') an entry belongs to."""
+    entry_date = entry.get('date') or ''
+    if len(entry_date) >= 7 and entry_date[4] == '-':
+        return entry_date[:7]
+    return 'undated'
+
+
+def get_timeline_index() -> dict | None:
+    """Get the timeline shard manifest (None if the timeline isn't sharded yet)."""
+    return read_json(TIMELINE_INDEX)
+
+
+def timeline_stamp() -> tuple[int, int] | None:
+    """(mtime_ns, size) of the timeline's index (or unsharded timeline.json), which every timeline write changes."""
+    for filename in (TIMELINE_INDEX, 'timeline.json'):
+        try:
+            stat = data_path(filename).stat()
+        except FileNotFoundError:
+            continue
+        return stat.st_mtime_ns, stat.st_size
+    return None
+
+
+def get_timeline_shard(month: str) -> list:
+    """Get the timeline entries for one month shard."""
+    return read_json(f'{TIMELINE_DIR}/{month}.json') or []
+
+
 def get_timeline() -> list:
-    """Get the timeline entries."""
-    return read_json('timeline.json') or []
+    """Get the timeline entries, most recent first."""
+    index = get_timeline_index()
+    if index is None:
+        return read_json('timeline.json') or []
+
+    timeline = []
+    for shard in index['shards']:
+        timeline.extend(get_timeline_shard(shard['month']))
+    return timeline
+
+
+def write_timeline(timeline: list) -> list[str]:
+    """
+    Write the timeline as month shards plus an index manifest.
+
+    Shards whose content hash matches the manifest are left untouched, and
+    shards that no longer have entries are removed.
+
+    Args:
+        timeline: All timeline entries, most recent first
+
+    Returns:
+        list: Months whose shard files were (re)written
+    """
+    with data_lock():
+        return _write_timeline(timeline)
 
 
-def add_timeline_entries(entries: list) -> None:
-    """Add new entries to the timeline."""
+def _write_timeline(timeline: list) -> list[str]:
+    shards: dict[str, list] = {}
+    for entry in timeline:
+        shards.setdefault(timeline_shard_key(entry), []).append(entry)
+
+    previous = get_timeline_index() or {'shards': []}
+    previous_hashes = {s['month']: s['sha256'] for s in previous['shards']}
+
+    # Newest month first, undated entries last
+    months = sorted((m for m in shards if m != 'undated'), reverse=True)
+    if 'undated' in shards:
+        months.append('undated')
+
+    written = []
+    manifest_shards = []
+    for month in months:
+        entries = shards[month]
+        filename = f'{TIMELINE_DIR}/{month}.json'
+        digest = hashlib.sha256(dumps_json(entries)).hexdigest()
+
+        if previous_hashes.get(month) != digest or not data_path(filename).exists():
+            write_json(filename, entries)
+            written.append(month)
+
+        dates = [e['date'] for e in entries if e.get('date')]
+        manifest_shards.append({
+            'month': month,
+            'file': filename,
+            'count': len(entries),
+            'sha256': digest,
+            'newest': max(dates) if dates else None,
+            'oldest': min(dates) if dates else None,
+        })
+
+    for month in set(previous_hashes) - set(shards):
+        data_path(f'{TIMELINE_DIR}/{month}.json').unlink(missing_ok=True)
+
+    if written or set(previous_hashes) != set(shards):
+        write_json(TIMELINE_INDEX, {
+            'totalEntries': len(timeline),
+            'updatedAt': datetime.now().isoformat(),
+            'shards': manifest_shards,
+        })
+
+    if WRITE_LEGACY_TIMELINE:
+        write_json('timeline.json', timeline)
+
+    return written
+
+
+def add_timeline_entries(entries: list) -> list:
+    """
+    Add new entries to the timeline and update the rollups.
+
+    Returns:
+        list: The entries that were actually added (duplicates skipped)
+    """
+    with data_lock():
+        return _add_timeline_entries(entries)
+
+
+def _add_timeline_entries(entries: list) -> list:
     timeline = get_timeline()
 
     # Avoid duplicates by checking IDs
     existing_ids = {e['id'] for e in timeline}
     new_entries = [e for e in entries if e['id'] not in existing_ids]
 
+    # Rollups only need the new entries, unless they've drifted from the timeline
+    rollups = read_json('rollups.json')
+    if not rollups or rollups.get('version') != ROLLUPS_VERSION or rollups.get('entryCount') != len(timeline):
+        github = rollups.get('github', []) if rollups else []
+        rollups = build_rollups(timeline)
+        rollups['github'] = github
+
     timeline.extend(new_entries)
 
     # Sort by date descending
     timeline.sort(key=lambda x: x['date'], reverse=True)
 
-    write_json('timeline.json', timeline)
+    write_timeline(timeline)
+    update_rollups(apply_timeline_entries(rollups, new_entries))
+    return new_entries
+
+
+def get_rollups() -> dict:
+    """Get the precomputed dashboard aggregates, rebuilding them if missing."""
+    rollups = read_json('rollups.json')
+    if rollups and rollups.get('version') == ROLLUPS_VERSION:
+        return rollups
+    return build_rollups(get_timeline())
+
+
+def update_rollups(rollups: dict) -> None:
+    """Update the precomputed dashboard aggregates."""
+    write_json('rollups.json', rollups)
+
+
+def record_github_rollup(github_summary: dict) -> None:
+    """Add today's GitHub streak and commit count to the rollups."""
+    with data_lock():
+        update_rollups(apply_github_summary(get_rollups(), github_summary))
+
+
+def get_mood() -> dict:
+    """Get the mood time-series export."""
+    return read_json('mood.json') or {}
+
+
+def update_mood(mood: dict) -> None:
+    """Update the mood time-series export."""
+    write_json('mood.json', mood)
 
 
 def get_goals() -> dict:
@@ -82,11 +314,12 @@ def get_inspiration() -> list:
 
 def add_inspiration_items(items: list) -> None:
     """Add new inspiration items."""
-    inspiration = get_inspiration()
-    existing_ids = {i['id'] for i in inspiration}
-    new_items = [i for i in items if i['id'] not in existing_ids]
-    inspiration.extend(new_items)
-    write_json('inspiration.json', inspiration)
+    with data_lock():
+        inspiration = get_inspiration()
+        existing_ids = {i['id'] for i in inspiration}
+        new_items = [i for i in items if i['id'] not in existing_ids]
+        inspiration.extend(new_items)
+        write_json('inspiration.json', inspiration)
 
 
 def get_metadata() -> dict:
@@ -111,23 +344,27 @@ def get_manual_entries() -> list:
 
 def mark_manual_entries_processed(entry_ids: list) -> None:
     """Mark manual entries as processed."""
-    entries = get_manual_entries()
-    for entry in entries:
-        if entry['id'] in entry_ids:
-            entry['processed'] = True
-    write_json('manual_entries.json', entries)
+    with data_lock():
+        entries = get_manual_entries()
+        for entry in entries:
+            if entry['id'] in entry_ids:
+                entry['processed'] = True
+        write_json('manual_entries.json', entries)
 
 
 def clear_processed_manual_entries() -> None:
     """Remove processed manual entries."""
-    entries = get_manual_entries()
-    unprocessed = [e for e in entries if not e.get('processed', False)]
-    write_json('manual_entries.json', unprocessed)
+    with data_lock():
+        entries = get_manual_entries()
+        unprocessed = [e for e in entries if not e.get('processed', False)]
+        write_json('manual_entries.json', unprocessed)
 
 
 if __name__ == '__main__':
     # Test the data manager
-    print(f"Data directory: {DATA_DIR}")
+    print(f"Data directory: {current_profile().data_dir}")
+    print(f"JSON backend: {serialization.BACKEND} ({'compact' if COMPACT_JSON else 'pretty'})")
     print(f"Quadrants: {list(get_quadrants().keys())}")
     print(f"Timeline entries: {len(get_timeline())}")
+    print(f"Rollups by category: {get_rollups()['byCategory']}")
     print(f"Metadata: {get_metadata()}")
@@ -1,48 +1,98 @@
-"""Fetch GitHub activity for life dashboard analysis."""
+"""
+Fetch GitHub activity for life dashboard analysis.
 
-import requests
-from datetime import datetime, timedelta
+Two collectors produce the same summary shape:
+
+- 'events' (default): the public events feed, one page of it
+- 'graphql': the contributions calendar, fetched in one GraphQL request
+  and cached in the profile's cache directory. It covers private
+  contributions and a full year of days, so streaks don't stop at the
+  edge of the events page. Needs a GitHub token.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from config import GITHUB_TOKEN, GITHUB_USERNAME, DAYS_TO_LOOK_BACK
+import serialization
+from config import GITHUB_API_URL, GITHUB_CACHE_MINUTES, GITHUB_COLLECTOR, DAYS_TO_LOOK_BACK
+from http_client import async_http_get, async_http_post, http_get, http_post
+from instrumentation import count, span
+from profiles import current_profile
+
+CONTRIBUTIONS_CACHE_FILE = 'github_contributions.json'
+
+# A year of daily counts for streaks, plus the look-back window's per-repo commits
+CONTRIBUTIONS_QUERY = """
+query($login: String!, $yearFrom: DateTime!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    year: contributionsCollection(from: $yearFrom, to: $to) {
+      contributionCalendar {
+        totalContributions
+        weeks { contributionDays { date contributionCount } }
+      }
+    }
+    recent: contributionsCollection(from: $from, to: $to) {
+      totalCommitContributions
+      restrictedContributionsCount
+      commitContributionsByRepository(maxRepositories: 25) {
+        repository { name isPrivate }
+        contributions(first: 100) { totalCount nodes { commitCount } }
+      }
+    }
+  }
+}
+"""
+
+# Weeks of totals included in the summary
+WEEKLY_TOTALS_WEEKS = 8
 
 
-def get_github_events(username: str = GITHUB_USERNAME, days: int = DAYS_TO_LOOK_BACK) -> list[dict]:
+def get_github_events(username: str | None = None, days: int = DAYS_TO_LOOK_BACK) -> list[dict]:
     """
     Fetch recent GitHub events for a user.
 
     Args:
-        username: GitHub username
+        username: GitHub username (default: the active profile's)
         days: Number of days to look back
 
     Returns:
         list: Recent GitHub events
     """
-    headers = {}
-    if GITHUB_TOKEN:
-        headers['Authorization'] = f'token {GITHUB_TOKEN}'
-        headers['Accept'] = 'application/vnd.github.v3+json'
+    url, headers = _events_request(username)
+    try:
+        with span('github_events'):
+            response = http_get(url, headers=headers)
+            response.raise_for_status()
+            events = response.json()
+        return recent_events(events, days)
+    except Exception as e:
+        print(f"Error fetching GitHub events: {e}")
+        return []
 
-    url = f'https://api.github.com/users/{username}/events/public'
 
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        events = response.json()
+def _events_request(username: str | None) -> tuple[str, dict]:
+    """URL and headers of the public events request for a user (default: the active profile's)."""
+    profile = current_profile()
+    username = username or profile.github_username
 
-        # Filter to recent events
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_events = []
+    headers = {}
+    if profile.github_token:
+        headers['Authorization'] = f'token {profile.github_token}'
+        headers['Accept'] = 'application/vnd.github.v3+json'
 
-        for event in events:
-            event_time = datetime.fromisoformat(event['created_at'].replace('Z', '+00:00'))
-            if event_time.replace(tzinfo=None) >= cutoff:
-                recent_events.append(event)
+    return f'{GITHUB_API_URL}/users/{username}/events/public', headers
 
-        return recent_events
-    except Exception as e:
-        print(f"Error fetching GitHub events: {e}")
-        return []
+
+def recent_events(events: list[dict], days: int) -> list[dict]:
+    """The events from the last `days` days."""
+    cutoff = datetime.now() - timedelta(days=days)
+    recent = []
+    for event in events:
+        event_time = datetime.fromisoformat(event['created_at'].replace('Z', '+00:00'))
+        if event_time.replace(tzinfo=None) >= cutoff:
+            recent.append(event)
+    return recent
 
 
 def get_commit_count(events: list[dict]) -> int:
@@ -109,15 +159,300 @@ def calculate_coding_streak(events: list[dict]) -> int:
     return streak
 
 
-def get_github_summary() -> dict:
+def _github_headers() -> dict:
+    token = current_profile().github_token
+    return {'Authorization': f'bearer {token}'} if token else {}
+
+
+def fetch_contributions(username: str | None = None, days: int = DAYS_TO_LOOK_BACK) -> dict | None:
+    """
+    Fetch the contributions calendar and per-repo commits in one GraphQL request.
+
+    Args:
+        username: GitHub username (default: the active profile's)
+        days: Number of days to look back for the per-repo breakdown
+
+    Returns:
+        dict: The query's 'user' object, or None on failure
+    """
+    request = _contributions_request(username, days)
+    if request is None:
+        return None
+
+    try:
+        with span('github_graphql'):
+            response = http_post(request['url'], json=request['json'], headers=request['headers'])
+            response.raise_for_status()
+            payload = response.json()
+        return _contributions_from_payload(payload)
+    except Exception as e:
+        print(f"Error fetching GitHub contributions: {e}")
+        return None
+
+
+def _contributions_request(username: str | None, days: int) -> dict | None:
+    """URL, body and headers of the contributions query, or None without a token."""
+    profile = current_profile()
+    username = username or profile.github_username
+    if not profile.github_token:
+        print("GitHub GraphQL API needs a token (GITHUB_TOKEN), falling back to events")
+        return None
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    variables = {
+        'login': username,
+        'yearFrom': (now - timedelta(days=364)).isoformat(),
+        'from': (now - timedelta(days=days)).isoformat(),
+        'to': now.isoformat(),
+    }
+    return {
+        'url': f'{GITHUB_API_URL}/graphql',
+        'json': {'query': CONTRIBUTIONS_QUERY, 'variables': variables},
+        'headers': _github_headers(),
+    }
+
+
+def _contributions_from_payload(payload: dict) -> dict | None:
+    if payload.get('errors'):
+        print(f"GitHub GraphQL errors: {[e.get('message') for e in payload['errors']]}")
+        return None
+    return payload['data']['user']
+
+
+def load_contributions(
+    username: str | None = None,
+    days: int = DAYS_TO_LOOK_BACK,
+    max_age_minutes: int = GITHUB_CACHE_MINUTES,
+) -> dict | None:
+    """
+    Contributions for the active profile, from the local cache if it was
+    fetched less than max_age_minutes ago (and today), else from GitHub.
+
+    Returns:
+        dict: See fetch_contributions
+    """
+    username = username or current_profile().github_username
+    cached, key = _cached_contributions(username, days, max_age_minutes)
+    if cached is not None:
+        return cached
+
+    data = fetch_contributions(username, days)
+    if data is not None:
+        _save_contributions(key, data)
+    return data
+
+
+def _contributions_cache_path():
+    return current_profile().cache_dir / CONTRIBUTIONS_CACHE_FILE
+
+
+def _cached_contributions(username: str, days: int, max_age_minutes: int) -> tuple[dict | None, list]:
+    """The cached contributions if still fresh (else None), and the cache key for these arguments."""
+    path = _contributions_cache_path()
+    key = [username, days, datetime.now().strftime('%Y-%m-%d')]
+
+    if path.exists() and max_age_minutes > 0:
+        try:
+            cached = serialization.loads(path.read_bytes())
+            if cached['key'] == key and time.time() - cached['fetched_at'] < max_age_minutes * 60:
+                count('github_cache_hits')
+                return cached['data'], key
+        except Exception as e:
+            print(f"Ignoring unreadable GitHub cache: {e}")
+    return None, key
+
+
+def _save_contributions(key: list, data: dict) -> None:
+    path = _contributions_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(serialization.dumps({'key': key, 'fetched_at': time.time(), 'data': data}, compact=True))
+    tmp_path.replace(path)
+
+
+def contribution_days(data: dict):
+    """
+    The calendar as arrays.
+
+    Returns:
+        (dates, counts): datetime64[D] and int32 arrays, oldest first
+    """
+    import numpy as np
+
+    days = [
+        day
+        for week in data['year']['contributionCalendar']['weeks']
+        for day in week['contributionDays']
+    ]
+    dates = np.array([day['date'] for day in days], dtype='datetime64[D]')
+    counts = np.array([day['contributionCount'] for day in days], dtype=np.int32)
+    order = np.argsort(dates, kind='stable')
+    return dates[order], counts[order]
+
+
+def streak_stats(dates, counts, today=None) -> dict:
+    """
+    Current and longest runs of days with contributions.
+
+    Like calculate_coding_streak, the current streak counts back from
+    today, and a today without contributions (yet) doesn't break it.
+    """
+    import numpy as np
+
+    today = np.datetime64(today or datetime.now().date(), 'D')
+    active = counts[:np.searchsorted(dates, today, side='right')] > 0
+    if len(active) and dates[len(active) - 1] == today and not active[-1]:
+        active = active[:-1]
+
+    # Runs of active days are the spans between rising and falling edges
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+
+    current = int(lengths[-1]) if len(lengths) and ends[-1] == len(active) else 0
+    return {
+        'streak': current,
+        'longest_streak': int(lengths.max()) if len(lengths) else 0,
+        'active_days': int(active.sum()),
+    }
+
+
+def weekly_totals(dates, counts, weeks: int = WEEKLY_TOTALS_WEEKS, today=None) -> list[dict]:
+    """Contributions in each of the last `weeks` 7-day periods ending today, oldest first."""
+    import numpy as np
+
+    today = np.datetime64(today or datetime.now().date(), 'D')
+    start = today - np.timedelta64(7 * weeks - 1, 'D')
+    grid = np.zeros(7 * weeks, dtype=np.int64)
+    mask = (dates >= start) & (dates <= today)
+    grid[(dates[mask] - start).astype(np.int64)] = counts[mask]
+    totals = grid.reshape(weeks, 7).sum(axis=1)
+    return [
+        {'weekOf': str(start + np.timedelta64(7 * i, 'D')), 'contributions': int(total)}
+        for i, total in enumerate(totals)
+    ]
+
+
+def repo_breakdown(data: dict) -> list[dict]:
+    """Commits and active days per repository in the look-back window, busiest first."""
+    repos = []
+    for item in data['recent']['commitContributionsByRepository']:
+        contributions = item['contributions']
+        repos.append({
+            'repo': item['repository']['name'],
+            'commits': sum(node['commitCount'] for node in contributions['nodes']),
+            'active_days': contributions['totalCount'],
+            'private': item['repository']['isPrivate'],
+        })
+    repos.sort(key=lambda r: (-r['commits'], r['repo']))
+    return repos
+
+
+def summarize_contributions(data: dict, days: int = DAYS_TO_LOOK_BACK) -> dict:
+    """
+    Summary of a contributions calendar, with the same keys as
+    summarize_github_events plus longest streak, weekly totals and the
+    per-repo breakdown. The calendar has no commit messages.
+    """
+    import numpy as np
+
+    dates, counts = contribution_days(data)
+    today = np.datetime64(datetime.now().date(), 'D')
+    window = counts[dates > today - np.timedelta64(days, 'D')]
+    repos = repo_breakdown(data)
+    recent = data['recent']
+
+    return {
+        'has_activity': bool(window.sum()),
+        'commits': recent['totalCommitContributions'],
+        'repos': [r['repo'] for r in repos],
+        **streak_stats(dates, counts),
+        'recent_messages': [],
+        'contributions': int(window.sum()),
+        'private_contributions': recent['restrictedContributionsCount'],
+        'weekly_totals': weekly_totals(dates, counts),
+        'repo_breakdown': repos,
+        'source': 'graphql',
+    }
+
+
+def get_github_summary(days: int = DAYS_TO_LOOK_BACK) -> dict:
     """
     Get a complete summary of GitHub activity for analysis.
 
+    Uses the collector chosen by GITHUB_COLLECTOR, falling back to the
+    events feed if the GraphQL request fails.
+
     Returns:
         dict: Summary of GitHub activity
     """
-    events = get_github_events()
+    if GITHUB_COLLECTOR == 'graphql':
+        data = load_contributions(days=days)
+        if data is not None:
+            return summarize_contributions(data, days)
+    return summarize_github_events(get_github_events(days=days))
+
+
+async def get_github_events_async(username: str | None = None, days: int = DAYS_TO_LOOK_BACK) -> list[dict]:
+    """Async variant of get_github_events, on the event loop's pooled httpx client."""
+    url, headers = _events_request(username)
+    try:
+        with span('github_events'):
+            response = await async_http_get(url, headers=headers)
+            response.raise_for_status()
+            events = response.json()
+        return recent_events(events, days)
+    except Exception as e:
+        print(f"Error fetching GitHub events: {e}")
+        return []
+
+
+async def fetch_contributions_async(username: str | None = None, days: int = DAYS_TO_LOOK_BACK) -> dict | None:
+    """Async variant of fetch_contributions, on the event loop's pooled httpx client."""
+    request = _contributions_request(username, days)
+    if request is None:
+        return None
+
+    try:
+        with span('github_graphql'):
+            response = await async_http_post(request['url'], json=request['json'], headers=request['headers'])
+            response.raise_for_status()
+            payload = response.json()
+        return _contributions_from_payload(payload)
+    except Exception as e:
+        print(f"Error fetching GitHub contributions: {e}")
+        return None
+
+
+async def load_contributions_async(
+    username: str | None = None,
+    days: int = DAYS_TO_LOOK_BACK,
+    max_age_minutes: int = GITHUB_CACHE_MINUTES,
+) -> dict | None:
+    """Async variant of load_contributions (same cache)."""
+    username = username or current_profile().github_username
+    cached, key = _cached_contributions(username, days, max_age_minutes)
+    if cached is not None:
+        return cached
+
+    data = await fetch_contributions_async(username, days)
+    if data is not None:
+        _save_contributions(key, data)
+    return data
+
+
+async def get_github_summary_async(days: int = DAYS_TO_LOOK_BACK) -> dict:
+    """Async variant of get_github_summary."""
+    if GITHUB_COLLECTOR == 'graphql':
+        data = await load_contributions_async(days=days)
+        if data is not None:
+            return summarize_contributions(data, days)
+    return summarize_github_events(await get_github_events_async(days=days))
+
 
+def summarize_github_events(events: list[dict]) -> dict:
+    """Summary of a list of GitHub events (see get_github_summary)."""
     if not events:
         return {
             'has_activity': False,
@@ -140,10 +475,13 @@ def get_github_summary() -> dict:
 
 if __name__ == '__main__':
     # Test the fetcher
-    print(f"Fetching GitHub activity for {GITHUB_USERNAME}...")
+    print(f"Fetching GitHub activity for {current_profile().github_username}...")
     summary = get_github_summary()
     print(f"Activity found: {summary['has_activity']}")
     print(f"Commits: {summary['commits']}")
     print(f"Active repos: {summary['repos']}")
     print(f"Current streak: {summary['streak']} days")
+    if 'longest_streak' in summary:
+        print(f"Longest streak: {summary['longest_streak']} days")
+        print(f"Weekly totals: {[w['contributions'] for w in summary['weekly_totals']]}")
     print(f"Recent messages: {summary['recent_messages'][:3]}")
@@ -0,0 +1,177 @@
+"""
+Shared, pooled network clients.
+
+One keep-alive requests session per host (GitHub and anything else
+fetched over plain HTTP) and one Anthropic client per process; for async
+code, one httpx.AsyncClient (HTTP/2 when available) and one
+AsyncAnthropic client per event loop. Everything is created on first use
+and reused by every call and every profile in batch mode, so a run pays
+for connection and TLS setup once per host rather than once per call.
+"""
+
+import importlib.util
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+from config import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_TIMEOUT,
+    BATCH_CONCURRENCY,
+    HTTP2,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_READ_TIMEOUT,
+)
+from instrumentation import count
+
+_lock = threading.Lock()
+_sessions: dict[str, object] = {}
+_anthropic = None
+_async_anthropic: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_async_http: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def http2_available() -> bool:
+    """Whether HTTP/2 is enabled and the h2 package needed for it is installed."""
+    return HTTP2 and importlib.util.find_spec('h2') is not None
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url: str):
+    """
+    Keep-alive requests session for the host of `url`.
+
+    Sessions are pooled per host and sized for batch runs, where several
+    profiles hit the same host at once.
+    """
+    host = _host(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(HTTP_POOL_SIZE, BATCH_CONCURRENCY))
+            session.mount(host, adapter)
+            _sessions[host] = session
+    return session
+
+
+def http_get(url: str, **kwargs):
+    """
+    GET through the pooled session for the url's host.
+
+    Applies the configured (connect, read) timeouts unless `timeout` is given.
+    """
+    kwargs.setdefault('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    response = get_session(url).get(url, **kwargs)
+    count('http_calls')
+    return response
+
+
+def http_post(url: str, **kwargs):
+    """POST through the pooled session for the url's host (see http_get)."""
+    kwargs.setdefault('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    response = get_session(url).post(url, **kwargs)
+    count('http_calls')
+    return response
+
+
+def async_http_client():
+    """
+    The httpx.AsyncClient for the running event loop, shared by every host.
+
+    Like async_anthropic_client, one per loop, since its connections
+    belong to the loop that opened them. Uses HTTP/2 when available and
+    the same timeouts and pool size as the requests sessions.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_http.get(loop)
+        if client is None:
+            import httpx
+
+            pool_size = max(HTTP_POOL_SIZE, BATCH_CONCURRENCY)
+            client = httpx.AsyncClient(
+                http2=http2_available(),
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+            _async_http[loop] = client
+    return client
+
+
+async def async_http_get(url: str, **kwargs):
+    """GET through the event loop's shared async client (see async_http_client)."""
+    response = await async_http_client().get(url, **kwargs)
+    count('http_calls')
+    return response
+
+
+async def async_http_post(url: str, **kwargs):
+    """POST through the event loop's shared async client (see async_http_client)."""
+    response = await async_http_client().post(url, **kwargs)
+    count('http_calls')
+    return response
+
+
+def _client_options(http_client) -> dict:
+    """Options shared by the sync and async clients, around a pool of the matching kind."""
+    return {
+        'api_key': ANTHROPIC_API_KEY,
+        'timeout': ANTHROPIC_TIMEOUT,
+        'http_client': http_client,
+    }
+
+
+def anthropic_client():
+    """The process-wide Anthropic client (thread-safe, so shared by batch workers)."""
+    global _anthropic
+    with _lock:
+        if _anthropic is None:
+            from anthropic import Anthropic, DefaultHttpxClient
+
+            _anthropic = Anthropic(**_client_options(DefaultHttpxClient(http2=http2_available())))
+    return _anthropic
+
+
+def async_anthropic_client():
+    """
+    The AsyncAnthropic client for the running event loop.
+
+    Async connections belong to the loop that opened them, so there is
+    one client per loop rather than one per process.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_anthropic.get(loop)
+        if client is None:
+            from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+            client = AsyncAnthropic(**_client_options(DefaultAsyncHttpxClient(http2=http2_available())))
+            _async_anthropic[loop] = client
+    return client
+
+
+def reset_clients() -> None:
+    """Close and forget every shared client (e.g. after changing the API base URL)."""
+    global _anthropic
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        if _anthropic is not None:
+            _anthropic.close()
+        _anthropic = None
+        _async_anthropic.clear()
+        _async_http.clear()
@@ -0,0 +1,226 @@
+"""Stage timing, counters and resource usage for processing runs."""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import serialization
+from profiles import current_profile
+
+METRIC_PREFIX = 'life_dashboard'
+
+_report_var: ContextVar['RunReport | None'] = ContextVar('run_report', default=None)
+_span_var: ContextVar['dict | None'] = ContextVar('run_span', default=None)
+_collected_var: ContextVar['list | None'] = ContextVar('collected_reports', default=None)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, if the platform reports it."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except Exception:
+        return None
+
+
+class RunReport:
+    """Nested timed spans and counters collected during one run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.root = {'name': name, 'start_ms': 0.0, 'duration_ms': None, 'attrs': {}, 'children': []}
+        self.counters: dict[str, int] = {}
+        self.status = 'running'
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self, status: str = 'ok') -> None:
+        self.status = status
+        self.root['duration_ms'] = round(self.elapsed_ms(), 3)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'startedAt': self.started_at.isoformat(),
+            'status': self.status,
+            'durationMs': self.root['duration_ms'],
+            'peakRssBytes': peak_rss_bytes(),
+            'counters': dict(sorted(self.counters.items())),
+            'spans': self.root['children'],
+        }
+
+
+def start_run(name: str) -> RunReport:
+    """Start collecting a run report in the current context."""
+    report = RunReport(name)
+    _report_var.set(report)
+    _span_var.set(report.root)
+    return report
+
+
+def current_run() -> RunReport | None:
+    """The run report being collected in this context, if any."""
+    return _report_var.get()
+
+
+def end_run(status: str = 'ok') -> RunReport | None:
+    """Finish the current run report and stop collecting."""
+    report = _report_var.get()
+    if report is not None:
+        report.finish(status)
+        collected = _collected_var.get()
+        if collected is not None:
+            collected.append(report)
+    _report_var.set(None)
+    _span_var.set(None)
+    return report
+
+
+@contextmanager
+def collect_reports():
+    """
+    Keep every run report finished inside the block, in the order they end.
+
+    Contexts copied inside the block (e.g. batch_runner's worker threads)
+    share the same list, so concurrent runs are collected too.
+
+    Yields:
+        list: The finished RunReports
+    """
+    reports: list[RunReport] = []
+    token = _collected_var.set(reports)
+    try:
+        yield reports
+    finally:
+        _collected_var.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a block as a child of the current span.
+
+    Does nothing when no run is being collected, so library functions can
+    be instrumented unconditionally.
+    """
+    report = _report_var.get()
+    parent = _span_var.get()
+    if report is None or parent is None:
+        yield None
+        return
+
+    node = {
+        'name': name,
+        'start_ms': round(report.elapsed_ms(), 3),
+        'duration_ms': None,
+        'attrs': attrs,
+        'children': [],
+    }
+    with report._lock:
+        parent['children'].append(node)
+    token = _span_var.set(node)
+    start = time.perf_counter()
+    try:
+        yield node
+    except BaseException:
+        node['attrs']['error'] = True
+        raise
+    finally:
+        node['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        _span_var.reset(token)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter on the current run (no-op outside a run)."""
+    report = _report_var.get()
+    if report is not None:
+        report.count(name, n)
+
+
+def _flatten_spans(spans: list, prefix: str = '') -> list[tuple[str, float]]:
+    flat = []
+    for node in spans:
+        path = f"{prefix}/{node['name']}" if prefix else node['name']
+        flat.append((path, node['duration_ms'] or 0.0))
+        flat.extend(_flatten_spans(node['children'], path))
+    return flat
+
+
+def to_openmetrics(report: RunReport) -> str:
+    """Render a run report in OpenMetrics text format."""
+    data = report.to_dict()
+    lines = []
+
+    lines.append(f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge")
+    lines.append(f'{METRIC_PREFIX}_run_duration_seconds{{status="{data["status"]}"}} {(data["durationMs"] or 0) / 1000:.6f}')
+
+    lines.append(f"# TYPE {METRIC_PREFIX}_stage_duration_seconds gauge")
+    for path, duration_ms in _flatten_spans(data['spans']):
+        label = path.replace('\\', '\\\\').replace('"', '\\"')
+        lines.append(f'{METRIC_PREFIX}_stage_duration_seconds{{stage="{label}"}} {duration_ms / 1000:.6f}')
+
+    for name, value in data['counters'].items():
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} counter")
+        lines.append(f"{METRIC_PREFIX}_{name}_total {value}")
+
+    if data['peakRssBytes'] is not None:
+        lines.append(f"# TYPE {METRIC_PREFIX}_peak_rss_bytes gauge")
+        lines.append(f"{METRIC_PREFIX}_peak_rss_bytes {data['peakRssBytes']}")
+
+    lines.append("# EOF")
+    return '\n'.join(lines) + '\n'
+
+
+def write_run_report(report: RunReport, openmetrics: bool = False, log_dir: Path | None = None) -> Path:
+    """
+    Write the run report as JSON (and optionally OpenMetrics) into the
+    active profile's log dir.
+
+    Returns:
+        Path: The JSON report file
+    """
+    log_dir = log_dir or current_profile().log_dir
+    log_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"run_{report.started_at.strftime('%Y-%m-%d_%H-%M-%S')}"
+
+    report_path = log_dir / f'{stem}.json'
+    report_path.write_bytes(serialization.dumps(report.to_dict()))
+
+    if openmetrics:
+        (log_dir / f'{stem}.prom').write_text(to_openmetrics(report), encoding='utf-8')
+
+    return report_path
+
+
+def format_span_tree(report: RunReport) -> str:
+    """Human-readable stage timings, one line per span."""
+    lines = []
+
+    def walk(spans: list, depth: int) -> None:
+        for node in spans:
+            lines.append(f"{'  ' * depth}{node['name']}: {node['duration_ms'] or 0:.1f} ms")
+            walk(node['children'], depth + 1)
+
+    walk(report.root['children'], 0)
+    return '\n'.join(lines)
@@ -7,21 +7,53 @@ This script:
 2. Fetches your GitHub activity
 3. Processes manual entries
 4. Sends everything to Claude for analysis
-5. Updates the JSON data files
+5. Updates the JSON data files and snapshots them (see snapshots.py)
 6. Optionally commits and pushes changes
 
-Run this bi-weekly (or whenever you want fresh data).
+Run this bi-weekly (or whenever you want fresh data). Each stage's result is
+saved, so re-running after a failure picks up where the last run stopped.
 """
 
 import argparse
 from datetime import datetime
 import subprocess
 import sys
-
-from config import DATA_DIR, DAYS_TO_LOOK_BACK
-from obsidian_reader import get_notes_summary
+import time
+
+from config import (
+    DAYS_TO_LOOK_BACK,
+    CLAUDE_MODEL,
+    ANALYSIS_MAX_TOKENS,
+    GITHUB_CACHE_MINUTES,
+    GITHUB_COLLECTOR,
+    PROMPT_RELATED_NOTES,
+    SNAPSHOTS,
+)
+from obsidian_reader import (
+    collect_notes,
+    notes_from_dicts,
+    notes_to_dicts,
+    summarize_notes,
+    summary_from_dict,
+    summary_to_dict,
+)
 from github_fetcher import get_github_summary
-from claude_analyzer import analyze_life_data, validate_analysis
+from claude_analyzer import PROMPT_SIZES, build_prompts, request_analysis, validate_analysis
+from pipeline import (
+    STAGES,
+    forced_stages,
+    load_artifact,
+    prune_artifacts,
+    run_stage,
+    save_artifact,
+    stage_key,
+    vault_fingerprint,
+)
+from token_budget import TokenBudget
+from instrumentation import start_run, end_run, span, write_run_report, format_span_tree
+from data_lock import data_lock
+from profiles import current_profile
+from snapshots import diff_snapshots, exported_to_git, format_diff, list_snapshots, mark_exported_to_git, take_snapshot
 from data_manager import (
     get_quadrants,
     update_quadrants,
@@ -35,65 +67,175 @@ from data_manager import (
     get_goals,
     update_goals,
     add_inspiration_items,
+    update_mood,
+    record_github_rollup,
 )
 
 
-def process_life_data(days: int = DAYS_TO_LOOK_BACK, dry_run: bool = False) -> bool:
+def process_life_data(
+    days: int = DAYS_TO_LOOK_BACK,
+    dry_run: bool = False,
+    openmetrics: bool = False,
+    fresh: bool = False,
+    from_stage: str | None = None,
+) -> bool:
     """
     Main processing function.
 
+    Stages whose inputs haven't changed since a previous (possibly failed)
+    run reuse that run's saved results, see pipeline.py.
+
     Args:
         days: Number of days to look back
         dry_run: If True, don't write any files
+        openmetrics: Also write the run report in OpenMetrics text format
+        fresh: Ignore saved stage results and run everything
+        from_stage: Re-run this stage and everything after it
 
     Returns:
         bool: True if successful
     """
+    report = start_run('process_life_data')
+    success = False
+    try:
+        success = _process_life_data(days, dry_run, forced_stages(fresh, from_stage))
+        return success
+    finally:
+        end_run('ok' if success else 'failed')
+        print(f"\nStage timings:\n{format_span_tree(report)}")
+        if not dry_run:
+            report_path = write_run_report(report, openmetrics=openmetrics)
+            print(f"Run report saved to: {report_path}")
+
+
+def _process_life_data(days: int, dry_run: bool, force: set[str]) -> bool:
+    run = prepare_analysis(days, force, dry_run)
+    if run is None:
+        return False
+
+    def analyze():
+        analysis = request_analysis(run['prompts'], run['budget'])
+        if not analysis:
+            print("  ERROR: Analysis failed!")
+            return None
+        if not validate_analysis(analysis):
+            print("  ERROR: Analysis validation failed!")
+            return None
+        return analysis
+
+    analysis = run_stage('analyze', run['analysis_key'], analyze, force='analyze' in force, save=not dry_run)
+    if not analysis:
+        return False
+
+    print("  Analysis complete!")
+    return finish_analysis(run, analysis, dry_run, force)
+
+
+def prepare_analysis(days: int, force: set[str], dry_run: bool = False) -> dict | None:
+    """
+    Run the gather, enrich and prompt stages for the active profile.
+
+    In a dry run the stages' results are not saved (and old ones not pruned).
+
+    Returns:
+        dict: What the analyze and apply stages need (summaries, unprocessed
+        manual entries, current quadrants, prompts, budget and stage keys),
+        or None if no prompt fits the token budget
+    """
+    profile = current_profile()
     print(f"\n{'='*50}")
     print(f"Life Dashboard Processing - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print(f"Looking back {days} days")
+    if profile.name != 'default':
+        print(f"Profile: {profile.name}")
     print(f"{'='*50}\n")
 
+    if not dry_run:
+        prune_artifacts()
+    today = datetime.now().strftime('%Y-%m-%d')
+
     # Step 1: Gather data
     print("Step 1: Gathering data...")
 
-    print("  - Scanning Obsidian vault...")
-    notes_summary = get_notes_summary()
-    print(f"    Found {notes_summary['total_notes']} recent notes")
-
-    print("  - Fetching GitHub activity...")
-    github_summary = get_github_summary()
-    print(f"    Found {github_summary.get('commits', 0)} commits")
-
-    print("  - Loading manual entries...")
-    manual_entries = get_manual_entries()
-    unprocessed = [e for e in manual_entries if not e.get('processed', False)]
-    print(f"    Found {len(unprocessed)} unprocessed entries")
-
-    print("  - Loading current quadrants...")
-    current_quadrants = get_quadrants()
-    print(f"    Loaded {len(current_quadrants)} quadrants")
+    with span('gather'):
+        print("  - Scanning Obsidian vault...")
+        with span('fingerprint'):
+            fingerprint = vault_fingerprint(profile.vault_path)
+        notes_key = stage_key('notes', days, today, fingerprint)
+        collected = run_stage(
+            'gather_notes', notes_key,
+            # A forced gather (--fresh) re-checks every journal, not just recent ones
+            lambda: dict(zip(('journal_entries', 'other_notes'), collect_notes(restat='gather' in force))),
+            force='gather' in force,
+            encode=lambda c: {k: notes_to_dicts(v) for k, v in c.items()},
+            decode=lambda c: {k: notes_from_dicts(v) for k, v in c.items()},
+            save=not dry_run,
+        )
+        print(f"    Found {len(collected['journal_entries']) + len(collected['other_notes'])} recent notes")
+
+        print("  - Fetching GitHub activity...")
+        # Reused for the same GITHUB_CACHE_MINUTES window as the fetcher's own cache
+        github_window = int(time.time() // (GITHUB_CACHE_MINUTES * 60)) if GITHUB_CACHE_MINUTES > 0 else time.time()
+        github_key = stage_key('github', profile.github_username, days, today, GITHUB_COLLECTOR, github_window)
+        github_summary = run_stage('gather_github', github_key, lambda: get_github_summary(days),
+                                   force='gather' in force, save=not dry_run)
+        print(f"    Found {github_summary.get('commits', 0)} commits")
+
+        print("  - Loading manual entries...")
+        with span('manual_entries'):
+            manual_entries = get_manual_entries()
+        unprocessed = [e for e in manual_entries if not e.get('processed', False)]
+        print(f"    Found {len(unprocessed)} unprocessed entries")
+
+        print("  - Loading current quadrants...")
+        with span('quadrants'):
+            current_quadrants = get_quadrants()
+        print(f"    Loaded {len(current_quadrants)} quadrants")
+
+    enrich_key = stage_key('enrich', notes_key, PROMPT_RELATED_NOTES, profile.people, profile.people_ignore)
+    notes_summary = run_stage(
+        'enrich', enrich_key,
+        lambda: summarize_notes(collected['journal_entries'], collected['other_notes']),
+        force='enrich' in force,
+        encode=summary_to_dict,
+        decode=summary_from_dict,
+        save=not dry_run,
+    )
 
     # Step 2: Analyze with Claude
     print("\nStep 2: Analyzing with Claude...")
-    analysis = analyze_life_data(
-        notes_summary,
-        github_summary,
-        unprocessed,
-        current_quadrants,
-        days
+    budget = TokenBudget()
+    # By the GitHub data itself, so a new window with the same activity reuses the prompt
+    prompt_key = stage_key('prompt', enrich_key, github_summary, unprocessed, current_quadrants, days,
+                           PROMPT_SIZES, budget.per_run, budget.per_month, ANALYSIS_MAX_TOKENS)
+    prompts = run_stage(
+        'prompt', prompt_key,
+        lambda: build_prompts(notes_summary, github_summary, unprocessed, current_quadrants, days, budget),
+        force='prompt' in force,
+        # A prompt trimmed to fit what was left of the budget is rebuilt once there's room again
+        reusable=lambda p: not p.get('trimmed') and budget.allows(p['estimated_input_tokens'], ANALYSIS_MAX_TOKENS),
+        save=not dry_run,
     )
-
-    if not analysis:
-        print("  ERROR: Analysis failed!")
-        return False
-
-    if not validate_analysis(analysis):
-        print("  ERROR: Analysis validation failed!")
-        return False
-
-    print("  Analysis complete!")
-
+    if not prompts:
+        print("  ERROR: Could not build a prompt within the token budget!")
+        return None
+
+    return {
+        'days': days,
+        'notes_summary': notes_summary,
+        'github_summary': github_summary,
+        'unprocessed': unprocessed,
+        'current_quadrants': current_quadrants,
+        'prompts': prompts,
+        'budget': budget,
+        'enrich_key': enrich_key,
+        'github_key': github_key,
+        'analysis_key': stage_key('analyze', prompts['system'], prompts['user'], CLAUDE_MODEL, ANALYSIS_MAX_TOKENS),
+    }
+
+
+def finish_analysis(run: dict, analysis: dict, dry_run: bool, force: set[str]) -> bool:
+    """Apply stage: write a validated analysis to the active profile's data files."""
     # Step 3: Update data files
     if dry_run:
         print("\nStep 3: DRY RUN - not updating files")
@@ -103,19 +245,105 @@ def process_life_data(days: int = DAYS_TO_LOOK_BACK, dry_run: bool = False) -> b
 
     print("\nStep 3: Updating data files...")
 
+    def apply():
+        apply_analysis(
+            analysis,
+            run['notes_summary'],
+            run['github_summary'],
+            run['unprocessed'],
+            # As they are now: another process may have updated them since the gather stage
+            get_quadrants(),
+        )
+        return {'appliedAt': datetime.now().isoformat()}
+
+    # One lock around the whole read-modify-write of the data files (and the
+    # snapshot of the result), so an overlapping run or restore can't clobber it
+    with data_lock():
+        run_stage('apply', stage_key('apply', run['analysis_key']), apply, force='apply' in force)
+
+        if SNAPSHOTS:
+            with span('snapshot'):
+                snapshot_id = take_snapshot('run')
+            print(f"  Snapshot: {snapshot_id or 'no changes since the last one'}")
+
+    print("\nProcessing complete!")
+    return True
+
+
+def apply_batch_result(job: dict, analysis: dict | None, dry_run: bool = False) -> bool:
+    """
+    Apply an analysis that came back from a Message Batch (see batch_runner).
+
+    The summaries are reloaded from the stage artifacts saved when the batch
+    was submitted; like every apply, the quadrants are re-read so the
+    updates merge into the current state rather than the state at
+    submission time.
+
+    Args:
+        job: The job recorded when the batch was submitted
+        analysis: Parsed analysis, or None if the request failed
+        dry_run: If True, don't write any files
+
+    Returns:
+        bool: True if the analysis was applied
+    """
+    if not analysis:
+        print("  ERROR: Batch analysis failed!")
+        return False
+    if not validate_analysis(analysis):
+        print("  ERROR: Analysis validation failed!")
+        return False
+
+    notes_summary = load_artifact('enrich', job['enrich_key'])
+    github_summary = load_artifact('gather_github', job['github_key'])
+    if notes_summary is None or github_summary is None:
+        print("  ERROR: Saved gather results have expired, run the analysis again")
+        return False
+    notes_summary = summary_from_dict(notes_summary)
+
+    # Saved like a synchronous result, so a later run with the same inputs reuses it
+    if not dry_run:
+        save_artifact('analyze', job['analysis_key'], analysis)
+
+    run = {
+        'notes_summary': notes_summary,
+        'github_summary': github_summary,
+        'unprocessed': job['unprocessed'],
+        'analysis_key': job['analysis_key'],
+    }
+    return finish_analysis(run, analysis, dry_run, force=set())
+
+
+def apply_analysis(
+    analysis: dict,
+    notes_summary: dict,
+    github_summary: dict,
+    unprocessed: list,
+    current_quadrants: dict,
+) -> None:
+    """Write the results of an analysis to the data files."""
     # Update timeline
     timeline_entries = analysis.get('timeline_entries', [])
     if timeline_entries:
         print(f"  - Adding {len(timeline_entries)} timeline entries...")
         add_timeline_entries(timeline_entries)
 
-    # Update quadrants
+    # Record GitHub activity in the rollups
+    print("  - Updating rollups...")
+    record_github_rollup(github_summary)
+
+    # Update quadrants, and their people lists from the people index
     quadrant_updates = analysis.get('quadrant_updates', {})
-    if quadrant_updates:
+    people_summary = notes_summary.get('people_summary')
+    if quadrant_updates or people_summary:
         print("  - Updating quadrants...")
         for key, updates in quadrant_updates.items():
             if key in current_quadrants:
                 current_quadrants[key].update(updates)
+        if people_summary:
+            from people_index import update_quadrant_people  # numpy, only needed here
+
+            update_quadrant_people(current_quadrants, people_summary)
         update_quadrants(current_quadrants)
 
     # Update right_now
@@ -130,6 +358,19 @@ def process_life_data(days: int = DAYS_TO_LOOK_BACK, dry_run: bool = False) -> b
         }
         update_right_now(right_now)
 
+    # Update mood time-series
+    mood_trend = notes_summary.get('mood_trend')
+    if mood_trend:
+        print("  - Updating mood time-series...")
+        update_mood(mood_trend)
+
+    # Append this run to the quadrant history and re-export its series
+    print("  - Recording quadrant history...")
+    from quadrant_history import export_history, record_run  # numpy, only needed here
+
+    record_run(current_quadrants, right_now or get_right_now(), mood_trend)
+    export_history()
+
     # Update goals if extracted
     extracted_goals = analysis.get('extracted_goals', [])
     if extracted_goals:
@@ -178,30 +419,47 @@ def process_life_data(days: int = DAYS_TO_LOOK_BACK, dry_run: bool = False) -> b
     metadata['totalEntriesProcessed'] = metadata.get('totalEntriesProcessed', 0) + len(timeline_entries)
     update_metadata(metadata)
 
-    print("\nProcessing complete!")
-    return True
-
 
 def git_commit_and_push():
-    """Commit changes and push to remote."""
+    """
+    Commit the data directory to git (optional exporter, see --commit).
+
+    With snapshots enabled, nothing is committed unless there is a snapshot
+    newer than the last one exported, and the commit message lists the
+    files it changed.
+    """
+    message = f"Update life dashboard data - {datetime.now().strftime('%Y-%m-%d')}"
+    snapshot_ids = list_snapshots() if SNAPSHOTS else []
+    if snapshot_ids:
+        latest, exported = snapshot_ids[-1], exported_to_git()
+        if latest == exported:
+            print("\nNo new snapshot since the last commit, nothing to commit")
+            return
+        if exported in snapshot_ids:
+            message += f"\n\nSnapshot {latest}, changes since {exported}:\n{format_diff(diff_snapshots(exported, latest))}"
+        else:
+            message += f"\n\nSnapshot {latest}"
+
     try:
         print("\nCommitting changes to git...")
 
         # Add data files
-        subprocess.run(['git', 'add', 'data/'], check=True, cwd=DATA_DIR.parent)
+        data_dir = current_profile().data_dir
+        subprocess.run(['git', 'add', str(data_dir)], check=True, cwd=data_dir.parent)
 
         # Commit
-        commit_message = f"Update life dashboard data - {datetime.now().strftime('%Y-%m-%d')}"
         subprocess.run(
-            ['git', 'commit', '-m', commit_message],
+            ['git', 'commit', '-m', message],
             check=True,
-            cwd=DATA_DIR.parent
+            cwd=data_dir.parent
         )
+        if snapshot_ids:
+            mark_exported_to_git(snapshot_ids[-1])
 
         print("Changes committed!")
 
         # Push (optional)
-        # subprocess.run(['git', 'push'], check=True, cwd=DATA_DIR.parent)
+        # subprocess.run(['git', 'push'], check=True, cwd=data_dir.parent)
         # print("Changes pushed!")
 
     except subprocess.CalledProcessError as e:
@@ -226,10 +484,31 @@ def main():
         action='store_true',
         help='Commit changes to git after processing'
     )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Ignore saved stage results from previous runs'
+    )
+    parser.add_argument(
+        '--from-stage',
+        choices=STAGES,
+        help='Re-run this stage and all later ones'
+    )
+    parser.add_argument(
+        '--openmetrics',
+        action='store_true',
+        help='Also write the run report in OpenMetrics text format'
+    )
 
     args = parser.parse_args()
 
-    success = process_life_data(days=args.days, dry_run=args.dry_run)
+    success = process_life_data(
+        days=args.days,
+        dry_run=args.dry_run,
+        openmetrics=args.openmetrics,
+        fresh=args.fresh,
+        from_stage=args.from_stage,
+    )
 
     if success and args.commit and not args.dry_run:
         git_commit_and_push()
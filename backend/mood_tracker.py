@@ -0,0 +1,337 @@
+"""Per-entry mood scoring and time-series analytics over all journals."""
+
+import hashlib
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation import count
+from obsidian_reader import parse_note
+from profiles import current_profile
+
+MOOD_HISTORY_FILE = 'mood_history.npz'
+
+JOURNAL_NAME = re.compile(r'(\d{4}-\d{2}-\d{2})\.md$')
+
+EPOCH = date(1970, 1, 1)
+
+# Columns stored in the history file, in order
+HISTORY_COLUMNS = {
+    'date': np.int32,        # days since 1970-01-01
+    'score': np.float32,     # mood score, -1 to 1
+    'positive': np.int16,
+    'stress': np.int16,
+    'balance': np.int16,
+    'mtime': np.int64,       # st_mtime_ns of the journal when scored
+    'hash': 'U40',           # sha1 of the journal content, hex (S20 would drop trailing NULs)
+}
+
+SHA1_SIZE = 20
+
+
+def analyze_mood_from_journal(content: str) -> dict:
+    """
+    Extract mood indicators from journal content.
+    Returns mood analysis dict.
+    """
+    content_lower = content.lower()
+
+    # Positive indicators
+    positive_words = [
+        'excited', 'great', 'amazing', 'happy', 'good', 'fantastic',
+        'love', 'awesome', 'wonderful', 'progress', 'success', 'achieved',
+        'fun', 'enjoying', 'productive'
+    ]
+
+    # Negative/stress indicators
+    stress_words = [
+        'worried', 'stressed', 'anxious', 'overwhelmed', 'tired',
+        'frustrated', 'stuck', 'difficult', 'hard', 'problem',
+        'behind', 'overdoing', 'burned', 'struggle'
+    ]
+
+    # Balance indicators
+    balance_words = [
+        'balance', 'rest', 'chill', 'relax', 'break', 'free time',
+        'living', 'enjoying life'
+    ]
+
+    positive_count = sum(1 for word in positive_words if word in content_lower)
+    stress_count = sum(1 for word in stress_words if word in content_lower)
+    balance_count = sum(1 for word in balance_words if word in content_lower)
+
+    # Calculate mood score (-1 to 1)
+    total = positive_count + stress_count + 1  # +1 to avoid division by zero
+    mood_score = (positive_count - stress_count) / total
+
+    if mood_score > 0.3:
+        mood = 'energized'
+    elif mood_score < -0.3:
+        mood = 'stressed'
+    else:
+        mood = 'balanced'
+
+    return {
+        'mood': mood,
+        'mood_score': round(mood_score, 2),
+        'positive_signals': positive_count,
+        'stress_signals': stress_count,
+        'balance_signals': balance_count,
+    }
+
+
+def _empty_history() -> dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in HISTORY_COLUMNS.items()}
+
+
+def mood_history_path() -> Path:
+    """History file in the active profile's cache directory."""
+    return current_profile().cache_dir / MOOD_HISTORY_FILE
+
+
+def load_mood_history() -> dict[str, np.ndarray]:
+    """Load the columnar mood history (sorted by date)."""
+    path = mood_history_path()
+    if not path.exists():
+        return _empty_history()
+    try:
+        with np.load(path) as data:
+            history = {name: data[name] for name in HISTORY_COLUMNS}
+        if history['hash'].dtype.kind == 'S':
+            # Older files stored raw digests; restore the NULs numpy stripped
+            history['hash'] = np.array([h.ljust(SHA1_SIZE, b'\0').hex() for h in history['hash']], dtype='U40')
+        return {name: history[name].astype(dtype) for name, dtype in HISTORY_COLUMNS.items()}
+    except Exception as e:
+        print(f"Error reading mood history, rebuilding: {e}")
+        return _empty_history()
+
+
+def save_mood_history(history: dict[str, np.ndarray]) -> None:
+    """Write the mood history atomically."""
+    path = mood_history_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp.npz')
+    np.savez_compressed(tmp_path, **history)
+    tmp_path.replace(path)
+
+
+def update_mood_history(vault_path: str | None = None) -> dict[str, np.ndarray]:
+    """
+    Score every dated journal entry, reusing cached scores.
+
+    A journal is only re-read when its mtime changed, and only re-scored
+    when its content hash changed. Deleted journals are dropped.
+
+    Returns:
+        dict: The updated history columns
+    """
+    journal_path = Path(vault_path or current_profile().vault_path) / '_Journal'
+    history = load_mood_history()
+    if not journal_path.exists():
+        return history
+
+    cached = {int(d): i for i, d in enumerate(history['date'])}
+    rows = []
+    changed = False
+
+    for file in journal_path.glob('*.md'):
+        match = JOURNAL_NAME.match(file.name)
+        if not match:
+            continue
+        try:
+            day = (datetime.strptime(match.group(1), '%Y-%m-%d').date() - EPOCH).days
+            mtime = file.stat().st_mtime_ns
+            count('files_stated')
+
+            i = cached.get(day)
+            if i is not None and int(history['mtime'][i]) == mtime:
+                count('mood_cache_hits')
+                rows.append(tuple(history[name][i] for name in HISTORY_COLUMNS))
+                continue
+
+            raw = file.read_bytes()
+            count('bytes_read', len(raw))
+            digest = hashlib.sha1(raw).hexdigest()
+            if i is not None and history['hash'][i] == digest:
+                count('mood_cache_hits')
+                row = [history[name][i] for name in HISTORY_COLUMNS]
+                row[5] = mtime
+                rows.append(tuple(row))
+                changed = True
+                continue
+
+            mood = analyze_mood_from_journal(parse_note(raw)[1])
+            count('files_parsed')
+            rows.append((
+                day, mood['mood_score'], mood['positive_signals'],
+                mood['stress_signals'], mood['balance_signals'], mtime, digest,
+            ))
+            changed = True
+        except Exception as e:
+            print(f"Error scoring journal {file}: {e}")
+            continue
+
+    if len(rows) != len(history['date']):
+        changed = True
+    if not changed:
+        return history
+
+    rows.sort(key=lambda r: r[0])
+    history = _empty_history()
+    if rows:
+        columns = list(zip(*rows))
+        history = {
+            name: np.array(col, dtype=dtype)
+            for (name, dtype), col in zip(HISTORY_COLUMNS.items(), columns)
+        }
+    save_mood_history(history)
+    return history
+
+
+def daily_series(history: dict[str, np.ndarray], days: int, end: date | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Expand the sparse history onto a dense daily grid.
+
+    Returns:
+        (day numbers, scores) where days without a journal are NaN
+    """
+    end_day = ((end or date.today()) - EPOCH).days
+    grid = np.arange(end_day - days + 1, end_day + 1, dtype=np.int32)
+    scores = np.full(days, np.nan)
+
+    mask = (history['date'] >= grid[0]) & (history['date'] <= end_day)
+    scores[history['date'][mask] - grid[0]] = history['score'][mask]
+    return grid, scores
+
+
+def rolling_average(scores: np.ndarray, window: int) -> np.ndarray:
+    """NaN-aware trailing rolling mean; NaN where the window has no data."""
+    present = ~np.isnan(scores)
+    values = np.where(present, scores, 0.0)
+
+    value_sums = np.cumsum(values)
+    counts = np.cumsum(present)
+    value_sums[window:] = value_sums[window:] - value_sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, value_sums / counts, np.nan)
+
+
+def mood_trend(history: dict[str, np.ndarray], days: int = 30) -> float | None:
+    """
+    Least-squares slope of mood over the last N days, in score per week.
+    Returns None with fewer than 3 entries.
+    """
+    grid, scores = daily_series(history, days)
+    present = ~np.isnan(scores)
+    if present.sum() < 3:
+        return None
+    slope = np.polyfit(grid[present].astype(np.float64), scores[present], 1)[0]
+    return float(slope * 7)
+
+
+def mood_anomalies(history: dict[str, np.ndarray], window: int = 30, threshold: float = 2.0) -> list[dict]:
+    """
+    Find entries that deviate strongly from the preceding window.
+
+    Each entry is compared against the mean and standard deviation of the
+    entries in the `window` days before it.
+
+    Returns:
+        list of {'date', 'score', 'zscore'} dicts, oldest first
+    """
+    dates = history['date'].astype(np.int64)
+    scores = history['score'].astype(np.float64)
+    if len(dates) < 3:
+        return []
+
+    # Index range of the trailing window for every entry
+    starts = np.searchsorted(dates, dates - window, side='left')
+    ends = np.arange(len(dates))
+
+    sums = np.concatenate([[0.0], np.cumsum(scores)])
+    squares = np.concatenate([[0.0], np.cumsum(scores ** 2)])
+    counts = ends - starts
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums[ends] - sums[starts]) / counts
+        variances = (squares[ends] - squares[starts]) / counts - means ** 2
+        stds = np.sqrt(np.clip(variances, 0.0, None))
+        zscores = (scores - means) / stds
+
+    flagged = (counts >= 3) & (stds > 0) & (np.abs(zscores) >= threshold)
+    return [
+        {
+            'date': (EPOCH + timedelta(days=int(dates[i]))).isoformat(),
+            'score': round(float(scores[i]), 2),
+            'zscore': round(float(zscores[i]), 2),
+        }
+        for i in np.flatnonzero(flagged)
+    ]
+
+
+def get_mood_timeseries_summary(days: int = 90) -> dict | None:
+    """
+    Update the mood history and summarize it for the prompt and dashboard.
+
+    Returns:
+        dict with rolling averages, trend, recent anomalies and a daily
+        series for the last `days` days, or None if there are no journals
+    """
+    history = update_mood_history()
+    if not len(history['date']):
+        return None
+
+    grid, scores = daily_series(history, days)
+    week_avg = rolling_average(scores, 7)
+    month_avg = rolling_average(scores, 30)
+
+    trend = mood_trend(history)
+    if trend is None:
+        direction = 'unknown'
+    elif trend > 0.05:
+        direction = 'improving'
+    elif trend < -0.05:
+        direction = 'declining'
+    else:
+        direction = 'steady'
+
+    cutoff = (date.today() - timedelta(days=days)).isoformat()
+
+    def _round(value: float) -> float | None:
+        return None if np.isnan(value) else round(float(value), 2)
+
+    return {
+        'entries_tracked': int(len(history['date'])),
+        'first_entry': (EPOCH + timedelta(days=int(history['date'][0]))).isoformat(),
+        'last_entry': (EPOCH + timedelta(days=int(history['date'][-1]))).isoformat(),
+        'avg_7d': _round(week_avg[-1]),
+        'avg_30d': _round(month_avg[-1]),
+        'trend_per_week': None if trend is None else round(trend, 3),
+        'trend': direction,
+        'anomalies': [a for a in mood_anomalies(history) if a['date'] >= cutoff],
+        'series': [
+            {
+                'date': (EPOCH + timedelta(days=int(d))).isoformat(),
+                'score': _round(s),
+                'avg7': _round(w),
+            }
+            for d, s, w in zip(grid, scores, week_avg)
+            if not (np.isnan(s) and np.isnan(w))
+        ],
+    }
+
+
+if __name__ == '__main__':
+    # Test the mood tracker
+    summary = get_mood_timeseries_summary()
+    if not summary:
+        print("No journal entries found.")
+    else:
+        print(f"Entries tracked: {summary['entries_tracked']} ({summary['first_entry']} to {summary['last_entry']})")
+        print(f"7-day average: {summary['avg_7d']}, 30-day average: {summary['avg_30d']}")
+        print(f"Trend: {summary['trend']} ({summary['trend_per_week']} per week)")
+        print(f"Anomalies: {summary['anomalies']}")
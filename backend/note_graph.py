@@ -0,0 +1,290 @@
+"""
+Wikilink graph of the vault: forward links, backlinks and unresolved links.
+
+The scan manifest (see vault_manifest.py) remembers every note's mtime,
+size and outgoing [[links]], so updating the graph only re-reads the
+notes that changed since the last scan. The graph itself is built from
+the manifest as CSR adjacency arrays (one for links, one for backlinks).
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation import span
+from obsidian_reader import looks_like_name
+from profiles import current_profile
+from vault_manifest import update_manifest
+
+
+def _expand(ptr: np.ndarray, idx: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """All neighbors of `nodes` in a CSR adjacency (with repeats)."""
+    starts = ptr[nodes]
+    lengths = ptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=idx.dtype)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    return idx[offsets]
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((cols, rows))
+    ptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=ptr[1:])
+    return ptr, cols[order]
+
+
+class NoteGraph:
+    """
+    Link graph over the vault's notes.
+
+    Nodes 0..note_count-1 are notes (sorted by path); the rest are link
+    targets that don't resolve to a note (often people or ideas that
+    don't have a note of their own yet). Links resolve like Obsidian's:
+    by vault-relative path if the link has one, otherwise by note name,
+    case-insensitively, preferring the note with the shortest path.
+    """
+
+    def __init__(self, manifest: dict):
+        paths = sorted(manifest['notes'])
+        self.paths = paths
+        self.note_count = len(paths)
+        self.names = [p.rsplit('/', 1)[-1][:-3] for p in paths]
+        self.modified = np.array(
+            [manifest['notes'][p]['mtime'] // 1_000_000_000 for p in paths], dtype=np.int64)
+
+        self._by_path = {p[:-3].lower(): i for i, p in enumerate(paths)}
+        self._by_name: dict[str, int] = {}
+        for i in sorted(range(len(paths)), key=lambda i: (paths[i].count('/'), len(paths[i]))):
+            self._by_name.setdefault(self.names[i].lower(), i)
+
+        unresolved: dict[str, int] = {}
+        sources, targets = [], []
+        for i, path in enumerate(paths):
+            for link in manifest['notes'][path]['links']:
+                target = self._resolve(link)
+                if target is None:
+                    key = link.lower()
+                    target = unresolved.get(key)
+                    if target is None:
+                        target = unresolved[key] = len(paths) + len(unresolved)
+                        self.names.append(link)
+                if target != i:
+                    sources.append(i)
+                    targets.append(target)
+
+        self.size = len(self.names)
+        self._unresolved = unresolved
+
+        # Different spellings of the same target count as one link
+        edges = np.unique(np.array(sources, dtype=np.int64) * self.size + np.array(targets, dtype=np.int64))
+        src = (edges // max(self.size, 1)).astype(np.int32)
+        dst = (edges % max(self.size, 1)).astype(np.int32)
+        self.out_ptr, self.out_idx = _csr(src, dst, self.size)
+        self.in_ptr, self.in_idx = _csr(dst, src, self.size)
+
+    def _resolve(self, link: str) -> int | None:
+        key = link.lower()
+        if key.endswith('.md'):
+            key = key[:-3]
+        if '/' in key:
+            found = self._by_path.get(key.lstrip('/'))
+            if found is not None:
+                return found
+            key = key.rsplit('/', 1)[-1]
+        return self._by_name.get(key)
+
+    def node(self, name: str) -> int | None:
+        """Index of a note (by name or path) or an unresolved link target."""
+        found = self._resolve(name)
+        return found if found is not None else self._unresolved.get(name.lower())
+
+    def edge_count(self) -> int:
+        return len(self.out_idx)
+
+    def is_note(self, node: int) -> bool:
+        return node < self.note_count
+
+    def links(self, name: str) -> list[str]:
+        """Targets `name` links to."""
+        node = self.node(name)
+        if node is None:
+            return []
+        return [self.names[i] for i in self.out_idx[self.out_ptr[node]:self.out_ptr[node + 1]]]
+
+    def backlinks(self, name: str) -> list[str]:
+        """Notes linking to `name`."""
+        node = self.node(name)
+        if node is None:
+            return []
+        return [self.names[i] for i in self.in_idx[self.in_ptr[node]:self.in_ptr[node + 1]]]
+
+    def neighbors(self, nodes: np.ndarray, direction: str = 'both') -> np.ndarray:
+        """Distinct neighbors of a set of nodes ('out', 'in' or 'both')."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        parts = []
+        if direction in ('out', 'both'):
+            parts.append(_expand(self.out_ptr, self.out_idx, nodes))
+        if direction in ('in', 'both'):
+            parts.append(_expand(self.in_ptr, self.in_idx, nodes))
+        return np.unique(np.concatenate(parts))
+
+    def k_hop(self, name: str, k: int = 2, direction: str = 'both') -> dict[str, int]:
+        """
+        Everything within k links of `name`.
+
+        Returns:
+            dict: {name: hops}, nearest first
+        """
+        start = self.node(name)
+        if start is None:
+            return {}
+        distance = np.full(self.size, -1, dtype=np.int32)
+        distance[start] = 0
+        frontier = np.array([start])
+        for hop in range(1, k + 1):
+            reached = self.neighbors(frontier, direction)
+            frontier = reached[distance[reached] < 0]
+            if not len(frontier):
+                break
+            distance[frontier] = hop
+        found = np.flatnonzero(distance > 0)
+        found = found[np.argsort(distance[found], kind='stable')]
+        return {self.names[i]: int(distance[i]) for i in found}
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_ptr)
+
+    def most_linked(self, n: int = 10, notes_only: bool = False) -> list[tuple[str, int]]:
+        """The n nodes with the most backlinks."""
+        degree = self.in_degree()
+        if notes_only:
+            degree = degree[:self.note_count]
+        top = np.argsort(-degree, kind='stable')[:n]
+        return [(self.names[i], int(degree[i])) for i in top if degree[i] > 0]
+
+    def unresolved(self) -> list[tuple[str, int]]:
+        """Link targets without a note, most linked first."""
+        degree = self.in_degree()
+        nodes = sorted(self._unresolved.values(), key=lambda i: -degree[i])
+        return [(self.names[i], int(degree[i])) for i in nodes]
+
+    def people_centrality(self, n: int = 10) -> dict:
+        """
+        How often the most linked people are linked, per month.
+
+        People are link targets that look like names (see
+        obsidian_reader.looks_like_name); a month counts each note that
+        links to the person and was last modified in that month.
+
+        Returns:
+            dict: {'months': ['YYYY-MM', ...], 'people': {name: [links per month]}}
+        """
+        people = np.array(
+            [i for i in range(self.size) if looks_like_name(self.names[i])], dtype=np.int64)
+        if not len(people):
+            return {'months': [], 'people': {}}
+        degree = self.in_degree()
+        people = people[np.argsort(-degree[people], kind='stable')[:n]]
+        people = people[degree[people] > 0]
+        if not len(people):
+            return {'months': [], 'people': {}}
+
+        lengths = self.in_ptr[people + 1] - self.in_ptr[people]
+        targets = np.repeat(np.arange(len(people)), lengths)
+        sources = _expand(self.in_ptr, self.in_idx, people)
+        months = self.modified[sources].astype('datetime64[s]').astype('datetime64[M]')
+
+        labels, month_index = np.unique(months, return_inverse=True)
+        counts = np.zeros((len(people), len(labels)), dtype=np.int64)
+        np.add.at(counts, (targets, month_index), 1)
+        return {
+            'months': [str(m) for m in labels],
+            'people': {self.names[p]: row.tolist() for p, row in zip(people, counts)},
+        }
+
+    def related(self, seed_paths: list[str], n: int = 5) -> list[tuple[str, int]]:
+        """
+        Notes most connected to a set of seed notes (e.g. the recent ones).
+
+        Candidates are notes linking to or linked from any seed, ranked by
+        how many seeds they connect to, then by their total backlinks.
+
+        Returns:
+            list: (vault-relative path, number of seeds connected) pairs
+        """
+        index = {p: i for i, p in enumerate(self.paths)}
+        seeds = np.array([index[p] for p in seed_paths if p in index], dtype=np.int64)
+        if not len(seeds) or n <= 0:
+            return []
+
+        reached = np.concatenate([
+            np.unique(np.concatenate([
+                self.out_idx[self.out_ptr[s]:self.out_ptr[s + 1]],
+                self.in_idx[self.in_ptr[s]:self.in_ptr[s + 1]],
+            ]))
+            for s in seeds
+        ])
+        reached = reached[reached < self.note_count]
+        seed_hits = np.bincount(reached, minlength=self.note_count)
+        seed_hits[seeds] = 0
+        candidates = np.flatnonzero(seed_hits)
+        if not len(candidates):
+            return []
+        order = np.lexsort((-self.in_degree()[candidates], -seed_hits[candidates]))[:n]
+        return [(self.paths[i], int(seed_hits[i])) for i in candidates[order]]
+
+
+def load_graph(vault_path: str | None = None) -> NoteGraph:
+    """Update the scan manifest and build the active profile's note graph."""
+    with span('note_graph'):
+        return NoteGraph(update_manifest(vault_path))
+
+
+def related_notes(notes: list, n: int) -> list[dict]:
+    """
+    The n notes most linked with `notes`, for extra prompt context.
+
+    Returns:
+        list: {'note': Note (content prefix only), 'linked_from': seeds connected} dicts
+    """
+    from obsidian_reader import Note, read_note
+
+    root = Path(current_profile().vault_path)
+    graph = load_graph(str(root))
+    seeds = []
+    for note in notes:
+        try:
+            seeds.append(Path(note.path).relative_to(root).as_posix())
+        except ValueError:
+            continue
+
+    related = []
+    for path, linked_from in graph.related(seeds, n):
+        file_path = root / path
+        try:
+            metadata, content, complete = read_note(file_path)
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            continue
+        note = Note(
+            str(file_path),
+            file_path.name,
+            'journal' if path.startswith('_Journal/') else 'notes',
+            int(file_path.stat().st_mtime),
+            frontmatter=metadata,
+            **({'content': content} if complete else {'prefix': content}),
+        )
+        related.append({'note': note, 'linked_from': linked_from})
+    return related
+
+
+if __name__ == '__main__':
+    graph = load_graph()
+    print(f"{graph.note_count} notes, {graph.size - graph.note_count} unresolved targets, {graph.edge_count()} links")
+    print(f"Most linked: {graph.most_linked(10)}")
+    print(f"Unresolved: {graph.unresolved()[:10]}")
+    centrality = graph.people_centrality(5)
+    for name, series in centrality['people'].items():
+        print(f"  {name}: {dict(zip(centrality['months'], series))}")
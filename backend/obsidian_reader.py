@@ -1,33 +1,301 @@
 """Read and parse notes from an Obsidian vault."""
 
+import bisect
+import codecs
 import os
 import re
+import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Generator
-import frontmatter
+from types import MappingProxyType
+from typing import Any, Generator, Mapping
 
-from config import OBSIDIAN_VAULT_PATH, DAYS_TO_LOOK_BACK
+from config import DAYS_TO_LOOK_BACK, NOTE_HEADER_BYTES, NOTE_READ_BYTES, PROMPT_RELATED_NOTES
+from instrumentation import count, span
+from profiles import current_profile
+from vault_manifest import WIKILINK
 
+# yaml, numpy (classifier, mood_tracker) are imported where they're
+# used so that quick commands don't pay for them at startup
 
-def get_journal_entries(days: int = DAYS_TO_LOOK_BACK) -> list[dict]:
+# Shared by every note without frontmatter
+EMPTY_FRONTMATTER: Mapping[str, Any] = MappingProxyType({})
+
+# Same YAML delimiter as python-frontmatter, so both parse notes identically
+FM_BOUNDARY = re.compile(r'^-{3,}\s*$', re.MULTILINE)
+
+
+def _yaml_loader():
+    import yaml
+
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def parse_note(data: bytes, complete: bool = True) -> tuple[dict, str] | None:
+    """
+    Split a note's bytes into YAML frontmatter and content.
+
+    Gives the same result as frontmatter.loads(), parsing the YAML with
+    the C loader when libyaml is available.
+
+    Args:
+        data: The whole file, or its first bytes
+        complete: False if `data` is only a prefix of the file, in which
+            case the content returned is a prefix too
+
+    Returns:
+        tuple: (metadata, content), or None if `data` is a prefix that
+        doesn't hold all of the frontmatter (the caller should read the
+        whole file instead)
+    """
+    if complete:
+        text = data.decode('utf-8').strip()
+    else:
+        # Holds back a multi-byte character cut off at the end of the prefix
+        text = codecs.getincrementaldecoder('utf-8')().decode(data, final=False).lstrip()
+
+    if not complete and '\n' not in text:
+        return None  # Can't tell yet whether the first line opens frontmatter
+    if text.startswith(('{', '+++')):
+        if not complete:
+            return None
+        # JSON / TOML frontmatter is rare enough to leave to python-frontmatter
+        import frontmatter
+
+        post = frontmatter.loads(text)
+        return post.metadata, post.content
+    if not FM_BOUNDARY.match(text):
+        return {}, text
+
+    parts = FM_BOUNDARY.split(text, 2)
+    if len(parts) < 3:
+        return ({}, text) if complete else None
+
+    import yaml
+
+    metadata = yaml.load(parts[1], Loader=_yaml_loader())
+    content = parts[2].strip() if complete else parts[2].lstrip()
+    return (metadata if isinstance(metadata, dict) else {}), content
+
+
+def read_note(path: str | Path, limit: int | None = NOTE_READ_BYTES) -> tuple[dict, str, bool]:
+    """
+    Read a note's frontmatter and (the start of) its content.
+
+    Only the first `limit` bytes are read, unless the frontmatter runs
+    past them.
+
+    Returns:
+        tuple: (metadata, content, complete), where complete is False if
+        content is only a prefix of the note's content
+    """
+    with open(path, 'rb') as f:
+        data = f.read() if limit is None else f.read(limit + 1)
+    count('bytes_read', len(data))
+
+    complete = limit is None or len(data) <= limit
+    parsed = parse_note(data if complete else data[:limit], complete)
+    if parsed is None:
+        return read_note(path, None)
+    count('files_parsed')
+    return parsed[0], parsed[1], complete
+
+
+class Note:
+    """
+    One note from the vault.
+
+    A slotted record rather than a dict: timestamps are stored as epoch
+    seconds and repeated strings (source, category, tags) are interned.
+    Content may be absent or only a prefix (see read_note), in which case
+    the whole note is read from disk the first time .content is used;
+    preview() answers from the prefix when it is long enough. Enrichment
+    fields (category, tags, people) start as None and are filled in by
+    summarize_notes.
+    """
+
+    __slots__ = (
+        'path', 'filename', 'source', 'modified', 'entry_date', 'frontmatter', '_content', '_prefix',
+        'category', 'category_scores', 'extracted_tags', 'extracted_people',
+    )
+
+    def __init__(
+        self,
+        path: str,
+        filename: str,
+        source: str,
+        modified: int,
+        frontmatter: Mapping[str, Any] | None = None,
+        content: str | None = None,
+        entry_date: int | None = None,
+        prefix: str | None = None,
+    ):
+        self.path = path
+        self.filename = filename
+        self.source = sys.intern(source)
+        self.modified = modified
+        self.entry_date = modified if entry_date is None else entry_date
+        self.frontmatter = frontmatter or EMPTY_FRONTMATTER
+        self._content = content
+        self._prefix = None if content is not None else prefix
+        self.category: str | None = None
+        self.category_scores: dict[str, float] | None = None
+        self.extracted_tags: list[str] | None = None
+        self.extracted_people: list[str] | None = None
+
+    @property
+    def content(self) -> str:
+        """Note body without frontmatter, read from disk on first use if it wasn't read in full."""
+        if self._content is None:
+            self._content = read_note(self.path, None)[1]
+            self._prefix = None
+        return self._content
+
+    @property
+    def head(self) -> str:
+        """
+        The content as first read: all of it, or its first NOTE_READ_BYTES.
+
+        Enough for tagging, people, classification and mood, and only
+        goes to disk if nothing was read yet (unlike .content, which reads
+        the rest of a long note).
+        """
+        if self._content is None and self._prefix is None:
+            return self.content
+        return self._content if self._content is not None else self._prefix
+
+    def preview(self, chars: int) -> str:
+        """The first `chars` characters of the content, without reading the whole note if possible."""
+        if self._content is None and self._prefix is not None and len(self._prefix) >= chars:
+            return self._prefix[:chars]
+        return self.content[:chars]
+
+    @property
+    def is_journal(self) -> bool:
+        return self.source == 'journal'
+
+    @property
+    def is_area(self) -> bool:
+        return self.source == 'area'
+
+    @property
+    def modified_iso(self) -> str:
+        return datetime.fromtimestamp(self.modified).isoformat()
+
+    @property
+    def entry_date_iso(self) -> str:
+        return datetime.fromtimestamp(self.entry_date).isoformat()
+
+    def to_dict(self) -> dict:
+        """Plain dict for stage artifacts (see Note.from_dict)."""
+        data = {
+            'path': self.path,
+            'filename': self.filename,
+            'source': self.source,
+            'modified': self.modified,
+            'entry_date': self.entry_date,
+            'frontmatter': dict(self.frontmatter),
+        }
+        if self._content is not None:
+            data['content'] = self._content
+        elif self._prefix is not None:
+            data['prefix'] = self._prefix
+        if self.category_scores is not None:
+            data.update(
+                category=self.category,
+                category_scores=self.category_scores,
+                extracted_tags=self.extracted_tags,
+                extracted_people=self.extracted_people,
+            )
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Note':
+        note = cls(
+            data['path'],
+            data['filename'],
+            data['source'],
+            data['modified'],
+            frontmatter=data.get('frontmatter'),
+            content=data.get('content'),
+            entry_date=data.get('entry_date'),
+            prefix=data.get('prefix'),
+        )
+        if 'category_scores' in data:
+            note.set_enrichment(
+                data['category'],
+                data['category_scores'],
+                data['extracted_tags'],
+                data['extracted_people'],
+            )
+        return note
+
+    def set_enrichment(
+        self,
+        category: str | None,
+        category_scores: dict[str, float],
+        tags: list[str],
+        people: list[str],
+    ) -> None:
+        self.category = sys.intern(category) if category else None
+        self.category_scores = category_scores
+        self.extracted_tags = [sys.intern(tag) for tag in tags]
+        self.extracted_people = people
+
+    def __repr__(self) -> str:
+        return f"Note({self.filename!r}, source={self.source!r}, category={self.category!r})"
+
+
+def notes_to_dicts(notes: list[Note]) -> list[dict]:
+    return [note.to_dict() for note in notes]
+
+
+def notes_from_dicts(data: list[dict]) -> list[Note]:
+    return [Note.from_dict(item) for item in data]
+
+
+def _content_args(content: str, complete: bool) -> dict:
+    return {'content': content} if complete else {'prefix': content}
+
+
+def get_journal_entries(days: int = DAYS_TO_LOOK_BACK, restat: bool = False) -> list[Note]:
     """
     Get recent journal entries from the _Journal folder.
     These are prioritized for mood/thought tracking.
+
+    Candidates come from the date-sorted journal index in the scan
+    manifest (see vault_manifest.journal_index): entries dated inside the
+    window plus older or undated ones last seen modified inside it. Only
+    those are stat-ed and read; restat=True re-checks every journal's
+    mtime first, so an edit to an old entry is picked up.
     """
-    vault_path = Path(OBSIDIAN_VAULT_PATH)
+    from vault_manifest import journal_index
+
+    vault_path = Path(current_profile().vault_path)
     journal_path = vault_path / "_Journal"
 
-    if not journal_path.exists():
+    index = journal_index(str(vault_path), restat=restat)
+    if index is None:
         print(f"Warning: Journal folder not found at {journal_path}")
         return []
 
     entries = []
     cutoff_date = datetime.now() - timedelta(days=days)
+    cutoff_ns = int(cutoff_date.timestamp()) * 1_000_000_000
 
-    for file in journal_path.glob("*.md"):
+    files, dated = index['files'], index['dated']
+    first = bisect.bisect_left(files, [cutoff_date.strftime('%Y-%m-%d')], 0, dated)
+    candidates = files[first:dated] + [
+        row for row in files[:first] + files[dated:] if row[2] >= cutoff_ns
+    ]
+
+    for _, name, _ in candidates:
+        file = journal_path / name
         try:
-            mod_time = datetime.fromtimestamp(file.stat().st_mtime)
+            stat = file.stat()
+            count('files_stated')
+            mod_time = datetime.fromtimestamp(int(stat.st_mtime))
 
             # Parse filename as date (YYYY-MM-DD.md format)
             date_match = re.match(r'(\d{4}-\d{2}-\d{2})\.md', file.name)
@@ -44,36 +312,35 @@ def get_journal_entries(days: int = DAYS_TO_LOOK_BACK) -> list[dict]:
             if mod_time < cutoff_date and (entry_date is None or entry_date < cutoff_date):
                 continue
 
-            note = frontmatter.load(file)
-
-            entries.append({
-                'path': str(file),
-                'filename': file.name,
-                'content': note.content,
-                'frontmatter': dict(note.metadata),
-                'modified': mod_time.isoformat(),
-                'entry_date': entry_date.isoformat() if entry_date else mod_time.isoformat(),
-                'is_journal': True,
-                'source': 'journal',
-            })
+            metadata, content, complete = read_note(file)
+
+            entries.append(Note(
+                str(file),
+                file.name,
+                'journal',
+                int(stat.st_mtime),
+                frontmatter=metadata,
+                **_content_args(content, complete),
+                entry_date=int(entry_date.timestamp()),
+            ))
         except Exception as e:
             print(f"Error reading journal {file}: {e}")
             continue
 
     # Sort by entry date, most recent first
-    entries.sort(key=lambda x: x['entry_date'], reverse=True)
+    entries.sort(key=lambda x: x.entry_date, reverse=True)
     return entries
 
 
-def get_recent_notes(days: int = DAYS_TO_LOOK_BACK) -> Generator[dict, None, None]:
+def get_recent_notes(days: int = DAYS_TO_LOOK_BACK) -> Generator[Note, None, None]:
     """
     Scan the Obsidian vault for notes modified in the last N days.
     Excludes _Journal folder (handled separately).
 
     Yields:
-        dict: Note data including path, content, frontmatter, and modification time
+        Note: path, content, frontmatter, and modification time
     """
-    vault_path = Path(OBSIDIAN_VAULT_PATH)
+    vault_path = Path(current_profile().vault_path)
 
     if not vault_path.exists():
         print(f"Warning: Obsidian vault not found at {vault_path}")
@@ -93,35 +360,39 @@ def get_recent_notes(days: int = DAYS_TO_LOOK_BACK) -> Generator[dict, None, Non
             file_path = Path(root) / file
 
             # Check modification time
-            mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
+            stat = file_path.stat()
+            count('files_stated')
+            mod_time = datetime.fromtimestamp(stat.st_mtime)
             if mod_time < cutoff_date:
                 continue
 
             try:
                 # Parse the note
-                note = frontmatter.load(file_path)
-
-                yield {
-                    'path': str(file_path),
-                    'filename': file,
-                    'content': note.content,
-                    'frontmatter': dict(note.metadata),
-                    'modified': mod_time.isoformat(),
-                    'is_journal': False,
-                    'source': 'notes',
-                }
+                metadata, content, complete = read_note(file_path)
+
+                yield Note(
+                    str(file_path),
+                    file,
+                    'notes',
+                    int(stat.st_mtime),
+                    frontmatter=metadata,
+                    **_content_args(content, complete),
+                )
             except Exception as e:
                 print(f"Error reading {file_path}: {e}")
                 continue
 
 
-def get_all_notes_for_initial_scan() -> list[dict]:
+def get_all_notes_for_initial_scan() -> list[Note]:
     """
     Get ALL notes in the vault for initial data extraction.
     Used for the one-time comprehensive scan.
     Returns notes sorted by modification time (most recent first).
+
+    Only each note's frontmatter is read; content is read from disk when
+    a note's .content is first used.
     """
-    vault_path = Path(OBSIDIAN_VAULT_PATH)
+    vault_path = Path(current_profile().vault_path)
 
     if not vault_path.exists():
         print(f"Warning: Obsidian vault not found at {vault_path}")
@@ -140,38 +411,36 @@ def get_all_notes_for_initial_scan() -> list[dict]:
             file_path = Path(root) / file
 
             try:
-                mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                note = frontmatter.load(file_path)
+                stat = file_path.stat()
+                count('files_stated')
+                metadata, _, _ = read_note(file_path, NOTE_HEADER_BYTES)
 
                 # Determine source
                 is_journal = '_Journal' in str(file_path)
                 is_area = '_Areas' in str(file_path)
 
-                all_notes.append({
-                    'path': str(file_path),
-                    'filename': file,
-                    'content': note.content,
-                    'frontmatter': dict(note.metadata),
-                    'modified': mod_time.isoformat(),
-                    'is_journal': is_journal,
-                    'is_area': is_area,
-                    'source': 'journal' if is_journal else ('area' if is_area else 'notes'),
-                })
+                all_notes.append(Note(
+                    str(file_path),
+                    file,
+                    'journal' if is_journal else ('area' if is_area else 'notes'),
+                    int(stat.st_mtime),
+                    frontmatter=metadata,
+                ))
             except Exception as e:
                 print(f"Error reading {file_path}: {e}")
                 continue
 
     # Sort by modification time, most recent first
-    all_notes.sort(key=lambda x: x['modified'], reverse=True)
+    all_notes.sort(key=lambda x: x.modified, reverse=True)
     return all_notes
 
 
-def extract_tags(note: dict) -> list[str]:
+def extract_tags(note: Note) -> list[str]:
     """Extract tags from a note (from frontmatter and inline tags)."""
     tags = []
 
     # From frontmatter
-    fm = note.get('frontmatter', {})
+    fm = note.frontmatter
     if 'tags' in fm:
         fm_tags = fm['tags']
         if isinstance(fm_tags, list):
@@ -179,162 +448,150 @@ def extract_tags(note: dict) -> list[str]:
         elif isinstance(fm_tags, str):
             tags.append(fm_tags)
 
-    # From content (inline tags like #tag)
-    content = note.get('content', '')
+    # From content (inline tags like #tag), as far as it was read
+    content = note.head
     inline_tags = re.findall(r'#(\w+)', content)
     tags.extend(inline_tags)
 
     return list(set(tag.lower() for tag in tags))
 
 
+def looks_like_name(link: str) -> bool:
+    """Simple heuristic: 1-3 words, all with capitalized first letters."""
+    words = link.split()
+    return 1 <= len(words) <= 3 and all(w[0].isupper() for w in words if w)
+
+
+@lru_cache(maxsize=16)
+def _people_matcher(people: tuple, ignore: tuple) -> tuple[re.Pattern | None, dict[str, str], frozenset]:
+    """(pattern matching any known name, lowercase name -> canonical name, lowercase ignored names)."""
+    canonical = {}
+    for name, aliases in people:
+        for alias in (name, *aliases):
+            canonical[alias.lower()] = name
+    # Longest first, so "Sam O'Neill" wins over a shorter name it starts with
+    names = sorted({alias for name, aliases in people for alias in (name, *aliases)}, key=len, reverse=True)
+    pattern = re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\b') if names else None
+    return pattern, canonical, frozenset(i.lower() for i in ignore)
+
+
+def people_matcher(profile=None) -> tuple[re.Pattern | None, dict[str, str], frozenset]:
+    """The profile's (default: active) people and aliases, compiled (see _people_matcher)."""
+    profile = profile or current_profile()
+    return _people_matcher(
+        tuple((name, tuple(aliases)) for name, aliases in profile.people.items()),
+        tuple(profile.people_ignore),
+    )
+
+
 def extract_people(content: str) -> list[str]:
     """
     Extract people mentions from note content.
-    Looks for patterns like @Name or [[Name]] (Obsidian links).
-    Also looks for common name patterns in Sam's notes.
+
+    Looks for @Name, [[Name]] links that look like names, and the active
+    profile's known people (profile.people) by name or alias. Aliases
+    resolve to the canonical name, so "Ulka" and "Ula" count as one
+    person; names in profile.people_ignore are dropped.
     """
-    people = []
+    pattern, canonical, ignore = people_matcher()
+    people = set()
+
+    def add(name: str) -> None:
+        key = name.lower()
+        if key not in ignore:
+            people.add(canonical.get(key, name))
 
     # @mentions
-    at_mentions = re.findall(r'@(\w+)', content)
-    people.extend(at_mentions)
+    for mention in re.findall(r'@(\w+)', content):
+        add(mention)
 
     # [[Wikilinks]] that look like names (capitalized, not too long)
-    wikilinks = re.findall(r'\[\[([^\]]+)\]\]', content)
-    for link in wikilinks:
-        # Simple heuristic: if it's 1-3 words, all capitalized first letters, it might be a name
-        words = link.split()
-        if 1 <= len(words) <= 3 and all(w[0].isupper() for w in words if w):
-            people.append(link)
-
-    # Known people patterns from Sam's notes
-    known_patterns = [
-        r'\b(Ula|Ulka)\b',
-        r'\b(Damien|Eamon|Marco|James|Micheal|Tom|Kay|Ruth|Killian|Jayden)\b',
-        r'\b(Sam O\'Neill)\b',
-    ]
-    for pattern in known_patterns:
-        matches = re.findall(pattern, content)
-        people.extend(matches)
+    for match in WIKILINK.finditer(content):
+        link = match.group(1).strip()
+        if link and (link.lower() in canonical or looks_like_name(link)):
+            add(link)
+
+    # Known people by name or alias
+    if pattern is not None:
+        for name in pattern.findall(content):
+            add(name)
 
-    return list(set(people))
+    return sorted(people)
 
 
-def categorize_note(note: dict) -> str | None:
+def categorize_note(note: Note) -> str | None:
     """
     Determine which quadrant a note belongs to based on content keywords.
     Uses a smarter content-based approach since Sam doesn't use explicit tags.
     Returns the quadrant key or None if uncategorized.
-    """
-    content = note.get('content', '').lower()
-    filename = note.get('filename', '').lower()
-
-    # Keyword-based categorization
-    quadrant_keywords = {
-        'work': [
-            'startup', 'maupka', 'ignite', 'company', 'business', 'pilot',
-            'customers', 'product', 'building', 'coding', 'enterprise',
-            'funding', 'grant', 'revenue', 'marketing', 'sales', 'investor',
-            'tyndall', 'research', 'argyou', 'edtech', 'teacher', 'student'
-        ],
-        'parkour': [
-            'parkour', 'training', 'vaults', 'kong', 'handspring', 'movement',
-            'exercise', 'workout', 'calisthenics', 'fitness', 'dive roll',
-            'turn vault', 'helicoptero', 'planche', 'pullup', 'pistol squat'
-        ],
-        'relationships': [
-            'ula', 'ulka', 'friends', 'family', 'social', 'lunch with',
-            'meeting with', 'talked to', 'couple', 'relationship'
-        ],
-        'travel': [
-            'japan', 'japanese', 'tokyo', 'mext', 'travel', 'trip',
-            'abroad', 'language learning', 'n2', 'n3', 'anki', 'japanese language'
-        ],
-    }
 
-    scores = {key: 0 for key in quadrant_keywords}
+    For more than one note, classify them together with
+    QuadrantClassifier.classify, which vectorizes the whole batch at once.
+    The classifier itself is built once per timeline (see build_classifier).
+    """
+    from classifier import build_classifier
 
-    for quadrant, keywords in quadrant_keywords.items():
-        for keyword in keywords:
-            if keyword in content or keyword in filename:
-                scores[quadrant] += 1
+    category, _ = build_classifier().classify([note])[0]
+    return category
 
-    # Return quadrant with highest score if above threshold
-    max_quadrant = max(scores, key=scores.get)
-    if scores[max_quadrant] >= 2:
-        return max_quadrant
 
-    return None
+def collect_notes(restat: bool = False) -> tuple[list[Note], list[Note]]:
+    """
+    Read recent journal entries and other recent notes from the vault.
 
+    Args:
+        restat: Re-check every journal's mtime (see get_journal_entries)
 
-def analyze_mood_from_journal(content: str) -> dict:
-    """
-    Extract mood indicators from journal content.
-    Returns mood analysis dict.
+    Returns:
+        tuple: (journal entries, other notes)
     """
-    content_lower = content.lower()
+    # Get journal entries first (high priority)
+    with span('journals'):
+        journal_entries = get_journal_entries(restat=restat)
 
-    # Positive indicators
-    positive_words = [
-        'excited', 'great', 'amazing', 'happy', 'good', 'fantastic',
-        'love', 'awesome', 'wonderful', 'progress', 'success', 'achieved',
-        'fun', 'enjoying', 'productive'
-    ]
+    # Get other recent notes
+    with span('recent_notes'):
+        other_notes = list(get_recent_notes())
 
-    # Negative/stress indicators
-    stress_words = [
-        'worried', 'stressed', 'anxious', 'overwhelmed', 'tired',
-        'frustrated', 'stuck', 'difficult', 'hard', 'problem',
-        'behind', 'overdoing', 'burned', 'struggle'
-    ]
+    return journal_entries, other_notes
 
-    # Balance indicators
-    balance_words = [
-        'balance', 'rest', 'chill', 'relax', 'break', 'free time',
-        'living', 'enjoying life'
-    ]
 
-    positive_count = sum(1 for word in positive_words if word in content_lower)
-    stress_count = sum(1 for word in stress_words if word in content_lower)
-    balance_count = sum(1 for word in balance_words if word in content_lower)
+def get_notes_summary(restat: bool = False) -> dict:
+    """
+    Get a summary of recent notes for analysis.
+    Combines journal entries and other notes, prioritizing journals.
 
-    # Calculate mood score (-1 to 1)
-    total = positive_count + stress_count + 1  # +1 to avoid division by zero
-    mood_score = (positive_count - stress_count) / total
+    Args:
+        restat: Re-check every journal's mtime (see get_journal_entries)
 
-    if mood_score > 0.3:
-        mood = 'energized'
-    elif mood_score < -0.3:
-        mood = 'stressed'
-    else:
-        mood = 'balanced'
-
-    return {
-        'mood': mood,
-        'mood_score': round(mood_score, 2),
-        'positive_signals': positive_count,
-        'stress_signals': stress_count,
-        'balance_signals': balance_count,
-    }
+    Returns:
+        dict: Summary including all notes text, categorized notes, and metadata
+    """
+    return summarize_notes(*collect_notes(restat))
 
 
-def get_notes_summary() -> dict:
+def summarize_notes(journal_entries: list[Note], other_notes: list[Note]) -> dict:
     """
-    Get a summary of recent notes for analysis.
-    Combines journal entries and other notes, prioritizing journals.
+    Enrich collected notes (categories, tags, people, mood) into a summary.
+
+    The same Note objects are referenced from 'notes' and 'by_category'.
+    'people_summary' is who the whole vault mentions lately (see
+    people_index.summarize_people). With PROMPT_RELATED_NOTES set, 'related_notes' adds the notes most
+    linked with these ones (see note_graph.related_notes).
 
     Returns:
         dict: Summary including all notes text, categorized notes, and metadata
     """
-    # Get journal entries first (high priority)
-    journal_entries = get_journal_entries()
-
-    # Get other recent notes
-    other_notes = list(get_recent_notes())
+    from classifier import build_classifier
+    from mood_tracker import analyze_mood_from_journal, get_mood_timeseries_summary
+    from people_index import summarize_people
 
     # Combine with journals first
     all_notes = journal_entries + other_notes
 
+    # Precomputed from the scan manifest, not from these notes' text
+    people_summary = summarize_people()
+
     if not all_notes:
         return {
             'total_notes': 0,
@@ -343,59 +600,117 @@ def get_notes_summary() -> dict:
             'notes': [],
             'by_category': {},
             'all_people': [],
+            'people_summary': people_summary,
             'all_tags': [],
             'mood_analysis': None,
+            'mood_trend': get_mood_timeseries_summary(),
         }
 
     all_people = []
     all_tags = []
-    by_category = {'relationships': [], 'parkour': [], 'work': [], 'travel': [], 'uncategorized': []}
+    by_category = {q: [] for q in current_profile().quadrant_keywords}
+    by_category['uncategorized'] = []
 
     # Analyze mood from recent journals
     mood_analysis = None
     if journal_entries:
-        combined_journal_content = '\n'.join(j['content'] for j in journal_entries[:5])
+        combined_journal_content = '\n'.join(j.head for j in journal_entries[:5])
         mood_analysis = analyze_mood_from_journal(combined_journal_content)
 
-    for note in all_notes:
-        tags = extract_tags(note)
-        people = extract_people(note['content'])
-        category = categorize_note(note)
+    # Longer-term mood signal from every journal (cached per entry)
+    with span('mood_timeseries'):
+        mood_trend = get_mood_timeseries_summary()
 
-        note['extracted_tags'] = tags
-        note['extracted_people'] = people
-        note['category'] = category
+    # Classify every note in one batch
+    with span('classify', notes=len(all_notes)):
+        classifications = build_classifier().classify(all_notes)
 
-        all_tags.extend(tags)
-        all_people.extend(people)
+    # Tags, people and categories per note
+    with span('enrich'):
+        for note, (category, category_scores) in zip(all_notes, classifications):
+            tags = extract_tags(note)
+            people = extract_people(note.head)
+            note.set_enrichment(category, category_scores, tags, people)
 
-        if category:
-            by_category[category].append(note)
-        else:
-            by_category['uncategorized'].append(note)
+            all_tags.extend(tags)
+            all_people.extend(people)
 
-    return {
+            if category:
+                by_category[category].append(note)
+            else:
+                by_category['uncategorized'].append(note)
+
+    summary = {
         'total_notes': len(all_notes),
         'journal_entries': len(journal_entries),
         'other_notes': len(other_notes),
         'notes': all_notes,
         'by_category': by_category,
         'all_people': list(set(all_people)),
+        'people_summary': people_summary,
         'all_tags': list(set(all_tags)),
         'mood_analysis': mood_analysis,
+        'mood_trend': mood_trend,
+    }
+
+    if PROMPT_RELATED_NOTES:
+        from note_graph import related_notes
+        summary['related_notes'] = related_notes(all_notes, PROMPT_RELATED_NOTES)
+
+    return summary
+
+
+def summary_to_dict(summary: dict) -> dict:
+    """
+    Notes summary as plain data for the enrich artifact.
+
+    by_category is stored as indexes into 'notes', so each note is
+    written once.
+    """
+    index = {id(note): i for i, note in enumerate(summary['notes'])}
+    data = {
+        **summary,
+        'notes': notes_to_dicts(summary['notes']),
+        'by_category': {
+            category: [index[id(note)] for note in notes]
+            for category, notes in summary['by_category'].items()
+        },
+    }
+    if 'related_notes' in summary:
+        data['related_notes'] = [{**r, 'note': r['note'].to_dict()} for r in summary['related_notes']]
+    return data
+
+
+def summary_from_dict(data: dict) -> dict:
+    """Inverse of summary_to_dict."""
+    notes = notes_from_dicts(data['notes'])
+    summary = {
+        **data,
+        'notes': notes,
+        'by_category': {
+            category: [notes[i] for i in indexes]
+            for category, indexes in data['by_category'].items()
+        },
     }
+    if 'related_notes' in data:
+        summary['related_notes'] = [{**r, 'note': Note.from_dict(r['note'])} for r in data['related_notes']]
+    return summary
 
 
 if __name__ == '__main__':
     # Test the reader
-    print(f"Scanning vault at: {OBSIDIAN_VAULT_PATH}")
+    print(f"Scanning vault at: {current_profile().vault_path}")
     summary = get_notes_summary()
     print(f"Found {summary['total_notes']} recent notes")
     print(f"  - Journal entries: {summary['journal_entries']}")
     print(f"  - Other notes: {summary['other_notes']}")
     print(f"People mentioned: {summary['all_people']}")
+    if summary['people_summary']:
+        print(f"Seen lately: {[p['name'] for p in summary['people_summary']['recent']]}")
     print(f"Tags found: {summary['all_tags']}")
     if summary['mood_analysis']:
         print(f"Mood analysis: {summary['mood_analysis']}")
+    if summary['mood_trend']:
+        print(f"Mood trend: {summary['mood_trend']}")
     for category, notes in summary['by_category'].items():
         print(f"  {category}: {len(notes)} notes")
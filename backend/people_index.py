@@ -0,0 +1,237 @@
+"""
+Index of the people mentioned in the vault.
+
+The scan manifest (see vault_manifest.py) keeps the people each note
+mentions, already resolved through the profile's aliases, and only
+re-reads the notes that changed, so the index is rebuilt from it without
+reading any note. A note counts as one mention of everyone in it, on its
+journal date (_Journal/YYYY-MM-DD.md) or otherwise the day it was last
+modified.
+
+Mentions are kept as parallel (person, day, note) arrays, so per-day
+counts and last-seen dates are a bincount or two, and co-occurrence an
+np.unique over the pairs of people that share a note.
+summarize_people() boils the index down to the compact "who you've seen
+lately" summary used by the prompt and the quadrants' people lists.
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+
+from config import PEOPLE_DRIFTING_DAYS, PEOPLE_MIN_MENTIONS, PEOPLE_RECENT_DAYS, PEOPLE_SUMMARY_SIZE
+from instrumentation import span
+from profiles import current_profile
+from vault_manifest import JOURNAL_DIR, JOURNAL_NAME, update_manifest
+
+EPOCH = date(1970, 1, 1)
+
+
+def note_day(path: str, mtime_ns: int) -> int:
+    """Days since 1970-01-01 a note is dated: its journal date, else its mtime."""
+    directory, _, name = path.rpartition('/')
+    match = JOURNAL_NAME.fullmatch(name) if directory == JOURNAL_DIR else None
+    if match:
+        try:
+            return (date.fromisoformat(match.group(1)) - EPOCH).days
+        except ValueError:
+            pass
+    return (datetime.fromtimestamp(mtime_ns / 1e9).date() - EPOCH).days
+
+
+def _iso(day: int) -> str | None:
+    return date.fromordinal(EPOCH.toordinal() + int(day)).isoformat() if day >= 0 else None
+
+
+class PeopleIndex:
+    """
+    Mentions of people across the vault.
+
+    People are numbered 0..len(names)-1 in name order; mentions are
+    stored note by note, so one note's mentions are contiguous.
+    """
+
+    def __init__(self, manifest: dict):
+        entries = sorted((path, entry) for path, entry in manifest['notes'].items() if entry.get('people'))
+        self.names = sorted({name for _, entry in entries for name in entry['people']})
+        self._codes = codes = {name: i for i, name in enumerate(self.names)}
+
+        person, day, note = [], [], []
+        for n, (path, entry) in enumerate(entries):
+            d = note_day(path, entry['mtime'])
+            for name in entry['people']:
+                person.append(codes[name])
+                day.append(d)
+                note.append(n)
+        self.person = np.array(person, dtype=np.int32)
+        self.day = np.array(day, dtype=np.int32)
+        self.note = np.array(note, dtype=np.int32)
+
+        size = len(self.names)
+        self.mentions = np.bincount(self.person, minlength=size)
+        self.last_seen = np.full(size, -1, dtype=np.int32)
+        np.maximum.at(self.last_seen, self.person, self.day)
+        self.pairs, self.pair_counts = self._cooccurrence()
+
+    def _cooccurrence(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse count of notes mentioning two different people.
+
+        A dense people x people matrix runs to hundreds of MB with a few
+        thousand name-like links, so only pairs that occur are kept.
+
+        Returns:
+            (pair codes person * len(names) + other, sorted; note counts)
+        """
+        size = len(self.names)
+        if not len(self.note):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # Pair every mention with every mention of the same note
+        starts = np.flatnonzero(np.r_[True, self.note[1:] != self.note[:-1]])
+        lengths = np.diff(np.r_[starts, len(self.note)])
+        group_start = np.repeat(starts, lengths)
+        group_length = np.repeat(lengths, lengths)
+        left = np.repeat(self.person, group_length)
+        offsets = np.repeat(group_start - np.cumsum(group_length) + group_length, group_length) + np.arange(group_length.sum())
+        right = self.person[offsets]
+        pairs = left != right
+        return np.unique(left[pairs].astype(np.int64) * size + right[pairs], return_counts=True)
+
+    def code(self, name: str) -> int | None:
+        return self._codes.get(name)
+
+    def daily(self, name: str) -> dict[str, int]:
+        """Mentions per day of one person: {ISO date: notes}."""
+        code = self.code(name)
+        if code is None:
+            return {}
+        days, counts = np.unique(self.day[self.person == code], return_counts=True)
+        return {_iso(d): int(c) for d, c in zip(days, counts)}
+
+    def mentions_since(self, day: int) -> np.ndarray:
+        """Mentions per person on or after a day number."""
+        return np.bincount(self.person[self.day >= day], minlength=len(self.names))
+
+    def seen_with(self, name: str, n: int = 3) -> list[str]:
+        """The n people most often mentioned in the same notes as `name`."""
+        code = self.code(name)
+        if code is None:
+            return []
+        size = len(self.names)
+        lo, hi = np.searchsorted(self.pairs, [code * size, (code + 1) * size])
+        others, counts = self.pairs[lo:hi] % size, self.pair_counts[lo:hi]
+        top = others[np.lexsort((others, -counts))][:n]
+        return [self.names[i] for i in top]
+
+    def summary(
+        self,
+        today: date | None = None,
+        known: set[str] | frozenset = frozenset(),
+        recent_days: int = PEOPLE_RECENT_DAYS,
+        drifting_days: int = PEOPLE_DRIFTING_DAYS,
+        min_mentions: int = PEOPLE_MIN_MENTIONS,
+        size: int = PEOPLE_SUMMARY_SIZE,
+    ) -> dict:
+        """
+        Who was mentioned lately, and who often but not lately.
+
+        Only `known` people and people mentioned in at least min_mentions
+        notes are listed, which keeps one-off @mentions and name-like
+        links out.
+
+        Returns:
+            dict: {'asOf', 'windowDays', 'tracked', 'recent': [{'name',
+            'mentions' (in the window), 'total', 'lastSeen', 'daysSince',
+            'seenWith'}], 'drifting': [{'name', 'total', 'lastSeen',
+            'daysSince'}]}
+        """
+        today_day = ((today or date.today()) - EPOCH).days
+        eligible = self.mentions >= min_mentions
+        for name in known:
+            code = self.code(name)
+            if code is not None:
+                eligible[code] = True
+
+        recent = self.mentions_since(today_day - recent_days + 1)
+        candidates = np.flatnonzero(eligible & (recent > 0))
+        order = candidates[np.lexsort((-self.last_seen[candidates], -recent[candidates]))][:size]
+        since = today_day - self.last_seen
+
+        drifting = np.flatnonzero(eligible & (since >= drifting_days))
+        drifting = drifting[np.lexsort((since[drifting], -self.mentions[drifting]))][:size]
+
+        return {
+            'asOf': _iso(today_day),
+            'windowDays': recent_days,
+            'tracked': int(eligible.sum()),
+            'recent': [
+                {
+                    'name': self.names[i],
+                    'mentions': int(recent[i]),
+                    'total': int(self.mentions[i]),
+                    'lastSeen': _iso(self.last_seen[i]),
+                    'daysSince': int(since[i]),
+                    'seenWith': self.seen_with(self.names[i], 2),
+                }
+                for i in order
+            ],
+            'drifting': [
+                {
+                    'name': self.names[i],
+                    'total': int(self.mentions[i]),
+                    'lastSeen': _iso(self.last_seen[i]),
+                    'daysSince': int(since[i]),
+                }
+                for i in drifting
+            ],
+        }
+
+
+def load_people_index(vault_path: str | None = None) -> PeopleIndex:
+    """Update the scan manifest and build the active profile's people index."""
+    with span('people_index'):
+        return PeopleIndex(update_manifest(vault_path))
+
+
+def summarize_people(today: date | None = None) -> dict | None:
+    """The active profile's people summary (see PeopleIndex.summary), None without a vault."""
+    profile = current_profile()
+    if not profile.vault_path:
+        return None
+    return load_people_index(profile.vault_path).summary(today, known=set(profile.people))
+
+
+def update_quadrant_people(quadrants: dict, summary: dict) -> None:
+    """
+    Refresh the 'people' list of every quadrant that has one from a people summary.
+
+    Recently mentioned people are listed first with their mentions in the
+    summary's window; people already listed keep their place after them
+    (and their connectionQuality, which only the site edits).
+    """
+    recent = {p['name']: p for p in summary.get('recent', [])}
+    drifting = {p['name']: p for p in summary.get('drifting', [])}
+    for quadrant in quadrants.values():
+        if 'people' not in quadrant:
+            continue
+        existing = {p.get('name'): p for p in quadrant['people']}
+        people = []
+        for name in [*recent, *(n for n in existing if n not in recent)]:
+            entry = dict(existing.get(name) or {'name': name})
+            seen = recent.get(name) or drifting.get(name)
+            entry['mentionCount'] = recent[name]['mentions'] if name in recent else 0
+            if seen:
+                entry['lastMentioned'] = seen['lastSeen']
+            people.append(entry)
+        quadrant['people'] = people
+
+
+if __name__ == '__main__':
+    index = load_people_index()
+    print(f"{len(index.names)} people in {len(np.unique(index.note))} notes, {len(index.person)} mentions")
+    summary = index.summary(known=set(current_profile().people))
+    for person in summary['recent']:
+        print(f"  {person['name']}: {person['mentions']} in {summary['windowDays']} days, "
+              f"last {person['lastSeen']}, with {', '.join(person['seenWith']) or 'nobody'}")
+    for person in summary['drifting']:
+        print(f"  (drifting) {person['name']}: last {person['lastSeen']}, {person['total']} notes")
@@ -0,0 +1,172 @@
+"""
+Staged processing with persisted artifacts.
+
+The run is split into gather -> enrich -> prompt -> analyze -> apply. Each
+stage's output is saved under the profile's cache/pipeline directory, keyed by a hash of its
+inputs, so a failed or interrupted run resumes from the last good stage
+and stages whose inputs haven't changed are skipped.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import serialization
+from instrumentation import count, span
+from profiles import current_profile
+
+# Bump when a stage's output format or logic changes to invalidate old artifacts
+PIPELINE_VERSION = 2
+
+STAGES = ['gather', 'enrich', 'prompt', 'analyze', 'apply']
+
+ARTIFACT_DIR = 'pipeline'
+ARTIFACT_MAX_AGE_DAYS = 7
+
+
+def stage_key(*parts: Any) -> str:
+    """Stable short hash of a stage's inputs."""
+    payload = json.dumps([PIPELINE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def artifact_dir() -> Path:
+    """Artifact directory in the active profile's cache."""
+    return current_profile().cache_dir / ARTIFACT_DIR
+
+
+def artifact_path(stage: str, key: str) -> Path:
+    return artifact_dir() / f'{stage}-{key}.json'
+
+
+def load_artifact(stage: str, key: str) -> Any:
+    """A stage's saved output, or None if there isn't one."""
+    path = artifact_path(stage, key)
+    if not path.exists():
+        return None
+    try:
+        return serialization.loads(path.read_bytes())
+    except Exception as e:
+        print(f"  Ignoring unreadable artifact {path.name}: {e}")
+        return None
+
+
+def save_artifact(stage: str, key: str, data: Any) -> None:
+    """Persist a stage's output (written atomically)."""
+    path = artifact_path(stage, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(serialization.dumps(data, compact=True))
+    tmp_path.replace(path)
+
+
+def prune_artifacts(max_age_days: int = ARTIFACT_MAX_AGE_DAYS) -> int:
+    """Delete artifacts older than max_age_days. Returns how many were removed."""
+    directory = artifact_dir()
+    if not directory.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in directory.glob('*.json'):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def run_stage(
+    stage: str,
+    key: str,
+    compute: Callable[[], Any],
+    force: bool = False,
+    encode: Callable[[Any], Any] | None = None,
+    decode: Callable[[Any], Any] | None = None,
+    reusable: Callable[[Any], bool] | None = None,
+    save: bool = True,
+) -> Any:
+    """
+    Return the saved output for (stage, key), or compute and save it.
+
+    A compute function signals failure by returning None, which is not
+    saved, so the stage runs again next time. encode/decode convert a
+    result that isn't plain data (e.g. Note objects) to and from what
+    is saved. reusable can reject a saved result that depends on state
+    outside the key; save=False (dry runs) computes without writing.
+    """
+    if not force:
+        cached = load_artifact(stage, key)
+        if cached is not None:
+            result = decode(cached) if decode else cached
+            if reusable is None or reusable(result):
+                count('stages_skipped')
+                with span(stage, cached=True):
+                    print(f"  [{stage}] unchanged, reusing saved result")
+                return result
+            print(f"  [{stage}] saved result no longer applies, running again")
+
+    with span(stage):
+        result = compute()
+    if result is not None and save:
+        save_artifact(stage, key, encode(result) if encode else result)
+    return result
+
+
+def vault_fingerprint(vault_path: str) -> str:
+    """
+    Hash of every markdown file's path, size and mtime in the vault.
+
+    Much cheaper than parsing the notes and changes whenever any note is
+    added, removed or edited. The journals' mtimes are handed to the
+    journal index on the way (see vault_manifest.record_journal_stats).
+    """
+    from vault_manifest import JOURNAL_DIR, record_journal_stats
+
+    digest = hashlib.sha256()
+    root = Path(vault_path)
+    if not root.exists():
+        return 'missing'
+
+    journal_dir = str(root / JOURNAL_DIR)
+    journal = None
+    stack = [root]
+    entries = []
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                in_journal = directory == journal_dir
+                if in_journal:
+                    journal = {}
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        stat = entry.stat()
+                        entries.append(f"{entry.path}\0{stat.st_size}\0{stat.st_mtime_ns}")
+                        if in_journal:
+                            journal[entry.name] = stat.st_mtime_ns
+        except OSError:
+            continue
+
+    if journal is not None:
+        record_journal_stats(vault_path, journal)
+
+    for line in sorted(entries):
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    count('files_stated', len(entries))
+    return digest.hexdigest()
+
+
+def forced_stages(fresh: bool, from_stage: str | None) -> set[str]:
+    """Stages that must run even if a saved result exists."""
+    if fresh:
+        return set(STAGES)
+    if from_stage:
+        return set(STAGES[STAGES.index(from_stage):])
+    return set()
@@ -0,0 +1,126 @@
+"""
+Profiles: per-person vault, data directory, values, quadrants and persona.
+
+Everything that used to be a module-global setting in config.py is read
+from the active profile, so several people can be processed in one
+process. Without a profiles file, the single default profile is built
+from config.py exactly as before.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from config import (
+    project_root,
+    OBSIDIAN_VAULT_PATH,
+    DATA_DIR,
+    GITHUB_TOKEN,
+    GITHUB_USERNAME,
+    YOUR_VALUES,
+    QUADRANTS,
+    QUADRANT_KEYWORDS,
+    PEOPLE,
+    PEOPLE_IGNORE,
+    PROFILES_FILE,
+)
+
+
+@dataclass
+class Profile:
+    """One person's settings."""
+
+    name: str
+    vault_path: str
+    data_dir: Path
+    github_username: str
+    github_token: str = ''
+    person_name: str = 'Sam'
+    values: list[str] = field(default_factory=lambda: list(YOUR_VALUES))
+    quadrants: dict = field(default_factory=lambda: dict(QUADRANTS))
+    quadrant_keywords: dict[str, list[str]] = field(default_factory=lambda: dict(QUADRANT_KEYWORDS))
+    people: dict[str, list[str]] = field(default_factory=lambda: dict(PEOPLE))  # name -> aliases
+    people_ignore: list[str] = field(default_factory=lambda: list(PEOPLE_IGNORE))
+    persona: str | None = None  # "About <name>" prompt section; None uses the built-in one
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.data_dir / 'cache'
+
+    @property
+    def log_dir(self) -> Path:
+        return self.data_dir / 'logs'
+
+    @property
+    def snapshot_dir(self) -> Path:
+        return self.data_dir / 'snapshots'
+
+
+DEFAULT_PROFILE = Profile(
+    name='default',
+    vault_path=OBSIDIAN_VAULT_PATH,
+    data_dir=DATA_DIR,
+    github_username=GITHUB_USERNAME,
+    github_token=GITHUB_TOKEN,
+)
+
+_active_profile: ContextVar[Profile] = ContextVar('active_profile', default=DEFAULT_PROFILE)
+
+
+def current_profile() -> Profile:
+    """The profile the current run (thread / task) is processing."""
+    return _active_profile.get()
+
+
+@contextmanager
+def use_profile(profile: Profile):
+    """Make `profile` the active profile for the duration of the block."""
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def profile_from_dict(data: dict) -> Profile:
+    """
+    Build a profile from a profiles-file entry.
+
+    Relative data_dir paths are resolved against the project root. A
+    'github_token_env' key names the environment variable holding that
+    profile's GitHub token, so tokens stay out of the profiles file.
+    """
+    data = dict(data)
+    data_dir = Path(data.pop('data_dir', f"data/profiles/{data['name']}"))
+    if not data_dir.is_absolute():
+        data_dir = project_root / data_dir
+
+    token_env = data.pop('github_token_env', None)
+    if token_env:
+        data['github_token'] = os.getenv(token_env, '')
+
+    persona_file = data.pop('persona_file', None)
+    if persona_file:
+        data['persona'] = (project_root / persona_file).read_text(encoding='utf-8')
+
+    data.setdefault('vault_path', '')
+    data.setdefault('github_username', '')
+    return Profile(data_dir=data_dir, **data)
+
+
+def load_profiles(path: Path | None = None) -> list[Profile]:
+    """
+    Load profiles from the profiles file (a JSON list of profile objects).
+
+    Returns:
+        list: The configured profiles, or just the default profile if the
+        file doesn't exist
+    """
+    import serialization
+
+    path = Path(path or PROFILES_FILE)
+    if not path.exists():
+        return [DEFAULT_PROFILE]
+    return [profile_from_dict(entry) for entry in serialization.loads(path.read_bytes())]
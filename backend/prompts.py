@@ -1,6 +1,7 @@
-"""Prompts for Claude analysis - personalized for Sam's life."""
+"""Prompts for Claude analysis - personalized per profile (Sam's by default)."""
 
-from config import YOUR_VALUES, QUADRANTS
+from analysis_schema import ANALYSIS_TOOL_NAME
+from profiles import current_profile
 
 ANALYSIS_SYSTEM_PROMPT = """You are a supportive life companion AI helping Sam Dunning analyze his life patterns and progress. You know him well through his notes.
 
@@ -36,6 +37,28 @@ Sam has noted he sometimes overdoes work. Watch for signals like:
 Be warm, celebrate wins, gently notice drift, never guilt-trip. Remember: he wants a life companion, not a productivity slave driver.
 """
 
+# Used for profiles that bring their own persona instead of the built-in one above
+PROFILE_SYSTEM_PROMPT = """You are a supportive life companion AI helping {name} analyze their life patterns and progress. You know them well through their notes.
+
+## About {name}:
+{persona}
+
+## Your role:
+1. Analyze content and extract meaningful moments for each life quadrant
+2. Identify patterns, achievements, and areas needing attention
+3. Provide supportive feedback (like a wise friend, not a productivity app)
+4. Be concise - {name} doesn't want to be overwhelmed
+5. Bias towards recent content (more relevant)
+
+## {name}'s core values:
+{values}
+
+## The life quadrants:
+{quadrants}
+
+Be warm, celebrate wins, gently notice drift, never guilt-trip. Remember: {name} wants a life companion, not a productivity slave driver.
+"""
+
 ANALYSIS_USER_PROMPT = """Please analyze the following data from the past {days} days and provide a structured JSON response.
 
 ## Recent Journal Entries (prioritize these for mood/thoughts):
@@ -53,17 +76,20 @@ ANALYSIS_USER_PROMPT = """Please analyze the following data from the past {days}
 ## Current Quadrant Status:
 {current_quadrants}
 
+## People (from the whole vault):
+{people}
+
 ## Mood Analysis from Journals:
 {mood_analysis}
 
 ---
 
-Please respond with a JSON object containing:
+Please respond by calling the {tool} tool with an object containing:
 
 1. "timeline_entries": Array of new timeline entries (max 5-7, focus on significant moments):
-   - id: unique string (use format "tl-{timestamp}-{index}")
+   - id: unique string (use format "tl-{{timestamp}}-{{index}}")
    - date: ISO date string
-   - category: one of "relationships", "parkour", "work", "travel"
+   - category: one of {categories}
    - title: short descriptive title (max 50 chars)
    - content: 1-2 sentence description (concise!)
    - significance: "minor", "notable", or "major"
@@ -80,7 +106,7 @@ Please respond with a JSON object containing:
    - valuesAlignment: object with score (0-100), livingWell array (max 3), needsAttention array (max 2), note
    - actionables: array of 2-4 suggestions with id, text, priority, effort, impact, quadrant
    - celebration: highlight one win (even small ones count!)
-   - friendlyNote: warm, supportive message (max 2 sentences, use Sam's own words/values)
+   - friendlyNote: warm, supportive message (max 2 sentences, use {name}'s own words/values)
    - balanceCheck: object with mood, recommendation (if overworking detected)
 
 4. "extracted_goals": Array of goals mentioned (max 5 near, 5 far):
@@ -98,20 +124,44 @@ Please respond with a JSON object containing:
    - content: the insight/quote/link
    - source: where it came from (note title)
 
-Remember: Be CONCISE. Sam doesn't want to be overwhelmed. Quality over quantity. Bias towards recent content.
+Remember: Be CONCISE. {name} doesn't want to be overwhelmed. Quality over quantity. Bias towards recent content.
 
-Respond ONLY with valid JSON, no explanation text.
+Respond ONLY with the {tool} tool call, no explanation text.
 """
 
 
 def get_system_prompt() -> str:
-    """Get the system prompt with values and quadrants filled in."""
-    values_str = "\n".join(f"- {v}" for v in YOUR_VALUES)
+    """Get the active profile's system prompt with values and quadrants filled in."""
+    profile = current_profile()
+    values_str = "\n".join(f"- {v}" for v in profile.values)
     quadrants_str = "\n".join(
         f"- {q['name']}: {', '.join(q['tags'])}"
-        for q in QUADRANTS.values()
+        for q in profile.quadrants.values()
+    )
+    if profile.persona is None:
+        return ANALYSIS_SYSTEM_PROMPT.format(values=values_str, quadrants=quadrants_str)
+    return PROFILE_SYSTEM_PROMPT.format(
+        name=profile.person_name,
+        persona=profile.persona.strip(),
+        values=values_str,
+        quadrants=quadrants_str,
     )
-    return ANALYSIS_SYSTEM_PROMPT.format(values=values_str, quadrants=quadrants_str)
+
+
+def format_people_summary(summary: dict | None) -> str:
+    """A people summary (see people_index.PeopleIndex.summary) as a few prompt lines."""
+    if not summary or not (summary['recent'] or summary['drifting']):
+        return "No people mentioned."
+    lines = []
+    for person in summary['recent']:
+        line = f"- {person['name']}: {person['mentions']} notes in the last {summary['windowDays']} days, last {person['lastSeen']}"
+        if person['seenWith']:
+            line += f" (often with {', '.join(person['seenWith'])})"
+        lines.append(line)
+    if summary['drifting']:
+        lines.append("Not mentioned for a while: " + ', '.join(
+            f"{p['name']} (last {p['lastSeen']}, {p['total']} notes)" for p in summary['drifting']))
+    return '\n'.join(lines)
 
 
 def get_user_prompt(
@@ -119,30 +169,43 @@ def get_user_prompt(
     github_summary: dict,
     manual_entries: list,
     current_quadrants: dict,
-    days: int = 14
+    days: int = 14,
+    max_notes: int = 25,
+    preview_chars: int = 800,
 ) -> str:
-    """Build the user prompt with all the data."""
+    """
+    Build the user prompt with all the data.
+
+    max_notes and preview_chars bound how much note content is included,
+    so the analyzer can shrink the prompt to fit a token budget.
+    """
 
     # Separate journal entries from other notes
     journal_text = ""
     notes_text = ""
 
-    for note in notes_summary.get('notes', [])[:25]:  # Limit to 25 most recent
-        is_journal = note.get('is_journal', False) or note.get('source') == 'journal'
-
-        entry_text = f"\n### {note['filename']} ({note.get('entry_date', note['modified'])})\n"
-        entry_text += f"Category: {note.get('category', 'uncategorized')}\n"
+    for note in notes_summary.get('notes', [])[:max_notes]:  # Most recent first
+        entry_text = f"\n### {note.filename} ({note.entry_date_iso})\n"
+        entry_text += f"Category: {note.category or 'uncategorized'}\n"
         # Truncate content to avoid overwhelming
-        content_preview = note['content'][:800] if len(note['content']) > 800 else note['content']
+        content_preview = note.preview(preview_chars)
         entry_text += f"Content:\n{content_preview}\n"
 
-        if is_journal:
+        if note.is_journal:
             journal_text += entry_text
         else:
             notes_text += entry_text
 
     if not journal_text:
         journal_text = "No recent journal entries found."
+    related = notes_summary.get('related_notes')
+    if related:
+        notes_text += "\n### Related notes (most linked with the notes above)\n"
+        for item in related:
+            note = item['note']
+            notes_text += f"\n#### {note.filename} (linked with {item['linked_from']} recent notes)\n"
+            notes_text += f"{note.preview(preview_chars // 2)}\n"
+
     if not notes_text:
         notes_text = "No recent notes found."
 
@@ -152,6 +215,12 @@ Commits: {github_summary.get('commits', 0)}
 Active repos: {', '.join(github_summary.get('repos', []))}
 Current streak: {github_summary.get('streak', 0)} days
 Recent commit messages: {', '.join(github_summary.get('recent_messages', [])[:5])}
+"""
+    if 'longest_streak' in github_summary:
+        github_text += f"""Longest streak this year: {github_summary['longest_streak']} days
+Private contributions: {github_summary.get('private_contributions', 0)}
+Weekly contributions (oldest first): {', '.join(str(w['contributions']) for w in github_summary.get('weekly_totals', []))}
+Commits per repo: {', '.join(f"{r['repo']} {r['commits']}" for r in github_summary.get('repo_breakdown', [])[:5])}
 """
 
     # Format manual entries
@@ -180,12 +249,28 @@ Stress signals: {mood.get('stress_signals', 0)}
 Balance mentions: {mood.get('balance_signals', 0)}
 """
 
+    trend = notes_summary.get('mood_trend')
+    if trend:
+        mood_text += f"""
+Longer-term mood ({trend['entries_tracked']} journal entries tracked):
+7-day average: {trend.get('avg_7d')}, 30-day average: {trend.get('avg_30d')}
+Trend: {trend.get('trend', 'unknown')} ({trend.get('trend_per_week')} per week)
+Unusual days: {', '.join(f"{a['date']} ({a['score']})" for a in trend.get('anomalies', [])) or 'none'}
+"""
+
+    people_text = format_people_summary(notes_summary.get('people_summary'))
+
+    profile = current_profile()
     return ANALYSIS_USER_PROMPT.format(
+        name=profile.person_name,
+        tool=ANALYSIS_TOOL_NAME,
+        categories=', '.join(f'"{key}"' for key in profile.quadrants),
         days=days,
         journal_entries=journal_text,
         notes=notes_text,
         github=github_text,
         manual_entries=manual_text,
         current_quadrants=quadrants_text,
+        people=people_text,
         mood_analysis=mood_text,
     )
@@ -0,0 +1,314 @@
+"""
+Append-only, columnar history of quadrant status and metrics.
+
+quadrants.json and right_now.json only hold the latest state, so every
+apply stage also appends one row per run and per quadrant here:
+
+    history/
+        dictionary.json              quadrant, status and metric names -> codes
+        runs/<column>.bin            one row per run: time, alignment score, mood
+        quadrants/<column>.bin       one row per run and quadrant: status, pulse, last activity
+        metrics/<column>.bin         one row per run, quadrant and numeric metric
+
+Each column is a raw little-endian array appended to in place and read
+back with one np.fromfile, so recording a run writes a few bytes per
+column and queries are vectorized over whole columns. Strings are
+dictionary-encoded. If a run was interrupted halfway through an append,
+the rows that weren't written to every column are dropped.
+
+export_history() precomputes the series the site shows into
+quadrant_history.json.
+"""
+
+import math
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+import serialization
+from config import HISTORY_EXPORT_RUNS
+from instrumentation import count
+from profiles import current_profile
+
+HISTORY_DIR = 'history'
+DICTIONARY_FILE = 'dictionary.json'
+EXPORT_FILE = 'quadrant_history.json'
+
+EPOCH = date(1970, 1, 1)
+
+TABLES = {
+    'runs': {
+        'time': '<i8',           # epoch seconds
+        'alignment': '<f4',      # right_now.valuesAlignment.score, NaN if missing
+        'mood_7d': '<f4',        # 7-day mood average, NaN if unknown
+        'mood_30d': '<f4',
+    },
+    'quadrants': {
+        'run': '<i4',            # row in runs
+        'quadrant': '<u2',       # dictionary code
+        'status': '<u2',         # dictionary code
+        'pulse': '<i1',          # activityPulse: 1, 0, or -1 if missing
+        'last_activity': '<i4',  # days since 1970-01-01, -1 if missing
+    },
+    'metrics': {
+        'run': '<i4',
+        'quadrant': '<u2',
+        'metric': '<u2',
+        'value': '<f8',
+    },
+}
+
+
+def history_dir() -> Path:
+    return current_profile().data_dir / HISTORY_DIR
+
+
+def _column_path(table: str, column: str) -> Path:
+    return history_dir() / table / f'{column}.bin'
+
+
+def read_table(table: str) -> dict[str, np.ndarray]:
+    """Every column of a table, cut to the rows complete in all columns."""
+    columns = {}
+    for column, dtype in TABLES[table].items():
+        path = _column_path(table, column)
+        columns[column] = np.fromfile(path, dtype=dtype) if path.exists() else np.empty(0, dtype=dtype)
+    rows = min(len(values) for values in columns.values())
+    return {column: values[:rows] for column, values in columns.items()}
+
+
+def append_rows(table: str, rows: dict[str, np.ndarray]) -> int:
+    """
+    Append rows to every column of a table.
+
+    Returns:
+        int: Index of the first appended row
+    """
+    start = len(next(iter(read_table(table).values())))
+    for column, dtype in TABLES[table].items():
+        path = _column_path(table, column)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') as f:
+            # Drop a partial row left by an interrupted append
+            f.truncate(start * np.dtype(dtype).itemsize)
+            f.write(np.asarray(rows[column], dtype=dtype).tobytes())
+    count('history_rows_written', len(next(iter(rows.values()))))
+    return start
+
+
+class Dictionary:
+    """Append-only string <-> code mapping per field."""
+
+    def __init__(self):
+        path = history_dir() / DICTIONARY_FILE
+        self.values: dict[str, list[str]] = serialization.loads(path.read_bytes()) if path.exists() else {}
+        self.changed = False
+
+    def code(self, field: str, value: str) -> int:
+        values = self.values.setdefault(field, [])
+        try:
+            return values.index(value)
+        except ValueError:
+            values.append(value)
+            self.changed = True
+            return len(values) - 1
+
+    def lookup(self, field: str, value: str) -> int | None:
+        values = self.values.get(field, [])
+        return values.index(value) if value in values else None
+
+    def names(self, field: str) -> list[str]:
+        return self.values.get(field, [])
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+        path = history_dir() / DICTIONARY_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(serialization.dumps(self.values))
+        tmp_path.replace(path)
+        self.changed = False
+
+
+def _day_number(value) -> int:
+    try:
+        return (date.fromisoformat(str(value)[:10]) - EPOCH).days
+    except ValueError:
+        return -1
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def record_run(quadrants: dict, right_now: dict, mood_trend: dict | None = None, when: datetime | None = None) -> int:
+    """
+    Append the state after one run.
+
+    Args:
+        quadrants: The updated quadrants (as written to quadrants.json)
+        right_now: The right_now snapshot
+        mood_trend: The notes summary's mood trend, if any
+        when: Time of the run (default: now)
+
+    Returns:
+        int: The run's row number
+    """
+    dictionary = Dictionary()
+    mood_trend = mood_trend or {}
+    run = append_rows('runs', {
+        'time': [int((when or datetime.now()).timestamp())],
+        'alignment': [_number(right_now.get('valuesAlignment', {}).get('score'))],
+        'mood_7d': [_number(mood_trend.get('avg_7d'))],
+        'mood_30d': [_number(mood_trend.get('avg_30d'))],
+    })
+
+    quadrant_rows = {column: [] for column in TABLES['quadrants']}
+    metric_rows = {column: [] for column in TABLES['metrics']}
+    for key, quadrant in quadrants.items():
+        code = dictionary.code('quadrant', key)
+        pulse = quadrant.get('activityPulse')
+        quadrant_rows['run'].append(run)
+        quadrant_rows['quadrant'].append(code)
+        quadrant_rows['status'].append(dictionary.code('status', quadrant.get('status') or 'unknown'))
+        quadrant_rows['pulse'].append(-1 if pulse is None else int(bool(pulse)))
+        quadrant_rows['last_activity'].append(_day_number(quadrant.get('lastActivity')))
+
+        for name, value in (quadrant.get('metrics') or {}).items():
+            value = _number(value)
+            if math.isnan(value):
+                continue
+            metric_rows['run'].append(run)
+            metric_rows['quadrant'].append(code)
+            metric_rows['metric'].append(dictionary.code('metric', name))
+            metric_rows['value'].append(value)
+
+    # Codes must be saved before rows that use them
+    dictionary.save()
+    if quadrant_rows['run']:
+        append_rows('quadrants', quadrant_rows)
+    if metric_rows['run']:
+        append_rows('metrics', metric_rows)
+    return run
+
+
+def load_history() -> dict:
+    """All three tables plus the dictionary: {'runs', 'quadrants', 'metrics', 'dictionary'}."""
+    runs = read_table('runs')
+    quadrants = read_table('quadrants')
+    metrics = read_table('metrics')
+    # Rows of a run whose own row was lost (interrupted first append)
+    run_count = len(runs['time'])
+    quadrants = {c: v[quadrants['run'] < run_count] for c, v in quadrants.items()}
+    metrics = {c: v[metrics['run'] < run_count] for c, v in metrics.items()}
+    return {'runs': runs, 'quadrants': quadrants, 'metrics': metrics, 'dictionary': Dictionary()}
+
+
+def status_matrix(history: dict) -> np.ndarray:
+    """Status codes as a (runs x quadrants) matrix, -1 where a quadrant wasn't recorded."""
+    q = history['quadrants']
+    matrix = np.full((len(history['runs']['time']), len(history['dictionary'].names('quadrant'))), -1, dtype=np.int32)
+    matrix[q['run'], q['quadrant']] = q['status']
+    return matrix
+
+
+def metric_matrix(history: dict, metric: str) -> np.ndarray:
+    """One metric as a (runs x quadrants) matrix, NaN where it wasn't reported."""
+    m = history['metrics']
+    matrix = np.full((len(history['runs']['time']), len(history['dictionary'].names('quadrant'))), np.nan)
+    code = history['dictionary'].lookup('metric', metric)
+    if code is not None:
+        mask = m['metric'] == code
+        matrix[m['run'][mask], m['quadrant'][mask]] = m['value'][mask]
+    return matrix
+
+
+def last_time_with_status(history: dict, status: str) -> dict[str, int | None]:
+    """Epoch seconds of the last run each quadrant had `status`, None if never."""
+    q = history['quadrants']
+    quadrants = history['dictionary'].names('quadrant')
+    code = history['dictionary'].lookup('status', status)
+    last = np.full(len(quadrants), -1, dtype=np.int64)
+    if code is not None:
+        mask = q['status'] == code
+        np.maximum.at(last, q['quadrant'][mask], history['runs']['time'][q['run'][mask]])
+    return {name: (int(t) if t >= 0 else None) for name, t in zip(quadrants, last)}
+
+
+def days_since_status(history: dict, status: str = 'thriving', now: datetime | None = None) -> dict[str, int | None]:
+    """Whole days since each quadrant last had `status` (0 if it has it now), None if never."""
+    now_ts = (now or datetime.now()).timestamp()
+    return {
+        name: None if ts is None else int((now_ts - ts) // 86400)
+        for name, ts in last_time_with_status(history, status).items()
+    }
+
+
+def trend_per_run(values: np.ndarray, runs: int = 6) -> float | None:
+    """Least-squares slope over the last `runs` non-NaN values, None with fewer than 3."""
+    values = values[~np.isnan(values)][-runs:]
+    if len(values) < 3:
+        return None
+    return float(np.polyfit(np.arange(len(values), dtype=np.float64), values, 1)[0])
+
+
+def export_history(runs: int = HISTORY_EXPORT_RUNS) -> dict:
+    """
+    Write the series the site shows, for the last `runs` runs, to quadrant_history.json.
+
+    Returns:
+        dict: The exported data
+    """
+    from data_manager import write_json
+
+    history = load_history()
+    dictionary = history['dictionary']
+    times = history['runs']['time'][-runs:]
+    first = len(history['runs']['time']) - len(times)
+    statuses = status_matrix(history)[first:]
+    status_names = dictionary.names('status')
+
+    def series(values: np.ndarray) -> list:
+        return [None if np.isnan(v) else round(float(v), 3) for v in values]
+
+    since_thriving = days_since_status(history, 'thriving')
+    quadrants = {}
+    for i, key in enumerate(dictionary.names('quadrant')):
+        metrics = {}
+        for name in dictionary.names('metric'):
+            column = metric_matrix(history, name)[first:, i]
+            if not np.isnan(column).all():
+                metrics[name] = series(column)
+        quadrants[key] = {
+            'status': [status_names[s] if s >= 0 else None for s in statuses[:, i]],
+            'metrics': metrics,
+            'daysSinceThriving': since_thriving.get(key),
+        }
+
+    alignment = history['runs']['alignment'][-runs:].astype(np.float64)
+    trend = trend_per_run(alignment)
+    exported = {
+        'updatedAt': datetime.now().isoformat(),
+        'runs': [datetime.fromtimestamp(int(t)).isoformat(timespec='minutes') for t in times],
+        'alignment': series(alignment),
+        'alignmentTrendPerRun': None if trend is None else round(trend, 2),
+        'mood7d': series(history['runs']['mood_7d'][-runs:]),
+        'mood30d': series(history['runs']['mood_30d'][-runs:]),
+        'quadrants': quadrants,
+    }
+    write_json(EXPORT_FILE, exported)
+    return exported
+
+
+if __name__ == '__main__':
+    history = load_history()
+    print(f"{len(history['runs']['time'])} runs recorded")
+    print(f"Days since thriving: {days_since_status(history)}")
+    if len(history['runs']['time']):
+        first, last = history['runs']['time'][[0, -1]]
+        print(f"From {datetime.fromtimestamp(int(first)):%Y-%m-%d} to {datetime.fromtimestamp(int(last)):%Y-%m-%d}")
+        print(f"Alignment trend per run: {trend_per_run(history['runs']['alignment'].astype(np.float64))}")
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Local read-only HTTP API over the dashboard data.
+
+    python cli.py serve [--port N]       # or: python read_api.py
+
+    GET /api/timeline?category=work&from=2026-01-01&to=2026-01-31&significance=major&limit=50&offset=0
+    GET /api/goals?status=active&timeframe=near&category=work
+    GET /api/quadrants                   GET /api/quadrants/<key>
+    GET /api/right-now                   GET /api/rollups
+    GET /api/inspiration?category=people GET /api/metadata
+    GET /api/history                     (quadrant status and metric series)
+    GET /api/health
+
+The data files are parsed once (through data_manager) into a DataIndex:
+the timeline sorted by date per category, so a date range is two binary
+searches, and goals by status. The files are checked for changes at most
+every API_RELOAD_SECONDS and the index is rebuilt when one changed. The
+rebuild is an isolated read (see data_lock.read_isolated): it never waits
+for a pipeline run that is writing the files, and if one was, the
+previous index keeps being served until the next check.
+
+Every response carries an ETag of the data version; a request with a
+matching If-None-Match gets a 304 without any work, and encoded responses
+are cached per data version, so repeated queries are served from memory.
+"""
+
+import hashlib
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import serialization
+from config import (
+    API_HOST,
+    API_MAX_PAGE_SIZE,
+    API_PAGE_SIZE,
+    API_PORT,
+    API_RELOAD_SECONDS,
+    API_RESPONSE_CACHE,
+    DATA_READ_ATTEMPTS,
+)
+from data_lock import read_isolated
+from profiles import Profile, current_profile, use_profile
+
+# Files the index is built from; any change to one of them triggers a reload
+SOURCE_FILES = [
+    'quadrants.json',
+    'right_now.json',
+    'timeline/index.json',
+    'timeline.json',
+    'goals.json',
+    'inspiration.json',
+    'metadata.json',
+    'rollups.json',
+    'quadrant_history.json',
+]
+
+GOAL_TIMEFRAMES = {'nearFuture': 'near', 'farFuture': 'far'}
+
+
+class BadRequest(ValueError):
+    """A query parameter is missing or malformed (answered with a 400)."""
+
+
+def data_signature(profile: Profile) -> tuple:
+    """(file, mtime_ns, size) of every source file, None for missing ones."""
+    signature = []
+    for name in SOURCE_FILES:
+        try:
+            stat = (profile.data_dir / name).stat()
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((name, None, None))
+    return tuple(signature)
+
+
+class DataIndex:
+    """
+    Immutable, indexed snapshot of one profile's dashboard data.
+
+    Timeline entries are kept oldest first, with one (dates, positions)
+    pair per category and one for all entries, so a category and date
+    range select a contiguous slice.
+    """
+
+    def __init__(self, signature: tuple):
+        import data_manager
+
+        self.signature = signature
+        self.etag = '"' + hashlib.sha1(repr(signature).encode()).hexdigest()[:20] + '"'
+        self.loaded_at = time.time()
+
+        self.timeline = sorted(data_manager.get_timeline(), key=lambda e: (e.get('date') or '', e.get('id', '')))
+        self.timeline_by: dict[str, tuple[list[str], list[int]]] = {}
+        for position, entry in enumerate(self.timeline):
+            day = (entry.get('date') or '')[:10]
+            for key in (None, entry.get('category')):
+                dates, positions = self.timeline_by.setdefault(key, ([], []))
+                dates.append(day)
+                positions.append(position)
+
+        self.goals = []
+        for section, timeframe in GOAL_TIMEFRAMES.items():
+            for goal in data_manager.get_goals().get(section, []):
+                self.goals.append({**goal, 'timeframe': timeframe, 'status': goal_status(goal)})
+        self.goals_by_status: dict[str, list[dict]] = {}
+        for goal in self.goals:
+            self.goals_by_status.setdefault(goal['status'], []).append(goal)
+
+        self.quadrants = data_manager.get_quadrants()
+        self.right_now = data_manager.get_right_now()
+        self.rollups = data_manager.get_rollups()
+        self.inspiration = data_manager.get_inspiration()
+        self.metadata = data_manager.get_metadata()
+        self.history = data_manager.read_json('quadrant_history.json') or {}
+
+        self._responses: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def timeline_range(self, category: str | None, start: str | None, end: str | None) -> list[int]:
+        """Positions of a category's entries dated start..end (inclusive), newest first."""
+        dates, positions = self.timeline_by.get(category, ([], []))
+        lo = bisect_left(dates, start) if start else 0
+        hi = bisect_right(dates, end) if end else len(dates)
+        return positions[lo:hi][::-1]
+
+    def cached_response(self, key: str) -> bytes | None:
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+            return body
+
+    def cache_response(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._responses[key] = body
+            if len(self._responses) > API_RESPONSE_CACHE:
+                self._responses.popitem(last=False)
+
+
+def goal_status(goal: dict) -> str:
+    """'completed' or 'active'."""
+    return 'completed' if goal.get('completed') or goal.get('progress', 0) >= 100 else 'active'
+
+
+class DataStore:
+    """The current DataIndex of a profile, rebuilt when the data files change."""
+
+    def __init__(self, profile: Profile, reload_seconds: float = API_RELOAD_SECONDS):
+        self.profile = profile
+        self.reload_seconds = reload_seconds
+        self.reloads = 0
+        self._index: DataIndex | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> DataIndex:
+        """The index, reloaded first if a source file changed since the last check (and no write is under way)."""
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.reload_seconds:
+            return index
+        with self._lock:
+            # Another request may have just checked
+            if self._index is not None and time.monotonic() - self._checked_at < self.reload_seconds:
+                return self._index
+            if self._index is None or self._index.signature != data_signature(self.profile):
+                with use_profile(self.profile):
+                    # One try when there's an index to fall back on
+                    loaded = read_isolated(
+                        lambda: DataIndex(data_signature(self.profile)),
+                        attempts=1 if self._index is not None else DATA_READ_ATTEMPTS,
+                        data_dir=self.profile.data_dir,
+                    )
+                    if loaded is None and self._index is None:
+                        # Writers kept overlapping the first load; every file is still whole
+                        loaded = DataIndex(data_signature(self.profile)), None
+                if loaded is not None:
+                    self._index = loaded[0]
+                    self.reloads += 1
+            self._checked_at = time.monotonic()
+            return self._index
+
+
+def _page(params: dict, items: list) -> dict:
+    """One page of items, per the offset and limit query parameters."""
+    offset = _int_param(params, 'offset', 0)
+    limit = min(_int_param(params, 'limit', API_PAGE_SIZE), API_MAX_PAGE_SIZE)
+    return {
+        'total': len(items),
+        'offset': offset,
+        'limit': limit,
+        'nextOffset': offset + limit if offset + limit < len(items) else None,
+        'items': items[offset:offset + limit],
+    }
+
+
+def _int_param(params: dict, name: str, default: int) -> int:
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise BadRequest(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+def _date_param(params: dict, name: str) -> str | None:
+    value = params.get(name)
+    if value is not None and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', value):
+        raise BadRequest(f"{name} must be a YYYY-MM-DD date")
+    return value
+
+
+def get_timeline(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    positions = index.timeline_range(params.get('category'), _date_param(params, 'from'), _date_param(params, 'to'))
+    significance = params.get('significance')
+    if significance:
+        positions = [p for p in positions if index.timeline[p].get('significance') == significance]
+    page = _page(params, positions)
+    page['items'] = [index.timeline[p] for p in page['items']]
+    return 200, page
+
+
+def get_goals(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    status = params.get('status')
+    goals = index.goals_by_status.get(status, []) if status else index.goals
+    for key in ('timeframe', 'category'):
+        if params.get(key):
+            goals = [g for g in goals if g.get(key) == params[key]]
+    return 200, _page(params, goals)
+
+
+def get_quadrants(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    return 200, {
+        key: {k: v for k, v in quadrant.items() if k != 'recentEntries'}
+        for key, quadrant in index.quadrants.items()
+    }
+
+
+def get_quadrant(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    quadrant = index.quadrants.get(match['key'])
+    if quadrant is None:
+        return 404, {'error': f"No quadrant {match['key']!r}"}
+    return 200, quadrant
+
+
+def get_inspiration(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    items = index.inspiration
+    if params.get('category'):
+        items = [i for i in items if i.get('category') == params['category']]
+    return 200, _page(params, items)
+
+
+def get_health(index: DataIndex, match, params: dict) -> tuple[int, dict]:
+    return 200, {
+        'profile': current_profile().name,
+        'etag': index.etag.strip('"'),
+        'loadedAt': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(index.loaded_at)),
+        'timelineEntries': len(index.timeline),
+        'goals': len(index.goals),
+    }
+
+
+ROUTES = [
+    (r'/api/timeline', get_timeline),
+    (r'/api/goals', get_goals),
+    (r'/api/quadrants', get_quadrants),
+    (r'/api/quadrants/(?P<key>[^/]+)', get_quadrant),
+    (r'/api/right-now', lambda index, match, params: (200, index.right_now)),
+    (r'/api/rollups', lambda index, match, params: (200, index.rollups)),
+    (r'/api/inspiration', get_inspiration),
+    (r'/api/metadata', lambda index, match, params: (200, index.metadata)),
+    (r'/api/history', lambda index, match, params: (200, index.history)),
+    (r'/api/health', get_health),
+]
+
+
+class ReadAPIHandler(BaseHTTPRequestHandler):
+    """Answers GET requests from the server's DataStore."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, etag: str | None = None) -> None:
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        store: DataStore = self.server.store
+        index = store.current()
+        if self.headers.get('If-None-Match') == index.etag:
+            self._send(304, b'', index.etag)
+            return
+
+        target = urlsplit(self.path)
+        params = dict(parse_qsl(target.query))
+        key = f"{target.path}?{sorted(params.items())}"
+        body = index.cached_response(key)
+        if body is not None:
+            self._send(200, body, index.etag)
+            return
+
+        for pattern, handler in ROUTES:
+            match = re.fullmatch(pattern, target.path.rstrip('/') or '/')
+            if match:
+                try:
+                    with use_profile(store.profile):
+                        status, payload = handler(index, match, params)
+                except BadRequest as e:
+                    status, payload = 400, {'error': str(e)}
+                body = serialization.dumps(payload, compact=True)
+                if status == 200:
+                    index.cache_response(key, body)
+                self._send(status, body, index.etag if status == 200 else None)
+                return
+        self._send(404, serialization.dumps({'error': f'No route for {target.path}'}, compact=True))
+
+
+def make_server(
+    host: str = API_HOST,
+    port: int = API_PORT,
+    profile: Profile | None = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    A read API server for a profile (default: the active one), not yet started.
+
+    The data is loaded before this returns, so the first request is as fast
+    as the rest. Use port 0 for any free port (see server.server_address).
+    """
+    server = ThreadingHTTPServer((host, port), ReadAPIHandler)
+    server.daemon_threads = True
+    server.store = DataStore(profile or current_profile())
+    server.verbose = verbose
+    server.store.current()
+    return server
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, verbose: bool = True) -> None:
+    """Serve the active profile's data until interrupted."""
+    server = make_server(host, port, verbose=verbose)
+    index = server.store.current()
+    print(f"Serving {server.store.profile.name} ({len(index.timeline)} timeline entries) "
+          f"on http://{host}:{server.server_address[1]}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else API_PORT
+    serve(port=port)
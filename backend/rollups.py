@@ -0,0 +1,96 @@
+"""Precomputed aggregates over the timeline and GitHub activity for the dashboard."""
+
+from datetime import date, datetime
+
+ROLLUPS_VERSION = 1
+
+# Keep about a year of daily GitHub data points
+GITHUB_SERIES_LIMIT = 366
+
+
+def empty_rollups() -> dict:
+    """Rollups for an empty timeline."""
+    return {
+        'version': ROLLUPS_VERSION,
+        'updatedAt': None,
+        'entryCount': 0,
+        'byCategory': {},
+        'byWeek': {},
+        'significance': {},
+        'significanceByCategory': {},
+        'lastActivity': {},
+        'github': [],
+    }
+
+
+def week_key(iso_date: str) -> str | None:
+    """ISO week key like '2026-W03' for an ISO date string."""
+    try:
+        year, week, _ = date.fromisoformat(iso_date[:10]).isocalendar()
+    except (TypeError, ValueError):
+        return None
+    return f"{year}-W{week:02d}"
+
+
+def apply_timeline_entries(rollups: dict, entries: list) -> dict:
+    """
+    Add new timeline entries to the rollups in place.
+
+    Only call this with entries not already counted; add_timeline_entries
+    passes exactly the entries it appended.
+    """
+    by_category = rollups['byCategory']
+    by_week = rollups['byWeek']
+    significance = rollups['significance']
+    sig_by_category = rollups['significanceByCategory']
+    last_activity = rollups['lastActivity']
+
+    for entry in entries:
+        category = entry.get('category') or 'uncategorized'
+        sig = entry.get('significance') or 'minor'
+        entry_date = entry.get('date', '')[:10]
+
+        by_category[category] = by_category.get(category, 0) + 1
+        significance[sig] = significance.get(sig, 0) + 1
+
+        per_category = sig_by_category.setdefault(category, {})
+        per_category[sig] = per_category.get(sig, 0) + 1
+
+        week = week_key(entry_date)
+        if week:
+            per_week = by_week.setdefault(week, {})
+            per_week[category] = per_week.get(category, 0) + 1
+
+        if entry_date and entry_date > last_activity.get(category, ''):
+            last_activity[category] = entry_date
+
+    rollups['entryCount'] += len(entries)
+    rollups['byWeek'] = dict(sorted(by_week.items()))
+    rollups['updatedAt'] = datetime.now().isoformat()
+    return rollups
+
+
+def build_rollups(timeline: list) -> dict:
+    """Compute rollups from scratch over the whole timeline."""
+    return apply_timeline_entries(empty_rollups(), timeline)
+
+
+def apply_github_summary(rollups: dict, github_summary: dict, day: str | None = None) -> dict:
+    """
+    Record one point of the GitHub streak series in place.
+
+    Re-running on the same day replaces that day's point.
+    """
+    day = day or date.today().isoformat()
+    point = {
+        'date': day,
+        'streak': github_summary.get('streak', 0),
+        'commits': github_summary.get('commits', 0),
+    }
+
+    series = [p for p in rollups['github'] if p['date'] != day]
+    series.append(point)
+    series.sort(key=lambda p: p['date'])
+    rollups['github'] = series[-GITHUB_SERIES_LIMIT:]
+    rollups['updatedAt'] = datetime.now().isoformat()
+    return rollups
@@ -11,6 +11,17 @@ The script will:
 - Run the main processing pipeline
 - Log results to a file
 - Send a notification if configured
+
+It is safe for a run to overlap a manual main.py run (or the read API):
+writers take turns on the data directory's lock (see data_lock.py).
+
+With ANALYSIS_MODE=batch, each invocation applies any Message Batch that
+has finished and then submits a new one (unless one is still pending).
+Results land on a later invocation, so also schedule a frequent poll that
+only collects, e.g.:
+
+    0 9 1,15 * * /path/to/python /path/to/scheduled_runner.py
+    0 * * * *    /path/to/python /path/to/scheduled_runner.py --poll
 """
 
 import logging
@@ -18,34 +29,52 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-# Set up logging
-log_dir = Path(__file__).parent.parent / 'data' / 'logs'
-log_dir.mkdir(exist_ok=True)
+logger = logging.getLogger(__name__)
 
-log_file = log_dir / f'processing_{datetime.now().strftime("%Y-%m-%d_%H-%M")}.log'
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+def setup_logging() -> Path:
+    """Log to a timestamped file in data/logs and to stdout. Returns the log file."""
+    from config import LOG_DIR
 
-logger = logging.getLogger(__name__)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_DIR / f'processing_{datetime.now().strftime("%Y-%m-%d_%H-%M")}.log'
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    return log_file
 
-def run_processing():
+
+def run_processing(poll_only: bool = False):
     """Run the main processing pipeline."""
     logger.info("=" * 50)
     logger.info("Starting Life Dashboard bi-weekly processing")
     logger.info("=" * 50)
 
+    from config import ANALYSIS_MODE
+    if ANALYSIS_MODE == 'batch' or poll_only:
+        return run_batch_processing(submit=not poll_only)
+
     try:
-        # Import and run main processing
-        from main import main
-        success = main()
+        from profiles import load_profiles, DEFAULT_PROFILE
+
+        profiles = load_profiles()
+        if profiles == [DEFAULT_PROFILE]:
+            # Import and run main processing
+            from main import process_life_data
+            success = process_life_data()
+        else:
+            from batch_runner import run_batch
+            results = run_batch(profiles)
+            for result in results:
+                log = logger.info if result.success else logger.error
+                log(f"Profile {result.profile}: {'ok' if result.success else 'failed'} in {result.duration_s:.1f}s")
+            success = all(r.success for r in results)
 
         if success:
             logger.info("Processing completed successfully!")
@@ -59,30 +88,65 @@ def run_processing():
         return False
 
 
+def run_batch_processing(submit: bool = True):
+    """Apply finished analysis batches, then submit a new one if none are pending."""
+    try:
+        from batch_runner import collect_batches, submit_profiles
+        from claude_analyzer import load_pending_batches
+        from profiles import load_profiles
+
+        profiles = load_profiles()
+        results = collect_batches(profiles)
+        for result in results:
+            log = logger.info if result.success else logger.error
+            log(f"Applied batch result for {result.profile}: {'ok' if result.success else 'failed'}")
+
+        if not submit:
+            return all(r.success for r in results)
+        if load_pending_batches():
+            logger.info("Analysis batch still processing, results will be applied on a later run")
+            return all(r.success for r in results)
+
+        batch_id = submit_profiles(profiles)
+        if not batch_id:
+            logger.error("Could not submit analysis batch - check logs for details")
+            return False
+        logger.info(f"Submitted analysis batch {batch_id}, results will be applied on a later run")
+        return all(r.success for r in results)
+
+    except Exception as e:
+        logger.exception(f"Critical error during batch processing: {e}")
+        return False
+
+
 def check_last_run():
     """Check when the last successful run was."""
-    metadata_file = Path(__file__).parent.parent / 'data' / 'metadata.json'
-
-    if metadata_file.exists():
-        import json
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-            last_run = metadata.get('lastProcessed')
-            if last_run:
-                logger.info(f"Last successful run: {last_run}")
-                return last_run
+    # Goes through data_manager so the file is parsed once and reused by the run
+    from data_manager import get_metadata
+
+    last_run = get_metadata().get('lastProcessed')
+    if last_run:
+        logger.info(f"Last successful run: {last_run}")
+        return last_run
     return None
 
 
 def main():
     """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scheduled Life Dashboard processing')
+    parser.add_argument('--poll', action='store_true', help='Only apply finished analysis batches')
+    args = parser.parse_args()
+
+    log_file = setup_logging()
     logger.info(f"Script started at {datetime.now().isoformat()}")
 
     # Check last run
     last_run = check_last_run()
 
     # Run processing
-    success = run_processing()
+    success = run_processing(poll_only=args.poll)
 
     # Summary
     if success:
@@ -0,0 +1,43 @@
+"""JSON serialization backend: orjson when available, stdlib json otherwise."""
+
+import json
+from typing import Any
+
+from config import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if JSON_BACKEND == 'orjson' and orjson is None:
+    print("Warning: LIFE_DASHBOARD_JSON=orjson but orjson is not installed, using json")
+
+USE_ORJSON = orjson is not None and JSON_BACKEND != 'json'
+BACKEND = 'orjson' if USE_ORJSON else 'json'
+
+if USE_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any, compact: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes.
+
+    Pretty output is indented by 2 spaces; compact output has no whitespace.
+    Non-ASCII characters are written as-is in both modes. Values JSON can't
+    represent (e.g. dates parsed from YAML frontmatter) are written as str().
+    """
+    if USE_ORJSON:
+        options = _ORJSON_OPTIONS if compact else _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=options, default=str)
+    if compact:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
@@ -0,0 +1,325 @@
+"""
+Content-addressed snapshots of the data directory.
+
+Each snapshot is a manifest of every data file's SHA-256, size and mtime;
+file contents are stored once per distinct hash under objects/, optionally
+zstd-compressed, so a run that changes two files stores two objects. Files
+whose size and mtime match the previous snapshot aren't even re-hashed.
+
+    snapshots/
+        objects/ab/cdef0123...       (or ...zst when compressed)
+        manifests/20260119T093000123-1a2b3c4d.json
+
+Diffs between snapshots compare manifests only, without reading any file
+contents; restore writes objects back (after snapshotting the current state,
+so a restore can itself be undone). The git commit in main.py is an
+optional exporter on top of this.
+"""
+
+import difflib
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+
+import serialization
+from config import SNAPSHOT_COMPRESSION, SNAPSHOT_KEEP
+from data_lock import data_lock
+from instrumentation import count
+from profiles import current_profile
+
+MANIFEST_VERSION = 1
+
+# Directories of the data dir that are never snapshotted ('profiles' holds
+# other profiles' data dirs, which have snapshots of their own)
+EXCLUDED_DIRS = {'cache', 'logs', 'snapshots', 'profiles'}
+
+# Latest snapshot exported as a git commit (see main.git_commit_and_push)
+GIT_EXPORTED_FILE = 'git_exported'
+
+ZSTD_SUFFIX = '.zst'
+ZSTD_LEVEL = 10
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def compression_enabled() -> bool:
+    """Whether new objects are zstd-compressed (SNAPSHOT_COMPRESSION and the zstandard package)."""
+    if SNAPSHOT_COMPRESSION == 'none':
+        return False
+    if _zstd() is None:
+        if SNAPSHOT_COMPRESSION == 'zstd':
+            print("Warning: SNAPSHOT_COMPRESSION=zstd but zstandard is not installed, storing uncompressed")
+        return False
+    return True
+
+
+def snapshot_dir() -> Path:
+    return current_profile().snapshot_dir
+
+
+def _object_path(digest: str) -> Path:
+    return snapshot_dir() / 'objects' / digest[:2] / digest[2:]
+
+
+def _manifest_dir() -> Path:
+    return snapshot_dir() / 'manifests'
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def store_object(data: bytes, digest: str) -> bool:
+    """Store file contents under their hash. Returns False if already stored."""
+    path = _object_path(digest)
+    zst_path = path.with_name(path.name + ZSTD_SUFFIX)
+    if path.exists() or zst_path.exists():
+        return False
+    if compression_enabled():
+        _write_atomic(zst_path, _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+    else:
+        _write_atomic(path, data)
+    count('snapshot_objects_written')
+    return True
+
+
+def read_object(digest: str) -> bytes:
+    """Contents stored under a hash."""
+    path = _object_path(digest)
+    if path.exists():
+        return path.read_bytes()
+    zst_path = path.with_name(path.name + ZSTD_SUFFIX)
+    if not zst_path.exists():
+        raise FileNotFoundError(f"Snapshot object {digest} is missing")
+    zstd = _zstd()
+    if zstd is None:
+        raise RuntimeError("This snapshot object is zstd-compressed; install zstandard to read it")
+    return zstd.ZstdDecompressor().decompress(zst_path.read_bytes())
+
+
+def data_files(data_dir: Path | None = None) -> dict[str, os.stat_result]:
+    """Every file in the data dir (minus EXCLUDED_DIRS and dotfiles), by '/'-separated relative path."""
+    root = data_dir or current_profile().data_dir
+    prefix = len(str(root)) + 1
+    files = {}
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not (directory == str(root) and entry.name in EXCLUDED_DIRS):
+                        stack.append(entry.path)
+                elif entry.is_file() and not entry.name.endswith('.tmp') and not entry.name.startswith('.'):
+                    files[entry.path[prefix:].replace(os.sep, '/')] = entry.stat()
+    return files
+
+
+def list_snapshots() -> list[str]:
+    """Snapshot ids, oldest first."""
+    manifest_dir = _manifest_dir()
+    if not manifest_dir.exists():
+        return []
+    return sorted(p.stem for p in manifest_dir.glob('*.json'))
+
+
+def resolve(ref: str) -> str:
+    """
+    Snapshot id for a reference: a full id, a unique prefix of one,
+    'latest', or 'latest~N' (N snapshots before the latest).
+    """
+    ids = list_snapshots()
+    if ref.startswith('latest'):
+        back = int(ref.partition('~')[2] or 0)
+        if back >= len(ids):
+            raise KeyError(f"Only {len(ids)} snapshots")
+        return ids[-1 - back]
+    matches = [i for i in ids if i.startswith(ref)]
+    if len(matches) != 1:
+        raise KeyError(f"{'No' if not matches else 'Ambiguous'} snapshot {ref!r}")
+    return matches[0]
+
+
+def load_snapshot(ref: str) -> dict:
+    """A snapshot manifest: {'version', 'id', 'createdAt', 'label', 'parent', 'files': {path: [sha256, size, mtime_ns]}}."""
+    return serialization.loads((_manifest_dir() / f'{resolve(ref)}.json').read_bytes())
+
+
+def take_snapshot(label: str = '') -> str | None:
+    """
+    Snapshot the active profile's data directory.
+
+    Holds the data directory's write lock, so the snapshot never catches a
+    run halfway through its writes.
+
+    Returns:
+        str: The new snapshot id, or None if nothing changed since the latest one
+    """
+    with data_lock():
+        return _take_snapshot(label)
+
+
+def _take_snapshot(label: str) -> str | None:
+    ids = list_snapshots()
+    previous = load_snapshot(ids[-1]) if ids else None
+    known = previous['files'] if previous else {}
+    root = current_profile().data_dir
+
+    files = {}
+    for path, stat in sorted(data_files(root).items()):
+        old = known.get(path)
+        if old and old[1] == stat.st_size and old[2] == stat.st_mtime_ns:
+            files[path] = old
+            continue
+        data = (root / path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        count('snapshot_files_hashed')
+        store_object(data, digest)
+        files[path] = [digest, len(data), stat.st_mtime_ns]
+
+    if previous and {p: f[0] for p, f in files.items()} == {p: f[0] for p, f in known.items()}:
+        return None
+
+    now = datetime.now()
+    digest = hashlib.sha256(serialization.dumps(files, compact=True)).hexdigest()
+    snapshot_id = f"{now.strftime('%Y%m%dT%H%M%S')}{now.microsecond // 1000:03d}-{digest[:8]}"
+    _write_atomic(_manifest_dir() / f'{snapshot_id}.json', serialization.dumps({
+        'version': MANIFEST_VERSION,
+        'id': snapshot_id,
+        'createdAt': now.isoformat(timespec='seconds'),
+        'label': label,
+        'parent': previous['id'] if previous else None,
+        'files': files,
+    }, compact=True))
+
+    if SNAPSHOT_KEEP:
+        prune(SNAPSHOT_KEEP)
+    return snapshot_id
+
+
+def diff_snapshots(old_ref: str, new_ref: str) -> dict:
+    """
+    Files added, removed and changed between two snapshots (manifests only).
+
+    Returns:
+        dict: {'added': [path], 'removed': [path], 'changed': [(path, old size, new size)]}
+    """
+    old = load_snapshot(old_ref)['files']
+    new = load_snapshot(new_ref)['files']
+    return {
+        'added': sorted(set(new) - set(old)),
+        'removed': sorted(set(old) - set(new)),
+        'changed': [
+            (path, old[path][1], new[path][1])
+            for path in sorted(set(old) & set(new))
+            if old[path][0] != new[path][0]
+        ],
+    }
+
+
+def file_patch(old_ref: str, new_ref: str, path: str, context: int = 2) -> str:
+    """Unified diff of one file between two snapshots."""
+    def lines(ref: str) -> list[str]:
+        entry = load_snapshot(ref)['files'].get(path)
+        if entry is None:
+            return []
+        return read_object(entry[0]).decode('utf-8', errors='replace').splitlines(keepends=True)
+
+    return ''.join(difflib.unified_diff(
+        lines(old_ref), lines(new_ref), f'{resolve(old_ref)}/{path}', f'{resolve(new_ref)}/{path}', n=context))
+
+
+def restore_snapshot(ref: str, paths: list[str] | None = None) -> list[str]:
+    """
+    Make the data directory match a snapshot.
+
+    The current state is snapshotted first (label 'before-restore'). With
+    `paths`, only those files are restored; otherwise files that aren't in
+    the snapshot are removed too. Runs under the data directory's write lock.
+
+    Returns:
+        list: Paths written or removed
+    """
+    with data_lock():
+        return _restore_snapshot(ref, paths)
+
+
+def _restore_snapshot(ref: str, paths: list[str] | None) -> list[str]:
+    snapshot = load_snapshot(ref)
+    take_snapshot('before-restore')
+    root = current_profile().data_dir
+    current = data_files(root)
+    wanted = snapshot['files'] if paths is None else {p: snapshot['files'][p] for p in paths if p in snapshot['files']}
+
+    touched = []
+    for path, (digest, size, _) in wanted.items():
+        stat = current.get(path)
+        if stat is not None and stat.st_size == size and hashlib.sha256((root / path).read_bytes()).hexdigest() == digest:
+            continue
+        _write_atomic(root / path, read_object(digest))
+        touched.append(path)
+
+    removed = set(current) - set(snapshot['files']) if paths is None else {p for p in paths if p not in snapshot['files']}
+    for path in sorted(removed):
+        (root / path).unlink(missing_ok=True)
+        touched.append(path)
+    return touched
+
+
+def prune(keep: int = SNAPSHOT_KEEP) -> int:
+    """
+    Delete all but the newest `keep` snapshots, and objects no snapshot uses.
+
+    Returns:
+        int: Objects deleted
+    """
+    ids = list_snapshots()
+    if keep <= 0 or len(ids) <= keep:
+        return 0
+    for snapshot_id in ids[:-keep]:
+        (_manifest_dir() / f'{snapshot_id}.json').unlink()
+
+    used = {entry[0] for snapshot_id in ids[-keep:] for entry in load_snapshot(snapshot_id)['files'].values()}
+    deleted = 0
+    for path in (snapshot_dir() / 'objects').glob('*/*'):
+        digest = path.parent.name + path.name.removesuffix(ZSTD_SUFFIX)
+        if digest not in used:
+            path.unlink()
+            deleted += 1
+    return deleted
+
+
+def exported_to_git() -> str | None:
+    """Id of the last snapshot committed to git, if any."""
+    path = snapshot_dir() / GIT_EXPORTED_FILE
+    return path.read_text(encoding='utf-8').strip() if path.exists() else None
+
+
+def mark_exported_to_git(snapshot_id: str) -> None:
+    _write_atomic(snapshot_dir() / GIT_EXPORTED_FILE, snapshot_id.encode('utf-8'))
+
+
+def format_diff(diff: dict) -> str:
+    lines = [f"  + {path}" for path in diff['added']]
+    lines += [f"  - {path}" for path in diff['removed']]
+    lines += [f"  ~ {path} ({new - old:+d} bytes)" for path, old, new in diff['changed']]
+    return '\n'.join(lines) or '  (no changes)'
+
+
+if __name__ == '__main__':
+    snapshot_id = take_snapshot('manual')
+    print(f"Snapshot: {snapshot_id or 'unchanged'}")
+    ids = list_snapshots()
+    print(f"{len(ids)} snapshots, objects compressed: {compression_enabled()}")
+    if len(ids) > 1:
+        print(format_diff(diff_snapshots('latest~1', 'latest')))
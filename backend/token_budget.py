@@ -0,0 +1,158 @@
+"""Token estimation, usage ledger and per-run / per-month budgets for Claude calls."""
+
+import math
+from datetime import datetime
+from pathlib import Path
+
+import serialization
+from profiles import current_profile
+from config import TOKEN_BUDGET_PER_RUN, TOKEN_BUDGET_PER_MONTH, TOKEN_COUNT_MODE
+
+LEDGER_FILE = 'token_ledger.jsonl'
+
+# Rough characters-per-token for English prose; errs on the side of overestimating
+CHARS_PER_TOKEN = 3.2
+
+
+def estimate_tokens_locally(*texts: str) -> int:
+    """Conservative token estimate from character counts."""
+    return math.ceil(sum(len(t) for t in texts) / CHARS_PER_TOKEN)
+
+
+def count_input_tokens(client, model: str, system: str, user: str, tools: list[dict] | None = None) -> int:
+    """
+    Input tokens for a request: the token-counting endpoint when
+    TOKEN_COUNT_MODE is 'api', otherwise (or if that fails) a local estimate.
+    """
+    if TOKEN_COUNT_MODE == 'api' and client is not None:
+        try:
+            result = client.messages.count_tokens(
+                model=model,
+                system=system,
+                messages=[{"role": "user", "content": user}],
+                **({'tools': tools} if tools else {}),
+            )
+            return result.input_tokens
+        except Exception as e:
+            print(f"Token counting failed, using local estimate: {e}")
+    tool_text = serialization.dumps(tools, compact=True).decode('utf-8') if tools else ''
+    return estimate_tokens_locally(system, user, tool_text)
+
+
+def ledger_path() -> Path:
+    """Where the active profile's usage ledger (one JSON record per line) lives."""
+    return current_profile().log_dir / LEDGER_FILE
+
+
+def record_usage(
+    model: str,
+    usage,
+    latency_ms: float,
+    purpose: str = 'analysis',
+    estimated_input: int | None = None,
+) -> dict:
+    """
+    Append one call's token usage to the ledger.
+
+    Args:
+        model: Model the call was made with
+        usage: The `usage` object (or dict) from the API response
+        latency_ms: Wall time of the call
+        purpose: What the call was for (e.g. 'analysis', 'batch')
+        estimated_input: Pre-call input estimate, kept to check the estimator
+
+    Returns:
+        dict: The ledger record
+    """
+    def field(name: str) -> int:
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value or 0
+
+    record = {
+        'timestamp': datetime.now().isoformat(),
+        'model': model,
+        'purpose': purpose,
+        'input_tokens': field('input_tokens'),
+        'output_tokens': field('output_tokens'),
+        'cache_creation_input_tokens': field('cache_creation_input_tokens'),
+        'cache_read_input_tokens': field('cache_read_input_tokens'),
+        'estimated_input_tokens': estimated_input,
+        'latency_ms': round(latency_ms, 1),
+    }
+
+    path = ledger_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as f:
+        f.write(serialization.dumps(record, compact=True) + b'\n')
+    return record
+
+
+def read_ledger() -> list[dict]:
+    """All ledger records, oldest first."""
+    path = ledger_path()
+    if not path.exists():
+        return []
+    records = []
+    for line in path.read_bytes().splitlines():
+        if line.strip():
+            records.append(serialization.loads(line))
+    return records
+
+
+def total_tokens(record: dict) -> int:
+    """Tokens a ledger record counts against the budget."""
+    return (
+        record.get('input_tokens', 0)
+        + record.get('output_tokens', 0)
+        + record.get('cache_creation_input_tokens', 0)
+        + record.get('cache_read_input_tokens', 0)
+    )
+
+
+def month_usage(month: str | None = None) -> int:
+    """Tokens used in a calendar month ('YYYY-MM', default: this month)."""
+    month = month or datetime.now().strftime('%Y-%m')
+    return sum(total_tokens(r) for r in read_ledger() if r['timestamp'].startswith(month))
+
+
+class TokenBudget:
+    """
+    Tracks spend against the per-run and per-month limits.
+
+    Create one per run and pass it to every Claude call in that run.
+    """
+
+    def __init__(self, per_run: int = TOKEN_BUDGET_PER_RUN, per_month: int = TOKEN_BUDGET_PER_MONTH):
+        self.per_run = per_run
+        self.per_month = per_month
+        self.spent = 0
+        self.month_spent = month_usage() if per_month else 0
+
+    def remaining(self) -> float:
+        """Tokens still available (inf when no limits are set)."""
+        limits = []
+        if self.per_run:
+            limits.append(self.per_run - self.spent)
+        if self.per_month:
+            limits.append(self.per_month - self.month_spent)
+        return min(limits) if limits else math.inf
+
+    def allows(self, input_tokens: int, max_output_tokens: int) -> bool:
+        """Whether a call of this size fits in the remaining budget."""
+        return input_tokens + max_output_tokens <= self.remaining()
+
+    def charge(self, record: dict) -> None:
+        spent = total_tokens(record)
+        self.spent += spent
+        self.month_spent += spent
+
+
+if __name__ == '__main__':
+    # Show this month's usage
+    records = read_ledger()
+    month = datetime.now().strftime('%Y-%m')
+    this_month = [r for r in records if r['timestamp'].startswith(month)]
+    print(f"Ledger: {ledger_path()} ({len(records)} calls)")
+    print(f"This month: {len(this_month)} calls, {month_usage()} tokens of {TOKEN_BUDGET_PER_MONTH or 'unlimited'}")
+    for r in this_month[-5:]:
+        print(f"  {r['timestamp']} {r['purpose']}: {r['input_tokens']} in / {r['output_tokens']} out, {r['latency_ms']} ms")
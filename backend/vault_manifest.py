@@ -0,0 +1,268 @@
+"""
+Scan manifest of the vault, kept in the profile's cache.
+
+The manifest records what previous scans learned so later ones can skip
+unchanged files:
+
+- 'notes': every note's mtime, size, outgoing [[links]] and the people
+  it mentions (kept up to date by update_manifest, used by note_graph
+  and people_index)
+- 'journal': a date-sorted index of the _Journal folder (kept up to date
+  by journal_index, used by obsidian_reader.get_journal_entries)
+
+A run stats every note anyway for its vault fingerprint (see
+pipeline.vault_fingerprint), which hands the journals' mtimes over with
+record_journal_stats, so the journal index is exact on every run without
+another pass over the folder.
+"""
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+
+import serialization
+from config import JOURNAL_RESTAT_DAYS
+from instrumentation import count
+from profiles import current_profile
+
+MANIFEST_FILE = 'vault_manifest.json'
+
+# Bump when the manifest format changes, to rescan every note
+MANIFEST_VERSION = 2
+
+JOURNAL_DIR = '_Journal'
+JOURNAL_NAME = re.compile(r'(\d{4}-\d{2}-\d{2})\.md')
+
+# [[Target]], [[Target|alias]], [[Target#Heading]], ![[Embed]]; group 1 is the target
+WIKILINK = re.compile(r'\[\[([^\[\]|#^]*)[^\[\]]*\]\]')
+
+# Journal mtimes from the last full stat pass over a vault in this process,
+# {journal folder: {filename: mtime_ns}}, used up by the next journal_index
+_journal_stats: dict[str, dict[str, int]] = {}
+
+
+def manifest_path() -> Path:
+    """Scan manifest in the active profile's cache directory."""
+    return current_profile().cache_dir / MANIFEST_FILE
+
+
+def load_manifest() -> dict:
+    """The saved scan manifest: {'version', 'notes': {relative path: entry}, 'journal': index}."""
+    path = manifest_path()
+    if path.exists():
+        try:
+            manifest = serialization.loads(path.read_bytes())
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except Exception as e:
+            print(f"Error reading vault manifest, rescanning: {e}")
+    return {'version': MANIFEST_VERSION, 'notes': {}}
+
+
+def save_manifest(manifest: dict) -> None:
+    """Write the manifest atomically."""
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(serialization.dumps(manifest, compact=True))
+    tmp_path.replace(path)
+
+
+def extract_links(text: str) -> list[str]:
+    """Distinct wikilink targets in a note, in order of first appearance."""
+    links = {}
+    for match in WIKILINK.finditer(text):
+        target = match.group(1).strip()
+        if target:
+            links.setdefault(target, None)
+    return list(links)
+
+
+def people_key() -> str:
+    """Hash of the active profile's people settings; the manifest's people are rescanned when it changes."""
+    profile = current_profile()
+    payload = serialization.dumps([profile.people, profile.people_ignore], compact=True)
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _scan_entry(path: str, stat: os.stat_result) -> dict:
+    from obsidian_reader import extract_people
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    count('bytes_read', len(data))
+    count('manifest_notes_parsed')
+    text = data.decode('utf-8', errors='replace')
+    return {
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'links': extract_links(text),
+        'people': extract_people(text),
+    }
+
+
+def update_manifest(vault_path: str | None = None) -> dict:
+    """
+    Bring the whole manifest up to date with the vault.
+
+    Every note is stat-ed, but only notes whose mtime or size changed are
+    read again (every note, if the profile's people or aliases changed);
+    deleted notes are dropped. The journal index is rebuilt
+    from the same stats for free. The manifest is saved if anything changed.
+
+    Returns:
+        dict: The updated manifest
+    """
+    root = Path(vault_path or current_profile().vault_path)
+    manifest = load_manifest()
+    if not root.exists():
+        return manifest
+
+    old = manifest['notes']
+    people = people_key()
+    if manifest.get('people_key') != people:
+        old = {}
+        manifest['people_key'] = people
+    prefix = len(str(root)) + 1
+    notes = {}
+    changed = False
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        stat = entry.stat()
+                        count('files_stated')
+                        key = entry.path[prefix:].replace(os.sep, '/')
+                        cached = old.get(key)
+                        if cached and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                            notes[key] = cached
+                            continue
+                        try:
+                            notes[key] = _scan_entry(entry.path, stat)
+                            changed = True
+                        except OSError as e:
+                            print(f"Error reading {entry.path}: {e}")
+        except OSError as e:
+            print(f"Error scanning {directory}: {e}")
+
+    if changed or len(notes) != len(manifest['notes']):
+        manifest['notes'] = notes
+        changed = True
+
+    journal_path = root / JOURNAL_DIR
+    if journal_path.is_dir():
+        journal_prefix = f'{JOURNAL_DIR}/'
+        mtimes = {
+            key[len(journal_prefix):]: entry['mtime']
+            for key, entry in notes.items()
+            if key.startswith(journal_prefix) and '/' not in key[len(journal_prefix):]
+        }
+        journal = _build_journal_index(journal_path.stat().st_mtime_ns, mtimes)
+        if journal['files'] != manifest.get('journal', {}).get('files'):
+            changed = True
+        manifest['journal'] = journal
+
+    if changed:
+        save_manifest(manifest)
+    return manifest
+
+
+def _build_journal_index(dir_mtime: int, mtimes: dict[str, int]) -> dict:
+    """
+    Journal index: files sorted by date (undated files last, by name).
+
+    'files' rows are [date or '', filename, mtime_ns]; 'dated' is how many
+    rows have a date, so rows[:dated] can be binary-searched by date.
+    """
+    dated, undated = [], []
+    for name, mtime in mtimes.items():
+        match = JOURNAL_NAME.fullmatch(name)
+        if match:
+            dated.append([match.group(1), name, mtime])
+        else:
+            undated.append(['', name, mtime])
+    dated.sort()
+    undated.sort()
+    return {
+        'dir_mtime': dir_mtime,
+        'stated_at': int(time.time()),
+        'dated': len(dated),
+        'files': dated + undated,
+    }
+
+
+def record_journal_stats(vault_path: str, mtimes: dict[str, int]) -> None:
+    """Hand over the journals' mtimes from a pass that just stat-ed the whole vault."""
+    _journal_stats[str(Path(vault_path) / JOURNAL_DIR)] = mtimes
+
+
+def journal_index(vault_path: str | None = None, restat: bool = False) -> dict | None:
+    """
+    The journal index, updated without stat-ing every journal when possible.
+
+    - If the run's vault fingerprint just stat-ed every journal (see
+      record_journal_stats), the index is rebuilt from those mtimes, so
+      an edit to an old entry is noticed straight away.
+    - Otherwise, if the _Journal folder's mtime is unchanged, no file was added,
+      removed or renamed, so the saved index is used as is.
+    - Otherwise the folder is listed again (names only) and just the new
+      files are stat-ed.
+    - Every JOURNAL_RESTAT_DAYS, on a full update_manifest, or when asked
+      with restat=True (e.g. a --fresh run), every journal is stat-ed
+      again, to notice edits to old entries.
+
+    Returns:
+        dict: The index (see _build_journal_index), or None if there is
+        no journal folder
+    """
+    journal_path = Path(vault_path or current_profile().vault_path) / JOURNAL_DIR
+    try:
+        dir_mtime = journal_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    manifest = load_manifest()
+    index = manifest.get('journal')
+
+    fresh = _journal_stats.pop(str(journal_path), None)
+    if fresh is not None:
+        updated = _build_journal_index(dir_mtime, fresh)
+        if index is None or index['dir_mtime'] != dir_mtime or index['files'] != updated['files']:
+            manifest['journal'] = updated
+            save_manifest(manifest)
+            return updated
+        count('journal_index_hits')
+        return index
+
+    restat = restat or index is None or time.time() - index['stated_at'] > JOURNAL_RESTAT_DAYS * 86400
+    if not restat and index['dir_mtime'] == dir_mtime:
+        count('journal_index_hits')
+        return index
+
+    known = {} if restat else {name: mtime for _, name, mtime in index['files']}
+    mtimes = {}
+    with os.scandir(journal_path) as it:
+        for entry in it:
+            if not entry.name.endswith('.md') or not entry.is_file():
+                continue
+            mtime = known.get(entry.name)
+            if mtime is None:
+                mtime = entry.stat().st_mtime_ns
+                count('files_stated')
+            mtimes[entry.name] = mtime
+
+    updated = _build_journal_index(dir_mtime, mtimes)
+    if not restat:
+        updated['stated_at'] = index['stated_at']
+    manifest['journal'] = updated
+    save_manifest(manifest)
+    return updated
@@ -18,6 +18,14 @@ function readJson(filename: string) {
   }
 }
 
+// Timeline entries from the month shards in timeline/index.json, or the
+// single timeline.json of data directories written before sharding
+function readTimeline() {
+  const index = readJson('timeline/index.json')
+  if (!index) return readJson('timeline.json')
+  return index.shards.flatMap((shard: { file: string }) => readJson(shard.file) || [])
+}
+
 // Helper: convert null to Prisma.DbNull for nullable Json fields
 function jsonOrNull(val: unknown): Prisma.InputJsonValue | typeof Prisma.DbNull {
   if (val === null || val === undefined) return Prisma.DbNull
@@ -63,7 +71,7 @@ async function main() {
   }
 
   // Seed Timeline
-  const timeline = readJson('timeline.json')
+  const timeline = readTimeline()
   if (timeline && Array.isArray(timeline)) {
     for (const entry of timeline) {
       await prisma.timelineEntry.upsert({
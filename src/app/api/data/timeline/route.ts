@@ -1,27 +1,22 @@
 import { NextResponse } from 'next/server'
 import { prisma } from '@/lib/prisma'
+import { getTimelinePage } from '@/lib/data'
 
-// eslint-disable-next-line @typescript-eslint/no-explicit-any
-type AnyEntry = any
+const DEFAULT_LIMIT = 50
+const MAX_LIMIT = 500
 
-export async function GET() {
+// GET /api/data/timeline?offset=0&limit=50 -> entries, most recent first;
+// the X-Total-Count header has the size of the whole timeline
+export async function GET(request: Request) {
   try {
-    const entries = await prisma.timelineEntry.findMany({
-      orderBy: { date: 'desc' },
-    })
+    const params = new URL(request.url).searchParams
+    const offset = Math.max(0, Number(params.get('offset')) || 0)
+    const limit = Math.min(MAX_LIMIT, Math.max(1, Number(params.get('limit')) || DEFAULT_LIMIT))
+    const page = await getTimelinePage(offset, limit)
 
-    return NextResponse.json(
-      entries.map((e: AnyEntry) => ({
-        id: e.id,
-        date: e.date,
-        category: e.category,
-        title: e.title,
-        content: e.content,
-        imageUrl: e.imageUrl,
-        sourceNote: e.sourceNote,
-        significance: e.significance,
-      }))
-    )
+    return NextResponse.json(page.entries, {
+      headers: { 'X-Total-Count': String(page.total) },
+    })
   } catch (error) {
     console.error('Error fetching timeline:', error)
     return NextResponse.json({ error: 'Failed to fetch timeline' }, { status: 500 })
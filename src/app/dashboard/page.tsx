@@ -5,6 +5,7 @@ import QuickLinks from '@/components/dashboard/QuickLinks'
 import QuadrantCard from '@/components/dashboard/QuadrantCard'
 import RightNowPanel from '@/components/dashboard/RightNowPanel'
 import BalanceIndicator from '@/components/dashboard/BalanceIndicator'
+import TrendsPanel from '@/components/dashboard/TrendsPanel'
 import type { QuadrantCategory, QuadrantStatus } from '@/types/dashboard'
 
 export default async function DashboardPage() {
@@ -124,6 +125,14 @@ export default async function DashboardPage() {
           </div>
         </section>
 
+        {/* Trends from the backend's rollups, mood series and quadrant history */}
+        <TrendsPanel
+          quadrantOrder={quadrantOrder}
+          rollups={data.rollups}
+          mood={data.mood}
+          history={data.history}
+        />
+
         {/* Quick Stats Footer */}
         <section className="mt-8 grid grid-cols-2 md:grid-cols-4 gap-4">
           <div className="bg-dashboard-card rounded-lg p-4 text-center">
@@ -5,6 +5,8 @@ import { motion, AnimatePresence } from 'framer-motion'
 import QuickLinks from '@/components/dashboard/QuickLinks'
 import type { TimelineEntry, QuadrantCategory } from '@/types/dashboard'
 
+const PAGE_SIZE = 50
+
 const categoryColors: Record<QuadrantCategory, { bg: string; text: string; border: string }> = {
   relationships: { bg: 'bg-quadrant-relationships/20', text: 'text-quadrant-relationships', border: 'border-quadrant-relationships' },
   parkour: { bg: 'bg-quadrant-parkour/20', text: 'text-quadrant-parkour', border: 'border-quadrant-parkour' },
@@ -37,18 +39,24 @@ const categoryIcons: Record<QuadrantCategory, JSX.Element> = {
 
 export default function TimelinePage() {
   const [timeline, setTimeline] = useState<TimelineEntry[]>([])
+  const [total, setTotal] = useState(0)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filter, setFilter] = useState<QuadrantCategory | 'all'>('all')
   const [selectedEntry, setSelectedEntry] = useState<TimelineEntry | null>(null)
   const [showAddForm, setShowAddForm] = useState(false)
 
+  const fetchPage = async (offset: number) => {
+    const res = await fetch(`/api/data/timeline?offset=${offset}&limit=${PAGE_SIZE}`)
+    if (!res.ok) return null
+    setTotal(Number(res.headers.get('X-Total-Count')) || 0)
+    return (await res.json()) as TimelineEntry[]
+  }
+
   const fetchTimeline = async () => {
     try {
-      const res = await fetch('/api/data/timeline')
-      if (res.ok) {
-        const data = await res.json()
-        setTimeline(data)
-      }
+      const data = await fetchPage(0)
+      if (data) setTimeline(data)
     } catch (error) {
       console.error('Failed to fetch timeline:', error)
     } finally {
@@ -56,6 +64,18 @@ export default function TimelinePage() {
     }
   }
 
+  const loadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await fetchPage(timeline.length)
+      if (data) setTimeline((current) => [...current, ...data])
+    } catch (error) {
+      console.error('Failed to fetch timeline:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => {
     fetchTimeline()
   }, [])
@@ -211,6 +231,18 @@ export default function TimelinePage() {
                 <p className="text-dashboard-text-muted">No entries found</p>
               </div>
             )}
+
+            {timeline.length < total && (
+              <div className="relative text-center pt-8">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-4 py-2 rounded-full text-sm bg-dashboard-card text-dashboard-text-secondary hover:text-white transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : `Load older moments (${total - timeline.length} more)`}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </main>
@@ -0,0 +1,132 @@
+import type { QuadrantCategory, Rollups, MoodSeries, QuadrantHistory } from '@/types/dashboard'
+
+// Weeks of timeline activity shown per quadrant
+const ACTIVITY_WEEKS = 8
+
+const quadrantColors: Record<QuadrantCategory, { text: string; bar: string }> = {
+  relationships: { text: 'text-quadrant-relationships', bar: 'bg-quadrant-relationships' },
+  parkour: { text: 'text-quadrant-parkour', bar: 'bg-quadrant-parkour' },
+  work: { text: 'text-quadrant-work', bar: 'bg-quadrant-work' },
+  travel: { text: 'text-quadrant-travel', bar: 'bg-quadrant-travel' },
+}
+
+interface TrendsPanelProps {
+  quadrantOrder: QuadrantCategory[]
+  rollups: Rollups | null
+  mood: MoodSeries | null
+  history: QuadrantHistory | null
+}
+
+function Sparkline({ values, className }: { values: (number | null)[]; className: string }) {
+  const points = values
+    .map((value, i) => (value === null ? null : { x: i, y: value }))
+    .filter((p): p is { x: number; y: number } => p !== null)
+  if (points.length < 2) return null
+
+  const ys = points.map((p) => p.y)
+  const low = Math.min(...ys)
+  const span = Math.max(...ys) - low || 1
+  const width = Math.max(values.length - 1, 1)
+  const path = points
+    .map((p) => `${((p.x / width) * 100).toFixed(1)},${(28 - ((p.y - low) / span) * 26).toFixed(1)}`)
+    .join(' ')
+
+  return (
+    <svg viewBox="0 0 100 30" preserveAspectRatio="none" className="w-full h-8">
+      <polyline points={path} fill="none" strokeWidth="2" vectorEffect="non-scaling-stroke" className={className} />
+    </svg>
+  )
+}
+
+export default function TrendsPanel({ quadrantOrder, rollups, mood, history }: TrendsPanelProps) {
+  if (!rollups && !mood && !history) return null
+
+  const weeks = rollups ? Object.keys(rollups.byWeek).sort().slice(-ACTIVITY_WEEKS) : []
+  const weekly = (category: QuadrantCategory) => weeks.map((week) => rollups?.byWeek[week]?.[category] || 0)
+  const busiest = Math.max(1, ...quadrantOrder.flatMap(weekly))
+  const github = rollups?.github.slice(-30) || []
+
+  return (
+    <section className="mt-8 grid grid-cols-1 lg:grid-cols-3 gap-6">
+      {/* Timeline activity per quadrant, from the rollups */}
+      {rollups && (
+        <div className="bg-dashboard-card rounded-xl p-5">
+          <h3 className="text-sm font-bold text-white mb-4">Last {ACTIVITY_WEEKS} Weeks</h3>
+          <div className="space-y-3">
+            {quadrantOrder.map((category) => {
+              const counts = weekly(category)
+              const sinceThriving = history?.quadrants[category]?.daysSinceThriving
+              return (
+                <div key={category}>
+                  <div className="flex items-center justify-between text-xs mb-1">
+                    <span className={`capitalize ${quadrantColors[category].text}`}>{category}</span>
+                    <span className="text-dashboard-text-muted">
+                      {counts.reduce((a, b) => a + b, 0)} moments
+                      {sinceThriving != null && ` · thriving ${sinceThriving}d ago`}
+                    </span>
+                  </div>
+                  <div className="flex items-end gap-1 h-6">
+                    {counts.map((n, i) => (
+                      <div
+                        key={weeks[i]}
+                        title={`${weeks[i]}: ${n}`}
+                        className={`flex-1 rounded-sm ${n ? quadrantColors[category].bar : 'bg-white/5'}`}
+                        style={{ height: `${Math.max(10, (n / busiest) * 100)}%` }}
+                      />
+                    ))}
+                  </div>
+                </div>
+              )
+            })}
+          </div>
+        </div>
+      )}
+
+      {/* Mood across every journal, and values alignment across runs */}
+      {(mood || history) && (
+        <div className="bg-dashboard-card rounded-xl p-5">
+          <h3 className="text-sm font-bold text-white mb-4">Mood & Alignment</h3>
+          {mood && (
+            <div className="mb-4">
+              <div className="flex items-center justify-between text-xs mb-1">
+                <span className="text-dashboard-text-secondary">
+                  7-day {mood.avg_7d ?? '–'} · 30-day {mood.avg_30d ?? '–'}
+                </span>
+                <span className="text-dashboard-text-muted capitalize">{mood.trend}</span>
+              </div>
+              <Sparkline values={mood.series.map((p) => p.avg7)} className="stroke-emerald-400" />
+            </div>
+          )}
+          {history && (
+            <div>
+              <div className="flex items-center justify-between text-xs mb-1">
+                <span className="text-dashboard-text-secondary">Alignment over {history.runs.length} runs</span>
+                {history.alignmentTrendPerRun !== null && (
+                  <span className="text-dashboard-text-muted">
+                    {history.alignmentTrendPerRun > 0 ? '+' : ''}
+                    {history.alignmentTrendPerRun} per run
+                  </span>
+                )}
+              </div>
+              <Sparkline values={history.alignment} className="stroke-quadrant-work" />
+            </div>
+          )}
+        </div>
+      )}
+
+      {/* GitHub streak series, from the rollups */}
+      {github.length > 0 && (
+        <div className="bg-dashboard-card rounded-xl p-5">
+          <h3 className="text-sm font-bold text-white mb-4">Coding</h3>
+          <div className="flex items-center justify-between text-xs mb-1">
+            <span className="text-dashboard-text-secondary">
+              {github[github.length - 1].streak}-day streak
+            </span>
+            <span className="text-dashboard-text-muted">commits per run, last {github.length}</span>
+          </div>
+          <Sparkline values={github.map((p) => p.commits)} className="stroke-quadrant-work" />
+        </div>
+      )}
+    </section>
+  )
+}
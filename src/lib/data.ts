@@ -9,6 +9,9 @@ import type {
   InspirationItem,
   Metadata,
   DashboardData,
+  Rollups,
+  MoodSeries,
+  QuadrantHistory,
 } from '@/types/dashboard'
 
 // eslint-disable-next-line @typescript-eslint/no-explicit-any
@@ -22,6 +25,48 @@ async function readJsonFile(filename: string) {
   return JSON.parse(content)
 }
 
+// Manifest of the timeline's month shards, newest month first (see
+// backend/data_manager.py). Data directories the backend hasn't written since
+// it started sharding only have a single timeline.json.
+interface TimelineIndex {
+  totalEntries: number
+  shards: { month: string; file: string; count: number; newest: string | null; oldest: string | null }[]
+}
+
+async function readOptionalJsonFile(filename: string) {
+  try {
+    return await readJsonFile(filename)
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== 'ENOENT') throw error
+    return null
+  }
+}
+
+// Entries [offset, offset + limit) of the timeline, reading only the shards they're in
+async function readTimelineFiles(offset: number, limit?: number): Promise<TimelinePage> {
+  const index: TimelineIndex | null = await readOptionalJsonFile('timeline/index.json')
+  if (!index) {
+    const timeline: TimelineEntry[] = (await readOptionalJsonFile('timeline.json')) || []
+    return { entries: timeline.slice(offset, limit === undefined ? undefined : offset + limit), total: timeline.length }
+  }
+
+  const end = limit === undefined ? index.totalEntries : offset + limit
+  const needed: string[] = []
+  let firstStart = 0
+  let start = 0
+  for (const shard of index.shards) {
+    if (start >= end) break
+    if (start + shard.count > offset) {
+      if (needed.length === 0) firstStart = start
+      needed.push(shard.file)
+    }
+    start += shard.count
+  }
+
+  const shards: TimelineEntry[][] = await Promise.all(needed.map((file) => readJsonFile(file)))
+  return { entries: shards.flat().slice(offset - firstStart, end - firstStart), total: index.totalEntries }
+}
+
 async function db() {
   const { prisma } = await import('@/lib/prisma')
   return prisma
@@ -104,26 +149,44 @@ export async function getRightNow(): Promise<RightNow> {
   } as RightNow
 }
 
-export async function getTimeline(): Promise<TimelineEntry[]> {
+export interface TimelinePage {
+  entries: TimelineEntry[]
+  total: number
+}
+
+// Most recent first. Without a limit, the rest of the timeline from offset.
+export async function getTimelinePage(offset = 0, limit?: number): Promise<TimelinePage> {
   if (!USE_DB) {
-    return await readJsonFile('timeline.json')
+    return await readTimelineFiles(offset, limit)
   }
 
   const prisma = await db()
-  const entries = await prisma.timelineEntry.findMany({
-    orderBy: { date: 'desc' },
-  })
+  const [entries, total] = await Promise.all([
+    prisma.timelineEntry.findMany({
+      orderBy: { date: 'desc' },
+      skip: offset,
+      take: limit,
+    }),
+    prisma.timelineEntry.count(),
+  ])
 
-  return entries.map((e: AnyRecord) => ({
-    id: e.id,
-    date: e.date,
-    category: e.category as QuadrantCategory,
-    title: e.title,
-    content: e.content,
-    imageUrl: e.imageUrl || undefined,
-    sourceNote: e.sourceNote || undefined,
-    significance: e.significance as TimelineEntry['significance'],
-  }))
+  return {
+    entries: entries.map((e: AnyRecord) => ({
+      id: e.id,
+      date: e.date,
+      category: e.category as QuadrantCategory,
+      title: e.title,
+      content: e.content,
+      imageUrl: e.imageUrl || undefined,
+      sourceNote: e.sourceNote || undefined,
+      significance: e.significance as TimelineEntry['significance'],
+    })),
+    total,
+  }
+}
+
+export async function getTimeline(): Promise<TimelineEntry[]> {
+  return (await getTimelinePage()).entries
 }
 
 export async function getGoals(): Promise<Goals> {
@@ -216,14 +279,35 @@ export async function getMetadata(): Promise<Metadata> {
   }
 }
 
+// Aggregates, mood series and quadrant history are only exported by the
+// backend's file writer, so there are none in database mode
+
+export async function getRollups(): Promise<Rollups | null> {
+  return USE_DB ? null : await readOptionalJsonFile('rollups.json')
+}
+
+export async function getMood(): Promise<MoodSeries | null> {
+  return USE_DB ? null : await readOptionalJsonFile('mood.json')
+}
+
+export async function getQuadrantHistory(): Promise<QuadrantHistory | null> {
+  return USE_DB ? null : await readOptionalJsonFile('quadrant_history.json')
+}
+
+// Timeline entries loaded with the dashboard; the timeline page pages through the rest
+const DASHBOARD_TIMELINE_ENTRIES = 20
+
 export async function getDashboardData(): Promise<DashboardData> {
-  const [quadrants, rightNow, timeline, goals, inspiration, metadata] = await Promise.all([
+  const [quadrants, rightNow, timeline, goals, inspiration, metadata, rollups, mood, history] = await Promise.all([
     getQuadrants(),
     getRightNow(),
-    getTimeline(),
+    getTimelinePage(0, DASHBOARD_TIMELINE_ENTRIES).then((page) => page.entries),
     getGoals(),
     getInspiration(),
     getMetadata(),
+    getRollups(),
+    getMood(),
+    getQuadrantHistory(),
   ])
 
   return {
@@ -233,6 +317,9 @@ export async function getDashboardData(): Promise<DashboardData> {
     goals,
     inspiration,
     metadata,
+    rollups,
+    mood,
+    history,
   }
 }
 
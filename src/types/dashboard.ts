@@ -138,6 +138,47 @@ export interface ManualEntry {
   processed: boolean
 }
 
+// Aggregates the backend keeps up to date (data/rollups.json)
+export interface Rollups {
+  version: number
+  updatedAt: string | null
+  entryCount: number
+  byCategory: Record<string, number>
+  byWeek: Record<string, Record<string, number>> // ISO week ('2026-W03') -> category -> entries
+  significance: Record<string, number>
+  significanceByCategory: Record<string, Record<string, number>>
+  lastActivity: Record<string, string>
+  github: { date: string; streak: number; commits: number }[]
+}
+
+// Mood time-series over every journal (data/mood.json)
+export interface MoodSeries {
+  entries_tracked: number
+  first_entry: string
+  last_entry: string
+  avg_7d: number | null
+  avg_30d: number | null
+  trend_per_week: number | null
+  trend: 'improving' | 'declining' | 'steady' | 'unknown'
+  anomalies: { date: string; score: number; zscore: number }[]
+  series: { date: string; score: number | null; avg7: number | null }[]
+}
+
+// Quadrant state over the last runs (data/quadrant_history.json)
+export interface QuadrantHistory {
+  updatedAt: string
+  runs: string[]
+  alignment: (number | null)[]
+  alignmentTrendPerRun: number | null
+  mood7d: (number | null)[]
+  mood30d: (number | null)[]
+  quadrants: Record<string, {
+    status: (string | null)[]
+    metrics: Record<string, (number | null)[]>
+    daysSinceThriving: number | null
+  }>
+}
+
 // Dashboard data bundle (what the frontend loads)
 export interface DashboardData {
   quadrants: Record<QuadrantCategory, Quadrant>
@@ -146,4 +187,8 @@ export interface DashboardData {
   goals: Goals
   inspiration: InspirationItem[]
   metadata: Metadata
+  // Backend exports; null in database mode or before the first run
+  rollups: Rollups | null
+  mood: MoodSeries | null
+  history: QuadrantHistory | null
 }